@@ -12,6 +12,51 @@ class Settings:
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     # Firebase settings
     FIREBASE_PROJECT_ID: str = os.getenv("FIREBASE_PROJECT_ID")
+    # Auth settings
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+    # Dictionary API settings
+    DICTIONARY_MAX_CONNECTIONS: int = int(os.getenv("DICTIONARY_MAX_CONNECTIONS", "50"))
+    DICTIONARY_MAX_KEEPALIVE: int = int(os.getenv("DICTIONARY_MAX_KEEPALIVE", "20"))
+    DICTIONARY_KEEPALIVE_EXPIRY: float = float(os.getenv("DICTIONARY_KEEPALIVE_EXPIRY", "30"))
+    DICTIONARY_HTTP2: bool = os.getenv("DICTIONARY_HTTP2", "False").lower() == "true"
+    DICTIONARY_TIMEOUT: float = float(os.getenv("DICTIONARY_TIMEOUT", "5"))
+    DICTIONARY_MIN_TIMEOUT: float = float(os.getenv("DICTIONARY_MIN_TIMEOUT", "1"))
+    DICTIONARY_MAX_TIMEOUT: float = float(os.getenv("DICTIONARY_MAX_TIMEOUT", "10"))
+    DICTIONARY_HEDGING: bool = os.getenv("DICTIONARY_HEDGING", "True").lower() == "true"
+    DICTIONARY_MAX_CONCURRENT: int = int(os.getenv("DICTIONARY_MAX_CONCURRENT", "20"))
+    DICTIONARY_BULKHEAD_WAIT: float = float(os.getenv("DICTIONARY_BULKHEAD_WAIT", "0.5"))
+    DICTIONARY_BREAKER_FAILURES: int = int(os.getenv("DICTIONARY_BREAKER_FAILURES", "5"))
+    DICTIONARY_BREAKER_RESET: float = float(os.getenv("DICTIONARY_BREAKER_RESET", "30"))
+    DICTIONARY_CACHE_SIZE: int = int(os.getenv("DICTIONARY_CACHE_SIZE", "5000"))
+    DICTIONARY_CACHE_TTL: int = int(os.getenv("DICTIONARY_CACHE_TTL", "86400"))
+    DICTIONARY_CACHE_PATH: str = os.getenv("DICTIONARY_CACHE_PATH", os.path.join(os.getcwd(), "cache", "dictionary.sqlite3"))
+    DICTIONARY_DISK_CACHE_TTL: int = int(os.getenv("DICTIONARY_DISK_CACHE_TTL", str(30 * 86400)))
+    DICTIONARY_NEGATIVE_CACHE_SIZE: int = int(os.getenv("DICTIONARY_NEGATIVE_CACHE_SIZE", "10000"))
+    DICTIONARY_NEGATIVE_CACHE_TTL: int = int(os.getenv("DICTIONARY_NEGATIVE_CACHE_TTL", "3600"))
+    DICTIONARY_BUNDLE_PATH: str = os.getenv("DICTIONARY_BUNDLE_PATH", "")
+    DICTIONARY_NETWORK_FALLBACK: bool = os.getenv("DICTIONARY_NETWORK_FALLBACK", "True").lower() == "true"
+    DICTIONARY_BATCH_MAX_WORDS: int = int(os.getenv("DICTIONARY_BATCH_MAX_WORDS", "50"))
+    DICTIONARY_BATCH_CONCURRENCY: int = int(os.getenv("DICTIONARY_BATCH_CONCURRENCY", "8"))
+    # Shared dictionary entries
+    ENTRY_CACHE_SIZE: int = int(os.getenv("ENTRY_CACHE_SIZE", "10000"))
+    # Word search
+    SEARCH_INDEX_MAX_USERS: int = int(os.getenv("SEARCH_INDEX_MAX_USERS", "500"))
+    SEARCH_INDEX_PATH: str = os.getenv("SEARCH_INDEX_PATH", "")
+    # Bulk imports
+    IMPORT_MAX_WORDS: int = int(os.getenv("IMPORT_MAX_WORDS", "5000"))
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "200"))
+    IMPORT_CONCURRENCY: int = int(os.getenv("IMPORT_CONCURRENCY", "8"))
+    IMPORT_MAX_BYTES: int = int(os.getenv("IMPORT_MAX_BYTES", str(5 * 1024 * 1024)))
+    IMPORT_MAX_LINE_LENGTH: int = int(os.getenv("IMPORT_MAX_LINE_LENGTH", "4096"))
+    # Conditional GET
+    STATS_ETAG_WINDOW: int = int(os.getenv("STATS_ETAG_WINDOW", "300"))
+    USER_VERSION_TTL: int = int(os.getenv("USER_VERSION_TTL", "5"))
+    # Exports
+    EXPORT_PAGE_SIZE: int = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+    # Word deletion
+    DELETE_MAX_WORDS: int = int(os.getenv("DELETE_MAX_WORDS", "500"))
+    # Analytics
+    ANALYTICS_MAX_DAYS: int = int(os.getenv("ANALYTICS_MAX_DAYS", "365"))
     DOCS_URL="/docs"
     REDOCS_URL="/redoc"
     
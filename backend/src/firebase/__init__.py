@@ -1 +1 @@
-from src.firebase.firebase_setup import db
\ No newline at end of file
+from src.firebase.firebase_setup import db, async_db
\ No newline at end of file
@@ -1,5 +1,5 @@
 import firebase_admin
-from firebase_admin import firestore, credentials
+from firebase_admin import firestore, firestore_async, credentials
 from httplib2 import Credentials
 import os
 from dotenv import load_dotenv
@@ -22,5 +22,6 @@ credential = credentials.Certificate({
 app = firebase_admin.initialize_app(credential=credential)
 
 db = firestore.client()
+async_db = firestore_async.client()
 
 
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from firebase_admin import firestore
@@ -12,17 +13,27 @@ from src.routes import words
 from src.routes import progress
 from src.routes import quiz
 from src.routes import authentication
+from src.services import dictionary_service, search_service
 from src.config import settings
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared outbound clients on startup; close them and write pending search indexes on shutdown"""
+    await dictionary_service.start()
+    yield
+    await dictionary_service.close()
+    await search_service.flush()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description= settings.DESCRIPTION,
     version= settings.VERSION,
     docs_url=settings.DOCS_URL,
     redoc_url=settings.REDOCS_URL,
-    debug=settings.DEBUG
-   
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 app.add_middleware(
     CORSMiddleware,
@@ -57,7 +68,8 @@ async def health_check():
             "dictionary_api": "operational",
             "firebase": "operational",
             "spaced_repetition": "operational"
-        }
+        },
+        "dictionary_cache": dictionary_service.cache_stats()
     }
 
 
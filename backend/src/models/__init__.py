@@ -1,4 +1,4 @@
 from src.models.user import UserCreate, UserLogin, UserResponse
-from src.models.word import WordLookupResponse, DictionaryResponse,WordCreate,WordCreateResponse,WordResponse,WordUpdate,WordListResponse
+from src.models.word import WordLookupResponse, WordLookupBatchRequest, WordLookupBatchResponse, WordSuggestionResponse, DictionaryResponse,WordCreate,WordCreateResponse,WordResponse,WordSummaryResponse,WordFieldsResponse,WordUpdate,WordListResponse,ImportJobResponse,WordBulkDeleteRequest,WordBulkDeleteResponse
 from src.models.progress import ProgressCreate,ProgressResponse, DueWordsResponse, ReviewSessionCreate, ReviewSessionResponse, LearningStats
 from src.models.quiz import QuizAnswer,QuizDifficulty,QuizGenerateRequest,QuizOption,QuizQuestion,QuizResponse,QuizResult,QuizSubmission,QuizSubmissionResponse,QuizType
\ No newline at end of file
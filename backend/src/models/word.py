@@ -1,6 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_serializer
+
+from src.config import settings
 
 
 class PhoneticModel(BaseModel):
@@ -30,6 +32,25 @@ class WordLookupResponse(BaseModel):
     message: str
 
 
+class WordLookupBatchRequest(BaseModel):
+    """Words to resolve in a single dictionary request"""
+    words: List[str] = Field(min_length=1, max_length=settings.DICTIONARY_BATCH_MAX_WORDS)
+
+
+class WordLookupBatchResponse(BaseModel):
+    """Per-word lookup results keyed by the normalized word"""
+    results: Dict[str, WordLookupResponse]
+    found: int
+    not_found: int
+    failed: int = 0
+
+
+class WordSuggestionResponse(BaseModel):
+    """Headwords matching a typed prefix"""
+    prefix: str
+    suggestions: List[str]
+
+
 class WordCreate(BaseModel):
     """Model for new word creation."""
     word: str = Field(min_length=1,max_length=100)
@@ -67,14 +88,48 @@ class WordResponse(BaseModel):
     difficulty_level: Optional[str] = None
 
 
+class WordSummaryResponse(BaseModel):
+    """Slim word representation for list views"""
+    id: str
+    word: str
+    added_at: str
+    source: str
+    definition: Optional[DefinitionModel] = None
+    is_favorite: bool = False
+    difficulty_level: Optional[str] = None
+
+
+class WordFieldsResponse(BaseModel):
+    """Word with only the fields picked by ?fields= (unset fields are left out of the response)"""
+    id: str
+    user_id: Optional[str] = None
+    word: Optional[str] = None
+    added_at: Optional[str] = None
+    source: Optional[str] = None
+    source_url: Optional[str] = None
+    definitions: Optional[List[DefinitionModel]] = None
+    phonetics: Optional[List[PhoneticModel]] = None
+    synonyms: Optional[List[str]] = None
+    antonyms: Optional[List[str]] = None
+    user_notes: Optional[str] = None
+    is_favorite: Optional[bool] = None
+    difficulty_level: Optional[str] = None
+
+    @model_serializer(mode="wrap")
+    def _only_set_fields(self, handler):
+        data = handler(self)
+        return {field: value for field, value in data.items() if field in self.model_fields_set}
+
+
 class WordListResponse(BaseModel):
     """Model for paginated word list"""
-    words: List[WordResponse]
+    words: List[Union[WordSummaryResponse, WordResponse, WordFieldsResponse]]
     total: int
     page: int
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 class WordCreateResponse(BaseModel):
     """Response when creating a word"""
@@ -82,3 +137,33 @@ class WordCreateResponse(BaseModel):
     message: str
     data: Optional[WordResponse] = None
 
+
+class ImportJobResponse(BaseModel):
+    """Progress of a bulk vocabulary import"""
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    imported: int
+    duplicates: int
+    not_found: int
+    failed: int
+    not_found_words: List[str] = []
+    error: Optional[str] = None
+    created_at: str
+    finished_at: Optional[str] = None
+
+
+class WordBulkDeleteRequest(BaseModel):
+    """Word ids to delete in one request"""
+    word_ids: List[str] = Field(min_length=1, max_length=settings.DELETE_MAX_WORDS)
+
+
+class WordBulkDeleteResponse(BaseModel):
+    """Outcome of a (bulk) word deletion"""
+    success: bool
+    message: str
+    deleted: int
+    not_found: List[str] = []
+    progress_deleted: int = 0
+    quiz_results_deleted: int = 0
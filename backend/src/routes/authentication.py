@@ -2,8 +2,8 @@ from fastapi import FastAPI,HTTPException,status,Depends,APIRouter
 from firebase_admin import firestore
 from datetime import datetime
 
-from src.firebase import db
-from src.utils import create_firebase_user, get_current_user, CustomException,login_user
+from src.firebase import async_db
+from src.utils import create_firebase_user, get_current_user, CustomException,login_user, token_cache
 from src.models import UserCreate,UserLogin,UserResponse
 
 router = APIRouter(prefix='/api/auth',tags=['authentication'])
@@ -30,7 +30,8 @@ async def register_user(user:UserCreate):
                 }
             }
         
-        db.collection('users').document(firebase_user.uid).set(user_data)
+        await async_db.collection('users').document(firebase_user.uid).set(user_data)
+        token_cache.invalidate_user(firebase_user.uid)
 
         return {
             "id": firebase_user.uid,
@@ -54,9 +55,10 @@ async def login(userLogin:UserLogin):
 
         
         
-        db.collection('users').document(user_id).update({
+        await async_db.collection('users').document(user_id).update({
             'lastLoginAt':firestore.SERVER_TIMESTAMP
         })
+        token_cache.invalidate_user(user_id)
 
         return {
             'access_token': id_token,
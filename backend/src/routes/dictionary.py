@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 
-from src.models import WordLookupResponse, DictionaryResponse
+from src.config import settings
+from src.models import WordLookupResponse, WordLookupBatchRequest, WordLookupBatchResponse, WordSuggestionResponse, DictionaryResponse
 from src.services import dictionary_service
+from src.services.dictionary_service import DictionaryUnavailableError
 from src.utils import get_current_user
 
 
@@ -14,7 +16,10 @@ async def lookup_word(word: str, current_user = Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="Word cannot be empty")
     
     clean_word = word.strip().lower()
-    word_data = await dictionary_service.lookup_word(clean_word)
+    try:
+        word_data = await dictionary_service.lookup_word(clean_word)
+    except DictionaryUnavailableError:
+        raise HTTPException(status_code=503, detail="Dictionary is temporarily unavailable. Please try again.")
 
     if word_data:
         return WordLookupResponse(
@@ -28,4 +33,65 @@ async def lookup_word(word: str, current_user = Depends(get_current_user)):
             data = None,
             message=f"The word: {word} is not found in the dictionary"
         )
+
+
+@router.post('/lookup-batch', response_model=WordLookupBatchResponse)
+async def lookup_word_batch(batch: WordLookupBatchRequest, current_user = Depends(get_current_user)):
+    """Resolve several words in one request"""
+    lookups = await dictionary_service.lookup_words(
+        batch.words,
+        concurrency=settings.DICTIONARY_BATCH_CONCURRENCY
+    )
+    if not lookups:
+        raise HTTPException(status_code=400, detail="Words cannot be empty")
+
+    results = {}
+    failed = 0
+    for word, word_data in lookups.items():
+        if isinstance(word_data, DictionaryUnavailableError):
+            results[word] = WordLookupResponse(
+                success=False,
+                data=None,
+                message=f"The word: {word} could not be looked up, please try again"
+            )
+            failed += 1
+        elif word_data:
+            results[word] = WordLookupResponse(
+                success=True,
+                data=DictionaryResponse(**word_data),
+                message="Word found successfully"
+            )
+        else:
+            results[word] = WordLookupResponse(
+                success=False,
+                data=None,
+                message=f"The word: {word} is not found in the dictionary"
+            )
+
+    found = sum(1 for result in results.values() if result.success)
+    return WordLookupBatchResponse(
+        results=results,
+        found=found,
+        not_found=len(results) - found - failed,
+        failed=failed
+    )
+
+
+@router.get('/suggest', response_model=WordSuggestionResponse)
+async def suggest_words(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user = Depends(get_current_user)
+):
+    """Prefix autocomplete over cached and bundled headwords"""
+    return WordSuggestionResponse(
+        prefix=prefix,
+        suggestions=dictionary_service.suggest(prefix, limit)
+    )
+
+
+@router.get('/cache-stats')
+async def get_cache_stats(current_user = Depends(get_current_user)):
+    """Hit/miss counters of the dictionary lookup cache"""
+    return dictionary_service.cache_stats()
     
\ No newline at end of file
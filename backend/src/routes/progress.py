@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+import time
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
 from typing import List, Optional, Dict, Any
-from datetime import datetime,timedelta
+from datetime import datetime
 
 from src.models import (
     ProgressCreate,
@@ -10,9 +11,10 @@ from src.models import (
     LearningStats,
     DueWordsResponse
 )
-from src.services import progress_service, learning_service
-from src.firebase import db
-from src.utils import get_current_user
+from src.services import progress_service, learning_service, stats_service
+from src.services.response_mapper import progress_dict, trusted_response
+from src.config import settings
+from src.utils import get_current_user, make_etag, not_modified, set_etag
 from src.utils import logging
 
 router = APIRouter(prefix="/api/progress", tags=["progress"])
@@ -39,59 +41,24 @@ async def record_review(
             response_time_ms=review_data.response_time_ms
         )
         
-        # Get word details for response
-        word_doc = db.collection("words").document(review_data.word_id).get()
-        word_data = word_doc.to_dict() if word_doc.exists else {}
-        
-        # Handle timestamp conversion
-        next_review = updated_progress.get("nextReviewDate")
-        if next_review and hasattr(next_review, 'timestamp'):
-            next_review_str = datetime.fromtimestamp(next_review.timestamp()).isoformat()
-        else:
-            next_review_str = datetime.now().isoformat()
-        
-        last_reviewed = updated_progress.get("lastReviewed")
-        if last_reviewed and hasattr(last_reviewed, 'timestamp'):
-            last_reviewed_str = datetime.fromtimestamp(last_reviewed.timestamp()).isoformat()
-        else:
-            last_reviewed_str = datetime.now().isoformat()
-        
-        created_at = updated_progress.get("createdAt")
-        if created_at and hasattr(created_at, 'timestamp'):
-            created_at_str = datetime.fromtimestamp(created_at.timestamp()).isoformat()
-        else:
-            created_at_str = datetime.now().isoformat()
-        
-        # Calculate retention rate
-        total_reviews = updated_progress.get("totalReviews", 0)
-        correct_reviews = updated_progress.get("correctReviews", 0)
-        retention_rate = learning_service.calculate_retention_score(correct_reviews, total_reviews)
-        
-        # Get strength description
-        strength = updated_progress.get("strength", 0)
-        strength_description = learning_service.get_strength_description(strength)
-        
-        response = ProgressResponse(
-            id=updated_progress["id"],
-            user_id=user_id,
-            word_id=review_data.word_id,
-            word=word_data.get("word", ""),
-            strength=strength,
-            strength_description=strength_description,
-            next_review_date=next_review_str,
-            total_reviews=total_reviews,
-            correct_reviews=correct_reviews,
-            consecutive_correct=updated_progress.get("consecutiveCorrect", 0),
-            retention_rate=retention_rate,
-            last_reviewed=last_reviewed_str,
-            created_at=created_at_str,
-            updated_at=last_reviewed_str
+        response = progress_dict(
+            updated_progress["id"],
+            user_id,
+            review_data.word_id,
+            updated_progress.get("word", ""),
+            updated_progress,
+            last_reviewed_default=datetime.now().isoformat()
         )
         
-        print(f"✅ Review recorded. New strength: {strength} ({strength_description})")
+        print(f"✅ Review recorded. New strength: {response['strength']} ({response['strength_description']})")
         
-        return response
+        return trusted_response(response)
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
     except Exception as e:
         print(f"💥 Error recording review: {str(e)}")
         logging.error(f"Error recording review: {str(e)}")
@@ -113,44 +80,32 @@ async def record_review_session(
         
         print(f"📚 Recording review session with {len(session_data.reviews)} reviews")
         
-        updated_words = []
-        correct_count = 0
-        
-        for review in session_data.reviews:
-            # Record each review
-            updated_progress = await progress_service.update_progress(
-                user_id=user_id,
-                word_id=review.word_id,
-                is_correct=review.is_correct,
-                quiz_type=review.quiz_type,
-                response_time_ms=review.response_time_ms
-            )
-            
-            if review.is_correct:
-                correct_count += 1
-            
-            # Get word details
-            word_doc = db.collection("words").document(review.word_id).get()
-            word_data = word_doc.to_dict() if word_doc.exists else {}
-            
-            # Convert to response format (similar to single review above)
-            # ... (timestamp conversion code similar to above)
-            
-            # Add to updated words list
-            # updated_words.append(progress_response)
+        # One read and one atomic commit for the whole session
+        result = await progress_service.record_review_session(
+            user_id,
+            [review.model_dump() for review in session_data.reviews]
+        )
+        
+        now = datetime.now().isoformat()
+        updated_words = [
+            progress_dict(progress["id"], user_id, progress["wordId"], progress.get("word") or "", progress,
+                          last_reviewed_default=now)
+            for progress in result["updated_words"]
+        ]
         
         # Calculate session statistics
-        total_reviews = len(session_data.reviews)
+        total_reviews = result["reviewed"]
+        correct_count = result["correct"]
         accuracy = (correct_count / total_reviews * 100) if total_reviews > 0 else 0
         
-        return ReviewSessionResponse(
-            success=True,
-            message=f"Recorded {total_reviews} reviews with {accuracy:.1f}% accuracy",
-            words_reviewed=total_reviews,
-            correct_answers=correct_count,
-            accuracy=accuracy,
-            updated_words=updated_words
-        )
+        return trusted_response({
+            "success": True,
+            "message": f"Recorded {total_reviews} reviews with {accuracy:.1f}% accuracy",
+            "words_reviewed": total_reviews,
+            "correct_answers": correct_count,
+            "accuracy": accuracy,
+            "updated_words": updated_words
+        })
         
     except Exception as e:
         print(f"💥 Error recording review session: {str(e)}")
@@ -186,69 +141,29 @@ async def get_due_words(
         now = datetime.now()
         
         for word_data in due_words_data:
-            # Handle timestamp conversion
+            # Check if overdue
             next_review = word_data.get("nextReviewDate")
-            if next_review and hasattr(next_review, 'timestamp'):
-                next_review_dt = datetime.fromtimestamp(next_review.timestamp())
-                next_review_str = next_review_dt.isoformat()
-                
-                # Check if overdue
-                if next_review_dt < now:
-                    overdue_count += 1
-            else:
-                next_review_str = datetime.now().isoformat()
+            if next_review and hasattr(next_review, 'timestamp') and next_review.timestamp() < now.timestamp():
+                overdue_count += 1
             
             # Check if new word
-            strength = word_data.get("strength", 0)
-            if strength == 0:
+            if word_data.get("strength", 0) == 0:
                 new_words_count += 1
             
-            # Calculate retention rate
-            total_reviews = word_data.get("totalReviews", 0)
-            correct_reviews = word_data.get("correctReviews", 0)
-            retention_rate = learning_service.calculate_retention_score(correct_reviews, total_reviews)
-            
-            # Get strength description
-            strength_description = learning_service.get_word_strength_description(strength)
-            
-            # Handle other timestamps
-            last_reviewed = word_data.get("lastReviewed")
-            if last_reviewed and hasattr(last_reviewed, 'timestamp'):
-                last_reviewed_str = datetime.fromtimestamp(last_reviewed.timestamp()).isoformat()
-            else:
-                last_reviewed_str = None
-            
-            created_at = word_data.get("createdAt")
-            if created_at and hasattr(created_at, 'timestamp'):
-                created_at_str = datetime.fromtimestamp(created_at.timestamp()).isoformat()
-            else:
-                created_at_str = datetime.now().isoformat()
-            
-            progress_response = ProgressResponse(
-                id=word_data["progress_id"],
-                user_id=user_id,
-                word_id=word_data["word_id"],
-                word=word_data.get("word", ""),
-                strength=strength,
-                strength_description=strength_description,
-                next_review_date=next_review_str,
-                total_reviews=total_reviews,
-                correct_reviews=correct_reviews,
-                consecutive_correct=word_data.get("consecutiveCorrect", 0),
-                retention_rate=retention_rate,
-                last_reviewed=last_reviewed_str,
-                created_at=created_at_str,
-                updated_at=last_reviewed_str or created_at_str
-            )
-            
-            due_words.append(progress_response)
-        
-        return DueWordsResponse(
-            words=due_words,
-            total_due=len(due_words),
-            overdue_count=overdue_count,
-            new_words_count=new_words_count
-        )
+            due_words.append(progress_dict(
+                word_data["progress_id"],
+                user_id,
+                word_data["word_id"],
+                word_data.get("word", ""),
+                word_data
+            ))
+        
+        return trusted_response({
+            "words": due_words,
+            "total_due": len(due_words),
+            "overdue_count": overdue_count,
+            "new_words_count": new_words_count
+        })
         
     except Exception as e:
         print(f"💥 Error getting due words: {str(e)}")
@@ -260,6 +175,7 @@ async def get_due_words(
 
 @router.get("/stats", response_model=LearningStats)
 async def get_learning_stats(
+    request: Request,
     current_user = Depends(get_current_user)
 ):
     """
@@ -267,36 +183,24 @@ async def get_learning_stats(
     """
     try:
         user_id = current_user["id"]
+
+        # Due counts move with the clock, so the tag also rolls over every window
+        window = int(time.time() // settings.STATS_ETAG_WINDOW)
+        etag = await make_etag(current_user, "stats", window)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
         
         #print(f"📈 Getting learning stats for user {user_id}")
         
-        # Get stats from progress service
+        # One read of the user's stats document
         stats_data = await progress_service.get_learning_stats(user_id)
         
-        # Get user's current and longest streak from user document
-        user_doc = db.collection("users").document(user_id).get()
-        user_data = user_doc.to_dict() if user_doc.exists else {}
-        user_stats = user_data.get("stats", {})
-        
-        
-        stats = LearningStats(
-            total_words_added=user_stats["total_words_added"],
-            words_learning=stats_data["words_learning"],
-            words_strong=stats_data["words_strong"],
-            words_mastered=stats_data["words_mastered"],
-            due_for_review=stats_data["due_for_review"],
-            overdue_words=stats_data["overdue_words"],
-            overall_accuracy=stats_data["overall_accuracy"],
-            current_streak=user_stats.get("currentStreak", 0),
-            longest_streak=user_stats.get("longestStreak", 0),
-            reviews_today=stats_data["reviews_today"],
-            reviews_this_week=stats_data["reviews_this_week"],
-            reviews_total=stats_data["reviews_total"]
-        )
-        
-        #print(f"📊 Stats: {stats.total_words_added} words, {stats.due_for_review} due")
+        #print(f"📊 Stats: {stats_data['total_words_added']} words, {stats_data['due_for_review']} due")
         
-        return stats
+        response = trusted_response(stats_data)
+        set_etag(response, etag)
+        return response
         
     except Exception as e:
         print(f"💥 Error getting learning stats: {str(e)}")
@@ -308,7 +212,7 @@ async def get_learning_stats(
     
 @router.get("/analytics", response_model=Dict[str, Any])
 async def get_learning_analytics(
-    days: int = 30,
+    days: int = Query(30, ge=1, le=settings.ANALYTICS_MAX_DAYS),
     current_user = Depends(get_current_user)
 ):
     """
@@ -322,58 +226,36 @@ async def get_learning_analytics(
         # Get basic stats
         basic_stats = await progress_service.get_learning_stats(user_id)
         
-        # Get performance trends
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        # Get quiz results for trend analysis
-        quiz_results_query = (db.collection("quiz_results")
-                             .where("userId", "==", user_id)
-                             .where("reviewDate", ">=", start_date)
-                             .order_by("reviewDate"))
-        
-        quiz_results = list(quiz_results_query.stream())
+        # Get performance trends from the daily rollups (one small document per active day)
+        daily_rollups = await stats_service.get_daily(user_id, days)
         
         # Analyze performance trends
         daily_performance = {}
         quiz_type_performance = {}
         word_difficulty_analysis = {}
         
-        for result_doc in quiz_results:
-            result_data = result_doc.to_dict()
-            review_date = result_data.get("reviewDate")
+        def add_counts(target, key, counts):
+            if key not in target:
+                target[key] = {"correct": 0, "total": 0}
+            target[key]["total"] += counts.get("total", 0)
+            target[key]["correct"] += counts.get("correct", 0)
+        
+        for date_str, rollup in daily_rollups.items():
+            if not rollup.get("total"):
+                continue
+            
+            # Daily performance
+            add_counts(daily_performance, date_str, rollup)
+            
+            # Quiz type performance
+            for quiz_type, counts in rollup.get("quizTypes", {}).items():
+                if counts.get("total"):
+                    add_counts(quiz_type_performance, quiz_type, counts)
             
-            if review_date and hasattr(review_date, 'timestamp'):
-                date_str = datetime.fromtimestamp(review_date.timestamp()).strftime("%Y-%m-%d")
-                quiz_type = result_data.get("quizType", "unknown")
-                is_correct = result_data.get("isCorrect", False)
-                strength_before = result_data.get("strengthBefore", 0)
-                
-                # Daily performance
-                if date_str not in daily_performance:
-                    daily_performance[date_str] = {"correct": 0, "total": 0}
-                
-                daily_performance[date_str]["total"] += 1
-                if is_correct:
-                    daily_performance[date_str]["correct"] += 1
-                
-                # Quiz type performance
-                if quiz_type not in quiz_type_performance:
-                    quiz_type_performance[quiz_type] = {"correct": 0, "total": 0}
-                
-                quiz_type_performance[quiz_type]["total"] += 1
-                if is_correct:
-                    quiz_type_performance[quiz_type]["correct"] += 1
-                
-                # Word difficulty analysis
-                difficulty_level = "easy" if strength_before >= 4 else "medium" if strength_before >= 2 else "hard"
-                
-                if difficulty_level not in word_difficulty_analysis:
-                    word_difficulty_analysis[difficulty_level] = {"correct": 0, "total": 0}
-                
-                word_difficulty_analysis[difficulty_level]["total"] += 1
-                if is_correct:
-                    word_difficulty_analysis[difficulty_level]["correct"] += 1
+            # Word difficulty analysis (by strength before the review)
+            for difficulty_level, counts in rollup.get("strengthBands", {}).items():
+                if counts.get("total"):
+                    add_counts(word_difficulty_analysis, difficulty_level, counts)
         
         # Calculate trends
         performance_trend = []
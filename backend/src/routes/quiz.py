@@ -10,8 +10,8 @@ from src.models import (
 )
 from src.services import quiz_service
 from src.utils import get_current_user
-from src.utils import logging
-from src.firebase import db
+from src.utils import logging, token_cache, data_version_update
+from src.firebase import async_db
 
 
 router = APIRouter(prefix="/api/quiz", tags=["quiz"])
@@ -89,9 +89,11 @@ async def submit_quiz(
             total_time_ms=submission.total_time_ms
         )
 
-        db.collection('users').document(user_id).update({
-            "stats.total_quizzes_taken":firestore.Increment(1)
+        await async_db.collection('users').document(user_id).update({
+            "stats.total_quizzes_taken":firestore.Increment(1),
+            **data_version_update()
         })
+        token_cache.invalidate_user(user_id)
         
         print(f"✅ Quiz submitted: {result.score}/{result.total_questions} ({result.accuracy:.1f}%)")
         
@@ -228,12 +230,12 @@ async def get_quiz_history(
         print(f"📚 Getting quiz history for user {user_id}")
         
         # Get recent quiz results from Firestore
-        quiz_results_query = (db.collection("quiz_results")
+        quiz_results_query = (async_db.collection("quiz_results")
                              .where("userId", "==", user_id)
                              .order_by("reviewDate", direction=firestore.Query.DESCENDING)
                              .limit(limit))
         
-        quiz_results = list(quiz_results_query.stream())
+        quiz_results = await quiz_results_query.get()
         
         # Group results by quiz session (same reviewDate)
         quiz_sessions = {}
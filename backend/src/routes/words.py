@@ -1,11 +1,16 @@
-from curses.ascii import HT
+import base64
 from datetime import datetime
 from typing import Optional, List
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
 
 from src.models import (
+    ImportJobResponse,
+    WordBulkDeleteRequest,
+    WordBulkDeleteResponse,
     WordCreate,
     WordCreateResponse,
     WordListResponse,
@@ -13,56 +18,133 @@ from src.models import (
     WordResponse,
     WordUpdate
 )
-from src.services import dictionary_service
-from src.firebase import db
-from src.utils import get_current_user
+from src.services import dictionary_service, entry_service, search_service, import_service, deletion_service, export_service, stats_service
+from src.services.dictionary_service import DictionaryUnavailableError
+from src.services.stats_service import StatsDelta
+from src.services.response_mapper import word_dict, word_summary_dict, word_fields_dict, trusted_response
+from src.firebase import async_db
+from src.utils import get_current_user, token_cache, word_doc_id, data_version_update, make_etag, not_modified, set_etag, user_versions, WORDS_VERSION_FIELD
 from src.utils import logging
 
 
 router = APIRouter(prefix='/api/words',tags=["words"])
 
 
+def _encode_cursor(doc_id: str) -> str:
+    return base64.urlsafe_b64encode(doc_id.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        doc_id = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (ValueError, UnicodeDecodeError):
+        doc_id = ""
+    if not doc_id or "/" in doc_id:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return doc_id
+
+
+# Firestore fields each response field is read from (dictionary fields live in the shared entry)
+WORD_FIELD_PATHS = {
+    "id": [],
+    "user_id": ["userId"],
+    "word": ["word"],
+    "added_at": ["addedAt"],
+    "source": ["source"],
+    "source_url": ["sourceUrl"],
+    "definitions": ["entryId", "definitions"],
+    "phonetics": ["entryId", "phonetics"],
+    "synonyms": ["entryId", "synonyms"],
+    "antonyms": ["entryId", "antonyms"],
+    "user_notes": ["userNotes"],
+    "is_favorite": ["isFavorite"],
+    "difficulty_level": ["difficultyLevel"]
+}
+
+SUMMARY_FIELDS = ["id", "word", "added_at", "source", "definitions", "is_favorite", "difficulty_level"]
+
+
+def _parse_fields(fields: str) -> List[str]:
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in WORD_FIELD_PATHS]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields. Choose from: {', '.join(WORD_FIELD_PATHS)}"
+        )
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def _field_paths(fields: List[str]) -> List[str]:
+    return list(dict.fromkeys(path for field in fields for path in WORD_FIELD_PATHS[field]))
+
+
 @router.post("/", response_model=WordCreateResponse)
 async def add_word(word_data: WordCreate, current_user = Depends(get_current_user)):
     try:
         user_id = current_user['id']
         word_text = word_data.word.strip().lower()
-        existing_words = db.collection("words").where("userId", "==", user_id).where("word", "==", word_text).stream()
-        if any(existing_words):
+        if dictionary_service.is_known_missing(word_text):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Word '{word_text}' not found in dictionary. Please check spelling."
+            )
+        # Word ids are derived from (user, word), so the duplicate check is a point read
+        word_ref = async_db.collection("words").document(word_doc_id(user_id, word_text))
+        existing_word = await word_ref.get()
+        if existing_word.exists:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Word '{word_text}' already exists in your vocabulary"
             )
-        dictionary_data = await dictionary_service.lookup_word(word_text)
+        try:
+            dictionary_data = await dictionary_service.lookup_word(word_text)
+        except DictionaryUnavailableError:
+            raise HTTPException(
+                status_code=503,
+                detail="Dictionary is temporarily unavailable. Please try again."
+            )
         if not dictionary_data:
             raise HTTPException(
                 status_code=404,
                 detail=f"Word '{word_text}' not found in dictionary. Please check spelling."
             )
+        # Dictionary data is stored once in the shared entries collection
+        entry_id = await entry_service.save_entry(word_text, dictionary_data)
         word_doc = {
             "userId": user_id,
             "word": word_text,
             "addedAt": firestore.SERVER_TIMESTAMP,
             "source": word_data.source,
             "sourceUrl": word_data.source_url,
-            
-            # Dictionary data
-            "definitions": dictionary_data["definitions"],
-            "phonetics": dictionary_data["phonetics"],
-            "synonyms": dictionary_data["synonyms"],
-            "antonyms": dictionary_data["antonyms"],
+            "entryId": entry_id,
             
             # User data
             "userNotes": word_data.user_notes,
             "isFavorite": False,
             "difficultyLevel": None
         }
-        doc_ref = db.collection("words").add(word_doc)
-        word_id = doc_ref[1].id
-        user_ref = db.collection("users").document(user_id)
-        user_ref.update({
-            "stats.total_words_added": firestore.Increment(1)
+        # The word, the user's counters and the stats document change in one commit
+        batch = async_db.batch()
+        batch.create(word_ref, word_doc)
+        batch.update(async_db.collection("users").document(user_id), {
+            "stats.total_words_added": firestore.Increment(1),
+            **data_version_update(words=True)
         })
+        delta = StatsDelta()
+        delta.total_words = 1
+        stats_service.apply(batch, user_id, delta)
+        try:
+            await batch.commit()
+        except AlreadyExists:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Word '{word_text}' already exists in your vocabulary"
+            )
+        word_id = word_ref.id
+        token_cache.invalidate_user(user_id)
+        await search_service.apply_changes(user_id, {word_id: {**word_doc, **dictionary_data}})
         response_data = WordResponse(
             id=word_id,
             user_id=user_id,
@@ -86,12 +168,9 @@ async def add_word(word_data: WordCreate, current_user = Depends(get_current_use
         )
 
         
-    except HTTPException:
-        logging.error(f"word: {word_text} already exists")
-        raise HTTPException(
-                status_code=400, 
-                detail=f"Word '{word_text}' already exists in your vocabulary"
-            )
+    except HTTPException as e:
+        logging.error(f"Could not add word: {word_text} ({e.detail})")
+        raise
     except Exception as e:
         logging.error("Error while trying to add the word {}".format(e))
         
@@ -99,74 +178,190 @@ async def add_word(word_data: WordCreate, current_user = Depends(get_current_use
             status_code=500,
             detail="Failed to add word. Please try again."
         )
+
+
+def _import_job_response(job) -> ImportJobResponse:
+    return ImportJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        total=job["total"],
+        processed=job["processed"],
+        imported=job["imported"],
+        duplicates=job["duplicates"],
+        not_found=job["not_found"],
+        failed=job["failed"],
+        not_found_words=job["not_found_words"][:100],
+        error=job.get("error"),
+        created_at=job["created_at"].isoformat(),
+        finished_at=job["finished_at"].isoformat() if job["finished_at"] else None
+    )
+
+
+@router.post("/import", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_words(
+    request: Request,
+    format: str = Query("text", pattern="^(text|csv|anki)$"),
+    source: str = Query("import", max_length=50),
+    current_user = Depends(get_current_user)
+):
+    """
+    Bulk import words from a streamed plain list, CSV or Anki text export.
+    Returns a job id to poll at GET /api/words/import/{job_id}.
+    """
+    try:
+        user_id = current_user["id"]
+        entries = await import_service.read_upload(request.stream(), format)
+        if not entries:
+            raise HTTPException(status_code=400, detail="No words found in the upload")
+
+        job = import_service.start_import(user_id, entries, source)
+        logging.info(f"Import job {job['job_id']} started with {len(entries)} words")
+        return _import_job_response(job)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error starting import: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to start import. Please try again."
+        )
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: str, current_user = Depends(get_current_user)):
+    """Progress of a bulk import job"""
+    job = import_service.get_job(job_id, current_user["id"])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return _import_job_response(job)
+
+
+@router.get("/export")
+async def export_words(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Stream the user's whole vocabulary joined with progress, page by page
+    """
+    user_id = current_user["id"]
+    timestamp = datetime.now().strftime("%Y%m%d")
+
+    if format == "csv":
+        content, media_type = export_service.stream_csv(user_id), "text/csv"
+    else:
+        content, media_type = export_service.stream_ndjson(user_id), "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="wordmaster-{timestamp}.{format}"'}
+    )
+
        
 @router.get("/", response_model=WordListResponse)
 async def get_words(
+    request: Request,
     page: int = 1,
-    per_page: int = 20,
+    per_page: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: str = Query("full", pattern="^(summary|full)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated word fields to return"),
     current_user = Depends(get_current_user)):
 
     try:
         user_id = current_user["id"]
-        query = db.collection("words").where("userId", "==", user_id)
-        if search:
-            search_term = search.strip().lower()
-            query = query.where("word", ">=", search_term).where("word", "<=", search_term + "\uf8ff")
-        try:
-            docs_without_order = list(query.stream())
-        except Exception as e:
-            raise e
-        try:
-            query = query.order_by("addedAt", direction=firestore.Query.DESCENDING)
-            total_docs = list(query.stream())
-            total = len(total_docs)
-        except Exception as e:
-            total_docs = docs_without_order
-            total = len(total_docs)
-        offset = (page - 1) * per_page
-        has_next = offset + per_page < total
-        has_prev = page > 1
-        paginated_docs = total_docs[offset:offset + per_page]
-        words = []
-        for i, doc in enumerate(paginated_docs):
-            try:
-                doc_data = doc.to_dict()
-                added_at = doc_data.get("addedAt")
-                if added_at and hasattr(added_at, 'timestamp'):
-                    added_at_str = datetime.fromtimestamp(added_at.timestamp()).isoformat()
-                else:
-                    added_at_str = datetime.now().isoformat()
-                word_response = WordResponse(
-                    id=doc.id,
-                    user_id=doc_data.get("userId", user_id),
-                    word=doc_data.get("word", ""),
-                    added_at=added_at_str,
-                    source=doc_data.get("source", "manual"),
-                    source_url=doc_data.get("sourceUrl"),
-                    definitions=doc_data.get("definitions", []),
-                    phonetics=doc_data.get("phonetics", []),
-                    synonyms=doc_data.get("synonyms", []),
-                    antonyms=doc_data.get("antonyms", []),
-                    user_notes=doc_data.get("userNotes"),
-                    is_favorite=doc_data.get("isFavorite", False),
-                    difficulty_level=doc_data.get("difficultyLevel")
-                )
-                words.append(word_response)
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                continue
-        result = WordListResponse(
-            words=words,
-            total=total,
-            page=page,
-            per_page=per_page,
-            has_next=has_next,
-            has_prev=has_prev
-        )
+
+        # The user's data version is cached for a few seconds, so unchanged lists cost no reads
+        etag = await make_etag(current_user, "words", page, per_page, search, cursor, view, fields)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # Only the requested fields are read from Firestore
+        if fields:
+            requested_fields = _parse_fields(fields)
+        elif view == "summary":
+            requested_fields = SUMMARY_FIELDS
+        else:
+            requested_fields = list(WORD_FIELD_PATHS)
+        field_paths = _field_paths(requested_fields)
+        needs_entries = "entryId" in field_paths
+
+        if search and search.strip():
+            # Ranked full-text search over the user's in-memory index
+            versions = await user_versions.get(user_id)
+            ranked_ids = await search_service.search(user_id, search, versions[WORDS_VERSION_FIELD])
+            offset = (page - 1) * per_page
+            page_ids = ranked_ids[offset:offset + per_page]
+
+            # Only the page is read. Ids of words deleted elsewhere (the index was not yet
+            # rebuilt) are dropped from the index and from the total.
+            refs = [async_db.collection("words").document(word_id) for word_id in page_ids]
+            docs_by_id = {doc.id: doc async for doc in async_db.get_all(refs, field_paths=field_paths) if doc.exists}
+            missing_ids = [word_id for word_id in page_ids if word_id not in docs_by_id]
+            if missing_ids:
+                search_service.forget_words(user_id, missing_ids)
+
+            total = len(ranked_ids) - len(missing_ids)
+            paginated_docs = [docs_by_id[word_id] for word_id in page_ids if word_id in docs_by_id]
+            has_next = offset + per_page < len(ranked_ids)
+            has_prev = page > 1
+            next_cursor = None
+        else:
+            query = async_db.collection("words").where("userId", "==", user_id)
+
+            # Cheap server-side count instead of streaming the whole collection
+            count_result = await query.count(alias="total").get()
+            total = int(count_result[0][0].value)
+
+            ordered_query = query.order_by("addedAt", direction=firestore.Query.DESCENDING)
+            if cursor:
+                cursor_doc = await async_db.collection("words").document(_decode_cursor(cursor)).get()
+                if not cursor_doc.exists or cursor_doc.get("userId") != user_id:
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+                ordered_query = ordered_query.start_after(cursor_doc)
+            elif page > 1:
+                ordered_query = ordered_query.offset((page - 1) * per_page)
+
+            # One extra document tells us whether another page exists
+            page_docs = await ordered_query.select(field_paths).limit(per_page + 1).get()
+            has_next = len(page_docs) > per_page
+            has_prev = page > 1 or cursor is not None
+            paginated_docs = page_docs[:per_page]
+            next_cursor = _encode_cursor(paginated_docs[-1].id) if has_next else None
+        paginated_data = [doc.to_dict() or {} for doc in paginated_docs]
+        if needs_entries:
+            await entry_service.resolve_words(paginated_data)
+
+        if fields:
+            words = [word_fields_dict(doc.id, doc_data, user_id, requested_fields)
+                     for doc, doc_data in zip(paginated_docs, paginated_data)]
+        elif view == "summary":
+            words = [word_summary_dict(doc.id, doc_data)
+                     for doc, doc_data in zip(paginated_docs, paginated_data)]
+        else:
+            words = [word_dict(doc.id, doc_data, user_id)
+                     for doc, doc_data in zip(paginated_docs, paginated_data)]
+
+        result = trusted_response({
+            "words": words,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": next_cursor
+        })
+        set_etag(result, etag)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -178,11 +373,20 @@ async def get_words(
 
 
 @router.get("/{word_id}", response_model=WordResponse)
-async def get_specific_word(word_id: str, current_user = Depends(get_current_user)):  # ← Changed function name
+async def get_specific_word(
+    word_id: str,
+    request: Request,
+    current_user = Depends(get_current_user)
+):  # ← Changed function name
     try:
         user_id = current_user['id']
 
-        doc = db.collection('words').document(word_id).get()
+        etag = await make_etag(current_user, "word", word_id)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        doc = await async_db.collection('words').document(word_id).get()
         if not doc.exists:
             raise HTTPException(
                 status_code=404, detail="Word not found"
@@ -192,30 +396,10 @@ async def get_specific_word(word_id: str, current_user = Depends(get_current_use
         # ← FIX: Correct field name and logic
         if doc_data.get('userId') != user_id:  # Use 'userId' and != (not ==)
             raise HTTPException(status_code=403, detail="Access Denied")
+        await entry_service.resolve_words([doc_data])
         
-        # ← FIX: Handle Firestore timestamp properly
-        added_at = doc_data.get("addedAt")
-        if added_at and hasattr(added_at, 'timestamp'):
-            added_at_str = datetime.fromtimestamp(added_at.timestamp()).isoformat()
-        else:
-            added_at_str = datetime.now().isoformat()
-        
-        word_response = WordResponse(
-            id=doc.id,
-            user_id=doc_data["userId"],
-            word=doc_data["word"],
-            added_at=added_at_str,  # ← FIX: Use the properly converted timestamp
-            source=doc_data.get("source", "manual"),
-            source_url=doc_data.get("sourceUrl"),
-            definitions=doc_data.get("definitions", []),
-            phonetics=doc_data.get("phonetics", []),
-            synonyms=doc_data.get("synonyms", []),
-            antonyms=doc_data.get("antonyms", []),
-            user_notes=doc_data.get("userNotes"),
-            is_favorite=doc_data.get("isFavorite", False),
-            difficulty_level=doc_data.get("difficultyLevel")
-        )
-        
+        word_response = trusted_response(word_dict(doc.id, doc_data, user_id))
+        set_etag(word_response, etag)
         return word_response
 
     except HTTPException:
@@ -240,8 +424,8 @@ async def update_word(
         user_id = current_user["id"]
         
         # Get the word document
-        doc_ref = db.collection("words").document(word_id)
-        doc = doc_ref.get()
+        doc_ref = async_db.collection("words").document(word_id)
+        doc = await doc_ref.get()
         
         if not doc.exists:
             raise HTTPException(status_code=404, detail="Word not found")
@@ -267,38 +451,21 @@ async def update_word(
         # Add update timestamp
         update_data["updatedAt"] = firestore.SERVER_TIMESTAMP
         
-        # Update the document
-        doc_ref.update(update_data)
+        # Update the document and the user's data versions together
+        batch = async_db.batch()
+        batch.update(doc_ref, update_data)
+        batch.update(async_db.collection("users").document(user_id), data_version_update(words=True))
+        await batch.commit()
+        token_cache.invalidate_user(user_id)
         
         # Get updated document
-        updated_doc = doc_ref.get()
+        updated_doc = await doc_ref.get()
         updated_data = updated_doc.to_dict()
-        
-        # Handle timestamp
-        added_at = updated_data.get("addedAt")
-        if added_at and hasattr(added_at, 'timestamp'):
-            added_at_str = datetime.fromtimestamp(added_at.timestamp()).isoformat()
-        else:
-            added_at_str = datetime.now().isoformat()
+        await entry_service.resolve_words([updated_data])
+        await search_service.apply_changes(user_id, {word_id: updated_data})
         
         # Return updated word
-        word_response = WordResponse(
-            id=updated_doc.id,
-            user_id=updated_data["userId"],
-            word=updated_data["word"],
-            added_at=added_at_str,
-            source=updated_data.get("source", "manual"),
-            source_url=updated_data.get("sourceUrl"),
-            definitions=updated_data.get("definitions", []),
-            phonetics=updated_data.get("phonetics", []),
-            synonyms=updated_data.get("synonyms", []),
-            antonyms=updated_data.get("antonyms", []),
-            user_notes=updated_data.get("userNotes"),
-            is_favorite=updated_data.get("isFavorite", False),
-            difficulty_level=updated_data.get("difficultyLevel")
-        )
-        
-        return word_response
+        return trusted_response(word_dict(updated_doc.id, updated_data, user_id))
         
     except HTTPException:
         raise
@@ -309,44 +476,61 @@ async def update_word(
             detail="Failed to update word. Please try again."
         )
 
+@router.post("/bulk-delete", response_model=WordBulkDeleteResponse)
+async def bulk_delete_words(
+    delete_data: WordBulkDeleteRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Delete several words, with their progress and quiz history, in batched writes
+    """
+    try:
+        result = await deletion_service.delete_words(current_user["id"], delete_data.word_ids)
+        
+        return WordBulkDeleteResponse(
+            success=True,
+            message=f"Deleted {len(result['deleted'])} words",
+            deleted=len(result["deleted"]),
+            not_found=result["not_found"],
+            progress_deleted=result["progress_deleted"],
+            quiz_results_deleted=result["quiz_results_deleted"]
+        )
+        
+    except Exception as e:
+        logging.error(f"Error bulk deleting words: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to delete words. Please try again."
+        )
+
+
 @router.delete("/{word_id}")
 async def delete_word(
     word_id: str,
     current_user = Depends(get_current_user)
 ):
     """
-    Delete a word from user's collection
+    Delete a word from user's collection, with its progress and quiz history
     """
     try:
         user_id = current_user["id"]
         
-        # Get the word document
-        doc_ref = db.collection("words").document(word_id)
-        doc = doc_ref.get()
+        result = await deletion_service.delete_words(user_id, [word_id])
         
-        if not doc.exists:
+        if not result["deleted"]:
+            # Tell a missing word apart from someone else's
+            doc = await async_db.collection("words").document(word_id).get()
+            if doc.exists:
+                raise HTTPException(status_code=403, detail="Access denied")
             raise HTTPException(status_code=404, detail="Word not found")
         
-        doc_data = doc.to_dict()
-        
-        # Check ownership
-        if doc_data.get("userId") != user_id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        word_text = doc_data.get("word", "unknown")
-        
-        # Delete the document
-        doc_ref.delete()
-        
-        # Update user stats
-        user_ref = db.collection("users").document(user_id)
-        user_ref.update({
-            "stats.totalWordsAdded": firestore.Increment(-1)
-        })
+        word_text = result["deleted"][0]["word"] or "unknown"
         
         return {
             "success": True,
-            "message": f"Word '{word_text}' deleted successfully"
+            "message": f"Word '{word_text}' deleted successfully",
+            "progress_deleted": result["progress_deleted"],
+            "quiz_results_deleted": result["quiz_results_deleted"]
         }
         
     except HTTPException:
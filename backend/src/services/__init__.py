@@ -1,6 +1,14 @@
+from src.services.dictionary_cache import dictionary_cache
+from src.services.suggestion_index import suggestion_index
+from src.services.entry_service import entry_service
+from src.services.search_service import search_service
+from src.services.stats_service import stats_service
+from src.services.deletion_service import deletion_service
 from src.services.dictionary_service import dictionary_service
 from src.services.learning_service import learning_service
 from src.services.progress_service import progress_service
 from src.services.quiz_service import quiz_service
+from src.services.import_service import import_service
+from src.services.export_service import export_service
 
 
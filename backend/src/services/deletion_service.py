@@ -0,0 +1,122 @@
+from typing import List, Dict, Any, Iterable
+
+from firebase_admin import firestore
+
+from src.firebase import async_db
+from src.services.search_service import search_service
+from src.services.stats_service import stats_service, StatsDelta
+from src.utils import logging, token_cache, data_version_update
+
+
+# Firestore allows at most 500 writes per batch and 30 values in an 'in' filter
+BATCH_LIMIT = 500
+IN_FILTER_LIMIT = 30
+
+
+def chunked(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class DeletionService:
+    """Delete words together with their progress and review history"""
+
+    async def delete_words(self, user_id: str, word_ids: List[str]) -> Dict[str, Any]:
+        """Delete the user's words and everything that references them in batched writes"""
+
+        word_ids = list(dict.fromkeys(word_ids))
+        refs = [async_db.collection("words").document(word_id) for word_id in word_ids]
+
+        owned = {}
+        async for doc in async_db.get_all(refs):
+            if doc.exists and doc.get("userId") == user_id:
+                owned[doc.id] = doc
+        not_found = [word_id for word_id in word_ids if word_id not in owned]
+
+        result = {
+            "deleted": [{"id": word_id, "word": doc.get("word")} for word_id, doc in owned.items()],
+            "not_found": not_found,
+            "progress_deleted": 0,
+            "quiz_results_deleted": 0
+        }
+        if not owned:
+            return result
+
+        dependents = await self.find_dependents(user_id, list(owned))
+        result["progress_deleted"] = len(dependents["progress"])
+        result["quiz_results_deleted"] = len(dependents["quiz_results"])
+
+        delta = dependents["stats"]
+        delta.total_words = -len(owned)
+
+        # Dependents go first so a failure part-way never leaves orphans behind a deleted word
+        await self.delete_refs(dependents["quiz_results"] + dependents["progress"])
+        await self.delete_refs([doc.reference for doc in owned.values()], stats_update=(user_id, delta))
+        await stats_service.commit_rollup(user_id, delta.rollup, BATCH_LIMIT)
+
+        token_cache.invalidate_user(user_id)
+        await search_service.apply_changes(user_id, removals=list(owned))
+
+        logging.info(
+            f"Deleted {len(owned)} words for user {user_id} "
+            f"({result['progress_deleted']} progress, {result['quiz_results_deleted']} quiz results)"
+        )
+        return result
+
+    async def find_dependents(self, user_id: str, word_ids: List[str]) -> Dict[str, Any]:
+        """Progress and quiz_results references pointing at the given words
+
+        Also returns, under "stats", the StatsDelta that removes them from the user's stats.
+        """
+
+        progress_refs = {}
+        quiz_result_refs = {}
+        delta = StatsDelta()
+        for chunk in chunked(word_ids, IN_FILTER_LIMIT):
+            progress_docs = await (async_db.collection("progress")
+                                   .where("userId", "==", user_id)
+                                   .where("wordId", "in", chunk)
+                                   .select(["strength", "nextReviewDate", "totalReviews", "correctReviews"])
+                                   .get())
+            for doc in progress_docs:
+                progress_refs[doc.id] = doc.reference
+                delta.remove_progress(doc.to_dict())
+
+            quiz_results = await (async_db.collection("quiz_results")
+                                  .where("userId", "==", user_id)
+                                  .where("wordId", "in", chunk)
+                                  .select(["reviewDate", "quizType", "isCorrect", "strengthBefore"])
+                                  .get())
+            for doc in quiz_results:
+                quiz_result_refs[doc.id] = doc.reference
+                delta.add_review(doc.to_dict(), sign=-1)
+
+        return {
+            "progress": list(progress_refs.values()),
+            "quiz_results": list(quiz_result_refs.values()),
+            "stats": delta
+        }
+
+    async def delete_refs(self, refs: List[Any], stats_update=None):
+        """Delete documents in chunks of one write batch each
+
+        `stats_update` is a (user_id, StatsDelta) pair applied in the last batch, so the
+        user's counters and stats document change together with the final deletes.
+        """
+
+        chunks = list(chunked(refs, BATCH_LIMIT - 2))
+        for position, chunk in enumerate(chunks):
+            batch = async_db.batch()
+            for ref in chunk:
+                batch.delete(ref)
+            if stats_update and position == len(chunks) - 1:
+                user_id, delta = stats_update
+                batch.update(async_db.collection("users").document(user_id), {
+                    "stats.total_words_added": firestore.Increment(delta.total_words),
+                    **data_version_update(words=True)
+                })
+                stats_service.apply(batch, user_id, delta, include_rollup=False)
+            await batch.commit()
+
+
+deletion_service = DeletionService()
@@ -0,0 +1,150 @@
+import json
+import mmap
+import struct
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+
+from src.utils import logging
+
+
+"""
+Offline dictionary bundle layout (all integers little-endian):
+
+    header   magic (8 bytes) | entry count (uint32)
+    index    one fixed-size record per word, sorted by the UTF-8 word bytes:
+             key offset (uint64) | key length (uint32) | payload offset (uint64) | payload length (uint32)
+    keys     concatenated UTF-8 words
+    payloads concatenated compact JSON DictionaryResponse payloads
+
+The file is memory-mapped, so only the pages touched by a binary search are read.
+"""
+
+BUNDLE_MAGIC = b"WMDICT01"
+HEADER = struct.Struct("<8sI")
+RECORD = struct.Struct("<QIQI")
+
+
+class DictionaryBundle:
+    """Read-only, memory-mapped index of pre-formatted dictionary entries"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = None
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_offset = HEADER.size
+            self._validate()
+        except Exception:
+            self.close()
+            raise
+
+    def _validate(self):
+        """Raise ValueError for anything but a complete bundle"""
+
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"{self.path} is truncated")
+        magic, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{self.path} is not a dictionary bundle")
+        if len(self._map) < HEADER.size + self.count * RECORD.size:
+            raise ValueError(f"{self.path} is truncated")
+
+        # Payloads are written in index order, so the last record ends the file
+        if self.count:
+            key_offset, key_length, payload_offset, payload_length = self._record(self.count - 1)
+            if max(key_offset + key_length, payload_offset + payload_length) > len(self._map):
+                raise ValueError(f"{self.path} is truncated")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def lookup(self, word: str) -> Optional[Dict[str, Any]]:
+        """Binary-search the index for a normalized word"""
+
+        key = word.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, payload_offset, payload_length = self._record(middle)
+            candidate = self._map[key_offset:key_offset + key_length]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return json.loads(self._map[payload_offset:payload_offset + payload_length])
+        return None
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """Up to `limit` words starting with a normalized prefix, read straight from the sorted index"""
+
+        key = prefix.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        words = []
+        for position in range(low, min(low + limit, self.count)):
+            candidate = self._key(position)
+            if not candidate.startswith(key):
+                break
+            words.append(candidate.decode("utf-8"))
+        return words
+
+    def headwords(self) -> Iterator[str]:
+        """Yield every word in sorted order"""
+
+        for position in range(self.count):
+            key_offset, key_length, _, _ = self._record(position)
+            yield self._map[key_offset:key_offset + key_length].decode("utf-8")
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _key(self, position: int) -> bytes:
+        key_offset, key_length, _, _ = self._record(position)
+        return self._map[key_offset:key_offset + key_length]
+
+    def _record(self, position: int) -> Tuple[int, int, int, int]:
+        return RECORD.unpack_from(self._map, self._index_offset + position * RECORD.size)
+
+    @staticmethod
+    def build(entries: Iterable[Tuple[str, Dict[str, Any]]], path: str) -> int:
+        """Write (word, formatted payload) pairs to a bundle file; returns the entry count"""
+
+        encoded = {}
+        for word, payload in entries:
+            key = word.strip().lower().encode("utf-8")
+            if key and key not in encoded:
+                encoded[key] = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+        keys = sorted(encoded)
+        keys_offset = HEADER.size + len(keys) * RECORD.size
+        payloads_offset = keys_offset + sum(len(key) for key in keys)
+
+        with open(path, "wb") as bundle_file:
+            bundle_file.write(HEADER.pack(BUNDLE_MAGIC, len(keys)))
+
+            key_offset, payload_offset = keys_offset, payloads_offset
+            for key in keys:
+                payload = encoded[key]
+                bundle_file.write(RECORD.pack(key_offset, len(key), payload_offset, len(payload)))
+                key_offset += len(key)
+                payload_offset += len(payload)
+
+            for key in keys:
+                bundle_file.write(key)
+            for key in keys:
+                bundle_file.write(encoded[key])
+
+        logging.info(f"Dictionary bundle written to {path} with {len(keys)} entries")
+        return len(keys)
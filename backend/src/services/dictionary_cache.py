@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
+
+from src.config import settings
+from src.utils import logging
+
+
+class DictionaryCache:
+    """Two-tier cache for formatted dictionary entries (memory LRU + SQLite)
+
+    Disk reads and writes run in a worker thread so SQLite never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 5000,
+        ttl_seconds: int = 86400,
+        disk_path: Optional[str] = None,
+        disk_ttl_seconds: int = 30 * 86400,
+        negative_max_size: int = 10000,
+        negative_ttl_seconds: int = 3600
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self.disk_ttl_seconds = disk_ttl_seconds
+        self.negative_max_size = negative_max_size
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._negative: "OrderedDict[str, float]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        # One connection shared by the worker threads
+        self._disk_lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.stale_hits = 0
+
+    async def get(self, word: str) -> Optional[Dict[str, Any]]:
+        """Return a cached entry from memory, then disk, or None"""
+
+        entry = self._memory.get(word)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.time():
+                self._memory.move_to_end(word)
+                self.memory_hits += 1
+                return data
+            del self._memory[word]
+
+        data = await asyncio.to_thread(self._disk_get, word)
+        if data is not None:
+            self.disk_hits += 1
+            self._memory_set(word, data)
+            return data
+
+        self.misses += 1
+        return None
+
+    async def get_stale(self, word: str) -> Optional[Dict[str, Any]]:
+        """Return a disk entry even if its TTL has passed (upstream outage fallback)"""
+
+        data = await asyncio.to_thread(self._disk_get, word, True)
+        if data is not None:
+            self.stale_hits += 1
+        return data
+
+    async def set(self, word: str, data: Dict[str, Any]):
+        """Store an entry in both tiers"""
+
+        self._negative.pop(word, None)
+        self._memory_set(word, data)
+        await asyncio.to_thread(self._disk_set, word, data)
+
+    def is_known_missing(self, word: str) -> bool:
+        """True if the dictionary recently answered 404 for this word"""
+
+        expires_at = self._negative.get(word)
+        if expires_at is None:
+            return False
+
+        if expires_at <= time.time():
+            del self._negative[word]
+            return False
+
+        self._negative.move_to_end(word)
+        self.negative_hits += 1
+        return True
+
+    def set_missing(self, word: str):
+        """Remember a dictionary miss for the negative TTL"""
+
+        self._negative[word] = time.time() + self.negative_ttl_seconds
+        self._negative.move_to_end(word)
+        while len(self._negative) > self.negative_max_size:
+            self._negative.popitem(last=False)
+
+    def cached_words(self) -> List[str]:
+        """Every word currently held in either tier"""
+
+        words = set(self._memory)
+        connection = self._get_connection()
+        if connection is not None:
+            try:
+                words.update(row[0] for row in connection.execute("SELECT word FROM entries"))
+            except sqlite3.Error as e:
+                logging.error(f"Dictionary disk cache scan failed: {str(e)}")
+        return list(words)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups * 100, 1) if lookups > 0 else 0,
+            "memory_entries": len(self._memory),
+            "memory_max_size": self.max_size,
+            "negative_hits": self.negative_hits,
+            "negative_entries": len(self._negative),
+            "stale_hits": self.stale_hits
+        }
+
+    def close(self):
+        with self._disk_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _memory_set(self, word: str, data: Dict[str, Any]):
+        self._memory[word] = (time.time() + self.ttl_seconds, data)
+        self._memory.move_to_end(word)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        if not self.disk_path:
+            return None
+
+        if self._connection is None:
+            try:
+                os.makedirs(os.path.dirname(self.disk_path) or ".", exist_ok=True)
+                self._connection = sqlite3.connect(self.disk_path, check_same_thread=False)
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                # A lost entry after a power cut is refetched; no fsync per write
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "word TEXT PRIMARY KEY, payload TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self._connection.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Dictionary disk cache unavailable: {str(e)}")
+                self.disk_path = None
+                self._connection = None
+
+        return self._connection
+
+    def _disk_get(self, word: str, ignore_ttl: bool = False) -> Optional[Dict[str, Any]]:
+        with self._disk_lock:
+            connection = self._get_connection()
+            if connection is None:
+                return None
+
+            try:
+                row = connection.execute(
+                    "SELECT payload, stored_at FROM entries WHERE word = ?", (word,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logging.error(f"Dictionary disk cache read failed for '{word}': {str(e)}")
+                return None
+
+        if row is None:
+            return None
+
+        payload, stored_at = row
+        if not ignore_ttl and stored_at + self.disk_ttl_seconds <= time.time():
+            return None
+        return json.loads(payload)
+
+    def _disk_set(self, word: str, data: Dict[str, Any]):
+        payload = json.dumps(data)
+        with self._disk_lock:
+            connection = self._get_connection()
+            if connection is None:
+                return
+
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (word, payload, stored_at) VALUES (?, ?, ?)",
+                    (word, payload, time.time())
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Dictionary disk cache write failed for '{word}': {str(e)}")
+
+
+dictionary_cache = DictionaryCache(
+    max_size=settings.DICTIONARY_CACHE_SIZE,
+    ttl_seconds=settings.DICTIONARY_CACHE_TTL,
+    disk_path=settings.DICTIONARY_CACHE_PATH,
+    disk_ttl_seconds=settings.DICTIONARY_DISK_CACHE_TTL,
+    negative_max_size=settings.DICTIONARY_NEGATIVE_CACHE_SIZE,
+    negative_ttl_seconds=settings.DICTIONARY_NEGATIVE_CACHE_TTL
+)
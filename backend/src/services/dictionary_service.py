@@ -1,40 +1,224 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union
 import asyncio
 
 from fastapi import HTTPException
 import httpx
 
+from src.config import settings
+from src.services.dictionary_bundle import DictionaryBundle
+from src.services.dictionary_cache import dictionary_cache
+from src.services.outbound_policy import OutboundPolicy, UpstreamUnavailableError
+from src.services.suggestion_index import suggestion_index
 from src.utils import logging
 
 
+class WordNotFoundError(Exception):
+    """Raised when the dictionary API answers 404 for a word"""
+
+
+class DictionaryUnavailableError(Exception):
+    """Raised when the dictionary API gave no answer for a word (open circuit, full bulkhead, timeout, server error)"""
+
+
 class DictionaryService:
     def __init__(self ):
         self.base_url = "https://api.dictionaryapi.dev/api/v2/entries/en"
-        self.timeout = 1000
+        self.timeout = settings.DICTIONARY_TIMEOUT
+        self.policy = OutboundPolicy(
+            default_timeout=settings.DICTIONARY_TIMEOUT,
+            min_timeout=settings.DICTIONARY_MIN_TIMEOUT,
+            max_timeout=settings.DICTIONARY_MAX_TIMEOUT,
+            hedging=settings.DICTIONARY_HEDGING,
+            max_concurrent=settings.DICTIONARY_MAX_CONCURRENT,
+            bulkhead_wait=settings.DICTIONARY_BULKHEAD_WAIT,
+            failure_threshold=settings.DICTIONARY_BREAKER_FAILURES,
+            reset_timeout=settings.DICTIONARY_BREAKER_RESET
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = dictionary_cache
+        self.bundle: Optional[DictionaryBundle] = None
+        self.bundle_hits = 0
+        self.suggestions = suggestion_index
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced_lookups = 0
+
+    async def start(self):
+        """Open the offline bundle and the shared keep-alive client (called from the app lifespan)"""
+        self._open_bundle()
+        self._build_suggestions()
+        if self.client is not None:
+            return
+
+        http2 = settings.DICTIONARY_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logging.warning("DICTIONARY_HTTP2 is enabled but the 'h2' package is missing, using HTTP/1.1")
+                http2 = False
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.DICTIONARY_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.DICTIONARY_MAX_KEEPALIVE,
+                keepalive_expiry=settings.DICTIONARY_KEEPALIVE_EXPIRY
+            )
+        )
+        logging.info(f"Dictionary HTTP client started (http2={http2})")
+
+    async def close(self):
+        """Close the shared client and release pooled connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logging.info("Dictionary HTTP client closed")
+        if self.bundle is not None:
+            self.bundle.close()
+            self.bundle = None
+        self.cache.close()
+
+    def _build_suggestions(self):
+        # Bundle words are searched in place; the index only holds words learned from the cache or API
+        self.suggestions.build(self.cache.cached_words())
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        suggestions = self.suggestions.suggest(prefix, limit)
+        clean_prefix = prefix.strip().lower()
+        if self.bundle is not None and clean_prefix:
+            suggestions = sorted(set(suggestions).union(self.bundle.suggest(clean_prefix, limit)))[:limit]
+        return suggestions
+
+    def _open_bundle(self):
+        if self.bundle is not None or not settings.DICTIONARY_BUNDLE_PATH:
+            return
+
+        try:
+            self.bundle = DictionaryBundle(settings.DICTIONARY_BUNDLE_PATH)
+            logging.info(f"Dictionary bundle loaded with {len(self.bundle)} entries")
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not open dictionary bundle: {str(e)}")
+            self.bundle = None
 
     async def lookup_word(self, word: str ) -> Optional[Dict[str,Any]] :
+        """Formatted entry, or None if the word is missing; raises DictionaryUnavailableError if it could not be resolved"""
+        clean_word = word.strip().lower()
+
+        # Offline bundle first, the network is only a fallback
+        if self.bundle is not None:
+            bundle_data = self.bundle.lookup(clean_word)
+            if bundle_data is not None:
+                self.bundle_hits += 1
+                return bundle_data
+            if not settings.DICTIONARY_NETWORK_FALLBACK:
+                return None
+
+        if self.cache.is_known_missing(clean_word):
+            return None
+
+        cached_data = await self.cache.get(clean_word)
+        if cached_data is not None:
+            return cached_data
+
+        # Concurrent lookups for the same word share one outbound request
+        in_flight = self._in_flight.get(clean_word)
+        if in_flight is not None:
+            self.coalesced_lookups += 1
+            return await asyncio.shield(in_flight)
+
+        task = asyncio.ensure_future(self._fetch_and_cache(clean_word))
+        self._in_flight[clean_word] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(clean_word, None))
+        return await asyncio.shield(task)
+
+    async def lookup_words(
+        self,
+        words: List[str],
+        concurrency: int = 8
+    ) -> Dict[str, Union[Dict[str, Any], None, DictionaryUnavailableError]]:
+        """Look up several words with at most `concurrency` lookups in flight
+
+        Missing words map to None, words the dictionary could not answer to their DictionaryUnavailableError.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded_lookup(word: str):
+            async with semaphore:
+                try:
+                    return await self.lookup_word(word)
+                except DictionaryUnavailableError as e:
+                    return e
+
+        clean_words = list(dict.fromkeys(w.strip().lower() for w in words if w and w.strip()))
+        results = await asyncio.gather(*(bounded_lookup(w) for w in clean_words))
+        return dict(zip(clean_words, results))
+
+    def is_known_missing(self, word: str) -> bool:
+        return self.cache.is_known_missing(word.strip().lower())
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            **self.cache.stats(),
+            "bundle_entries": len(self.bundle) if self.bundle is not None else 0,
+            "bundle_hits": self.bundle_hits,
+            "coalesced_lookups": self.coalesced_lookups,
+            "in_flight": len(self._in_flight),
+            "upstream": self.policy.stats()
+        }
+
+    async def _fetch_and_cache(self, word: str) -> Optional[Dict[str, Any]]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout ) as client:
-                url = f"{self.base_url}/{word.lower()}"
-                response = await client.get(url)
-                if response.status_code == 200:
-                    data = response.json()
-                    formatted_data = self._format_word_data(data[0])
-                    add_word_endpoint = "http://localhost:5000/api/word"
-                    
-                    return formatted_data
-                elif response.status_code == 404:
-                    logging.info(f"The word: {word} is not found in the dictionary")
-                    return None
-                else:
-                    logging.info(f"Dictionary API Error: {response.status_code}")
-                    return None
+            formatted_data = await self._fetch_word(word)
+        except WordNotFoundError:
+            self.cache.set_missing(word)
+            return None
+        except DictionaryUnavailableError:
+            # Upstream failed, an expired entry beats no entry
+            stale_data = await self.cache.get_stale(word)
+            if stale_data is None:
+                raise
+            return stale_data
+
+        await self.cache.set(word, formatted_data)
+        self.suggestions.add(word)
+        return formatted_data
+
+    async def _fetch_word(self, word: str) -> Dict[str, Any]:
+        """Fetch and format a word from the external dictionary API
+
+        Raises WordNotFoundError for a 404 and DictionaryUnavailableError for any other failure.
+        """
+        try:
+            if self.client is None:
+                await self.start()
+
+            response = await self.policy.call(
+                lambda timeout: self.client.get(f"/{word}", timeout=timeout)
+            )
+            if response.status_code == 200:
+                data = response.json()
+                formatted_data = self._format_word_data(data[0])
+                
+                return formatted_data
+            elif response.status_code == 404:
+                logging.info(f"The word: {word} is not found in the dictionary")
+                raise WordNotFoundError(word)
+            else:
+                logging.info(f"Dictionary API Error: {response.status_code}")
+                raise DictionaryUnavailableError(f"status {response.status_code}")
+        except (WordNotFoundError, DictionaryUnavailableError):
+            raise
+        except UpstreamUnavailableError as e:
+            logging.warning(f"Dictionary API skipped for word '{word}': {str(e)}")
+            raise DictionaryUnavailableError(str(e))
         except httpx.TimeoutException:
             logging.error(f"Dictionary API timeout for word: {word}")
-            return None
+            raise DictionaryUnavailableError("timeout")
         except Exception as e:
             logging.error(f"Dictionary API error for word '{word}': {str(e)}")
-            return None
+            raise DictionaryUnavailableError(str(e))
     
     def _format_word_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -72,8 +256,9 @@ class DictionaryService:
                 "phonetic": main_phonetic,
                 "phonetics": phonetics,
                 "definitions": definitions,
-                "synonyms": list(synonyms)[:5],  
-                "antonyms": list(antonyms)[:5],   
+                # Sorted so every process picks the same five (set order depends on the hash seed)
+                "synonyms": sorted(synonyms)[:5],
+                "antonyms": sorted(antonyms)[:5],
                 "source": "dictionaryapi.dev"
             }
             return result
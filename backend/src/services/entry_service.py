@@ -0,0 +1,98 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Tuple
+
+from src.config import settings
+from src.firebase import async_db
+
+
+ENTRY_FIELDS = ("definitions", "phonetics", "synonyms", "antonyms")
+
+
+class EntryService:
+    """Shared, content-addressed dictionary entries referenced by user word documents"""
+
+    def __init__(self, max_cache_size: int = 10000):
+        self.collection = "dictionary_entries"
+        self.max_cache_size = max_cache_size
+        # Entries never change once written (the id is their hash), so caching them is always safe
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def entry_id(entry: Dict[str, Any]) -> str:
+        canonical = json.dumps(entry, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def prepare_entry(self, word: str, dictionary_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Build the shared entry for a headword and its content id"""
+
+        entry = {"word": word, **{field: dictionary_data.get(field, []) for field in ENTRY_FIELDS}}
+        # Word lists are sets in disguise: order them so equal content always hashes the same
+        for field in ("synonyms", "antonyms"):
+            entry[field] = sorted(entry[field])
+        return self.entry_id(entry), entry
+
+    def is_stored(self, entry_id: str) -> bool:
+        return entry_id in self._cache
+
+    def entry_ref(self, entry_id: str):
+        return async_db.collection(self.collection).document(entry_id)
+
+    async def save_entry(self, word: str, dictionary_data: Dict[str, Any]) -> str:
+        """Store the shared entry for a headword once and return its id"""
+
+        entry_id, entry = self.prepare_entry(word, dictionary_data)
+
+        if entry_id not in self._cache:
+            await self.entry_ref(entry_id).set(entry)
+            self.remember(entry_id, entry)
+        return entry_id
+
+    async def get_entries(self, entry_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve entry ids from the in-process cache, fetching misses in one batch"""
+
+        entries = {}
+        missing = []
+        for entry_id in set(entry_ids):
+            entry = self._cache.get(entry_id)
+            if entry is not None:
+                self._cache.move_to_end(entry_id)
+                entries[entry_id] = entry
+            else:
+                missing.append(entry_id)
+
+        if missing:
+            refs = [async_db.collection(self.collection).document(entry_id) for entry_id in missing]
+            async for doc in async_db.get_all(refs):
+                if doc.exists:
+                    entry = doc.to_dict()
+                    self.remember(doc.id, entry)
+                    entries[doc.id] = entry
+
+        return entries
+
+    async def resolve_words(self, words_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill dictionary fields of word documents that only reference an entry (in place)"""
+
+        entry_ids = [data["entryId"] for data in words_data if data.get("entryId")]
+        if not entry_ids:
+            return words_data
+
+        entries = await self.get_entries(entry_ids)
+        for data in words_data:
+            entry = entries.get(data.get("entryId"))
+            if entry is None:
+                continue
+            for field in ENTRY_FIELDS:
+                data.setdefault(field, entry.get(field, []))
+        return words_data
+
+    def remember(self, entry_id: str, entry: Dict[str, Any]):
+        self._cache[entry_id] = entry
+        self._cache.move_to_end(entry_id)
+        while len(self._cache) > self.max_cache_size:
+            self._cache.popitem(last=False)
+
+
+entry_service = EntryService(max_cache_size=settings.ENTRY_CACHE_SIZE)
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+from typing import Dict, Any, AsyncIterator, Optional
+
+from src.config import settings
+from src.firebase import async_db
+from src.services.entry_service import entry_service
+from src.services.response_mapper import to_isoformat
+from src.utils import progress_doc_id
+
+
+CSV_COLUMNS = [
+    "id", "word", "added_at", "source", "source_url", "user_notes", "is_favorite", "difficulty_level",
+    "definitions", "synonyms", "antonyms",
+    "strength", "total_reviews", "correct_reviews", "next_review_date", "last_reviewed"
+]
+
+
+class ExportService:
+    """Stream a user's vocabulary joined with progress, one Firestore page at a time"""
+
+    def __init__(self, page_size: int = 500):
+        self.page_size = page_size
+
+    async def iter_rows(self, user_id: str) -> AsyncIterator[Dict[str, Any]]:
+        query = (async_db.collection("words")
+                 .where("userId", "==", user_id)
+                 .order_by("__name__")
+                 .limit(self.page_size))
+
+        last_doc = None
+        while True:
+            page_query = query.start_after(last_doc) if last_doc is not None else query
+            docs = await page_query.get()
+            if not docs:
+                return
+
+            words_data = await entry_service.resolve_words([doc.to_dict() for doc in docs])
+            progress_refs = [
+                async_db.collection("progress").document(progress_doc_id(user_id, doc.id))
+                for doc in docs
+            ]
+            progress_by_word = {}
+            async for progress_doc in async_db.get_all(progress_refs):
+                if progress_doc.exists:
+                    progress = progress_doc.to_dict()
+                    progress_by_word[progress.get("wordId")] = progress
+
+            for doc, word_data in zip(docs, words_data):
+                yield self._row(doc.id, word_data, progress_by_word.get(doc.id))
+
+            if len(docs) < self.page_size:
+                return
+            last_doc = docs[-1]
+
+    @staticmethod
+    def _row(word_id: str, word_data: Dict[str, Any], progress: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        progress = progress or {}
+        return {
+            "id": word_id,
+            "word": word_data.get("word", ""),
+            "added_at": to_isoformat(word_data.get("addedAt")),
+            "source": word_data.get("source", "manual"),
+            "source_url": word_data.get("sourceUrl"),
+            "user_notes": word_data.get("userNotes"),
+            "is_favorite": word_data.get("isFavorite", False),
+            "difficulty_level": word_data.get("difficultyLevel"),
+            "definitions": word_data.get("definitions", []),
+            "phonetics": word_data.get("phonetics", []),
+            "synonyms": word_data.get("synonyms", []),
+            "antonyms": word_data.get("antonyms", []),
+            "strength": progress.get("strength"),
+            "total_reviews": progress.get("totalReviews", 0),
+            "correct_reviews": progress.get("correctReviews", 0),
+            "next_review_date": to_isoformat(progress.get("nextReviewDate")),
+            "last_reviewed": to_isoformat(progress.get("lastReviewed"))
+        }
+
+    async def stream_ndjson(self, user_id: str) -> AsyncIterator[str]:
+        async for row in self.iter_rows(user_id):
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    async def stream_csv(self, user_id: str) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(CSV_COLUMNS)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+        async for row in self.iter_rows(user_id):
+            row["definitions"] = " | ".join(d.get("definition", "") for d in row["definitions"])
+            row["synonyms"] = ", ".join(row["synonyms"])
+            row["antonyms"] = ", ".join(row["antonyms"])
+            writer.writerow([row[column] for column in CSV_COLUMNS])
+
+            # Hand each line to the client instead of growing the buffer
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+
+export_service = ExportService(page_size=settings.EXPORT_PAGE_SIZE)
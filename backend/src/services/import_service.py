@@ -0,0 +1,294 @@
+import asyncio
+import csv
+import re
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, AsyncIterator, Tuple, Optional
+
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+
+from src.config import settings
+from src.firebase import async_db
+from src.services.dictionary_service import dictionary_service, DictionaryUnavailableError
+from src.services.entry_service import entry_service
+from src.services.search_service import search_service
+from src.services.stats_service import stats_service, StatsDelta
+from src.utils import logging, token_cache, word_doc_id, data_version_update
+
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+# Commits of one chunk retried after a concurrent create conflicts with it
+IMPORT_COMMIT_ATTEMPTS = 3
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_length: int = 4096,
+    max_bytes: int = 5 * 1024 * 1024
+) -> AsyncIterator[str]:
+    """Split a streamed upload into decoded text lines, rejecting oversized bodies and lines"""
+
+    pending = b""
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_bytes:
+            raise ValueError(f"Uploads are limited to {max_bytes} bytes")
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if len(line) > max_line_length:
+                raise ValueError(f"Lines are limited to {max_line_length} bytes")
+            yield line.decode("utf-8-sig", errors="ignore").rstrip("\r")
+        if len(pending) > max_line_length:
+            raise ValueError(f"Lines are limited to {max_line_length} bytes")
+    if pending:
+        yield pending.decode("utf-8-sig", errors="ignore").rstrip("\r")
+
+
+def parse_line(line: str, file_format: str) -> Optional[Tuple[str, Optional[str]]]:
+    """Return (word, notes) from one line of a plain list, CSV or Anki export"""
+
+    if not line.strip():
+        return None
+
+    if file_format == "anki":
+        # Anki text exports are tab separated, with '#key:value' header lines
+        if line.startswith("#"):
+            return None
+        fields = [HTML_TAG_PATTERN.sub("", field).strip() for field in line.split("\t")]
+    elif file_format == "csv":
+        fields = [field.strip() for field in next(csv.reader([line]), [])]
+    else:
+        fields = [line.strip()]
+
+    if not fields or not fields[0]:
+        return None
+
+    word = fields[0].lower()
+    notes = fields[1][:500] if len(fields) > 1 and fields[1] else None
+    return word, notes
+
+
+class ImportService:
+    """Bulk vocabulary imports processed in the background with pollable jobs"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict[str, Any]] = {}  # Store job progress in memory
+        self._tasks = set()
+
+    async def read_upload(self, chunks: AsyncIterator[bytes], file_format: str) -> List[Tuple[str, Optional[str]]]:
+        """Parse the uploaded stream into unique (word, notes) pairs"""
+
+        entries = {}
+        header_skipped = False
+        async for line in iter_lines(chunks, settings.IMPORT_MAX_LINE_LENGTH, settings.IMPORT_MAX_BYTES):
+            parsed = parse_line(line, file_format)
+            if parsed is None:
+                continue
+
+            word, notes = parsed
+            if file_format == "csv" and not header_skipped:
+                header_skipped = True
+                if word in ("word", "words", "term", "front"):
+                    continue
+
+            if word not in entries and len(word) <= 100:
+                entries[word] = notes
+                if len(entries) > settings.IMPORT_MAX_WORDS:
+                    raise ValueError(f"Imports are limited to {settings.IMPORT_MAX_WORDS} words")
+
+        return list(entries.items())
+
+    def start_import(self, user_id: str, entries: List[Tuple[str, Optional[str]]], source: str) -> Dict[str, Any]:
+        """Register a job and process it in the background"""
+
+        self.cleanup_old_jobs()
+
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": "pending",
+            "total": len(entries),
+            "processed": 0,
+            "imported": 0,
+            "duplicates": 0,
+            "not_found": 0,
+            "failed": 0,
+            "not_found_words": [],
+            "created_at": datetime.now(),
+            "finished_at": None
+        }
+        self.jobs[job_id] = job
+
+        task = asyncio.create_task(self._run(job, entries, source))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get_job(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is None or job["user_id"] != user_id:
+            return None
+        return job
+
+    async def _run(self, job: Dict[str, Any], entries: List[Tuple[str, Optional[str]]], source: str):
+        user_id = job["user_id"]
+        job["status"] = "running"
+        try:
+            # Dedupe against the existing vocabulary with one projected query
+            existing_docs = await (async_db.collection("words")
+                                   .where("userId", "==", user_id)
+                                   .select(["word"])
+                                   .get())
+            existing_words = {doc.get("word") for doc in existing_docs}
+
+            new_entries = []
+            for word, notes in entries:
+                if word in existing_words:
+                    job["duplicates"] += 1
+                    job["processed"] += 1
+                else:
+                    new_entries.append((word, notes))
+
+            # Each word needs up to two writes, plus the user and stats updates, and a batch holds at most 500
+            chunk_size = min(settings.IMPORT_BATCH_SIZE, 249)
+            for start in range(0, len(new_entries), chunk_size):
+                await self._import_chunk(job, new_entries[start:start + chunk_size], source)
+
+            job["status"] = "completed"
+        except Exception as e:
+            logging.error(f"Import job {job['job_id']} failed: {str(e)}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now()
+            token_cache.invalidate_user(user_id)
+
+    async def _import_chunk(self, job: Dict[str, Any], chunk: List[Tuple[str, Optional[str]]], source: str):
+        """Resolve one chunk with bounded parallelism and commit it in a single batch"""
+
+        user_id = job["user_id"]
+        lookups = await dictionary_service.lookup_words(
+            [word for word, _ in chunk],
+            concurrency=settings.IMPORT_CONCURRENCY
+        )
+
+        # Words added since the job started (another request, a parallel import) are left
+        # untouched: one read of the chunk's ids right before the batch is built
+        word_refs = {word: async_db.collection("words").document(word_doc_id(user_id, word)) for word, _ in chunk}
+        candidates = []
+        for word, notes in await self._drop_existing(job, word_refs, chunk):
+            dictionary_data = lookups.get(word)
+            if isinstance(dictionary_data, DictionaryUnavailableError):
+                # Upstream outage, not a missing word: the user can retry these
+                job["failed"] += 1
+                continue
+            if not dictionary_data:
+                job["not_found"] += 1
+                job["not_found_words"].append(word)
+                continue
+            candidates.append((word, notes, dictionary_data))
+
+        added_words = []
+        for _ in range(IMPORT_COMMIT_ATTEMPTS):
+            if not candidates:
+                break
+
+            batch, new_entries, added_words = self._build_batch(user_id, word_refs, candidates, source)
+            try:
+                await batch.commit()
+                break
+            except AlreadyExists:
+                # A word was created between the read and the commit: drop it and retry the rest
+                added_words = []
+                candidates = await self._drop_existing(job, word_refs, candidates)
+            except Exception as e:
+                logging.error(f"Import batch failed for job {job['job_id']}: {str(e)}")
+                job["failed"] += len(candidates)
+                job["processed"] += len(chunk)
+                return
+        else:
+            job["failed"] += len(candidates)
+
+        if added_words:
+            token_cache.invalidate_user(user_id)
+            for entry_id, entry in new_entries.items():
+                entry_service.remember(entry_id, entry)
+            await search_service.apply_changes(user_id, dict(added_words))
+
+        job["imported"] += len(added_words)
+        job["processed"] += len(chunk)
+
+    async def _drop_existing(self, job: Dict[str, Any], word_refs: Dict[str, Any], items: List[tuple]) -> List[tuple]:
+        """Count items whose word document already exists as duplicates and return the rest"""
+
+        if not items:
+            return items
+
+        refs = [word_refs[item[0]] for item in items]
+        existing_ids = {
+            doc.id async for doc in async_db.get_all(refs, field_paths=["word"])
+            if doc.exists
+        }
+        remaining = [item for item in items if word_refs[item[0]].id not in existing_ids]
+        job["duplicates"] += len(items) - len(remaining)
+        return remaining
+
+    def _build_batch(
+        self,
+        user_id: str,
+        word_refs: Dict[str, Any],
+        candidates: List[Tuple[str, Optional[str], Dict[str, Any]]],
+        source: str
+    ):
+        """One batch creating the candidates' words, their new shared entries and the user update"""
+
+        batch = async_db.batch()
+        new_entries = {}
+        added_words = []
+        for word, notes, dictionary_data in candidates:
+            entry_id, entry = entry_service.prepare_entry(word, dictionary_data)
+            if not entry_service.is_stored(entry_id) and entry_id not in new_entries:
+                batch.set(entry_service.entry_ref(entry_id), entry)
+                new_entries[entry_id] = entry
+
+            word_doc = {
+                "userId": user_id,
+                "word": word,
+                "addedAt": firestore.SERVER_TIMESTAMP,
+                "source": source,
+                "sourceUrl": None,
+                "entryId": entry_id,
+                "userNotes": notes,
+                "isFavorite": False,
+                "difficultyLevel": None
+            }
+            # create, not set: a word written after the read fails the batch instead of being reset
+            batch.create(word_refs[word], word_doc)
+            added_words.append((word_refs[word].id, {**word_doc, **dictionary_data}))
+
+        batch.update(async_db.collection("users").document(user_id), {
+            "stats.total_words_added": firestore.Increment(len(added_words)),
+            **data_version_update(words=True)
+        })
+        delta = StatsDelta()
+        delta.total_words = len(added_words)
+        stats_service.apply(batch, user_id, delta)
+        return batch, new_entries, added_words
+
+    def cleanup_old_jobs(self):
+        """Remove finished jobs older than 1 hour from memory"""
+
+        cutoff_time = datetime.now() - timedelta(hours=1)
+        expired_job_ids = [
+            job_id for job_id, job in self.jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff_time
+        ]
+        for job_id in expired_job_ids:
+            del self.jobs[job_id]
+
+
+import_service = ImportService()
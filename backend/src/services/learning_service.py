@@ -1,8 +1,9 @@
 import math
 import random
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Sequence, Union
 from datetime import datetime, timedelta
 
+import numpy as np
 from firebase_admin import firestore
 
 
@@ -26,6 +27,10 @@ class SpacedRepetitionSevice:
             "hard": 0.8         # 20% shorter intervals
         }
 
+        # Lookup table for the batch scheduler: index = strength
+        self.base_interval_array = np.array([self.base_intervals[strength] for strength in range(7)], dtype=float)
+        self.rng = np.random.default_rng()
+
     def calculate_next_review(self,
                             current_strength: int,
                             is_correct: bool,
@@ -51,6 +56,46 @@ class SpacedRepetitionSevice:
         next_review = datetime.now() + timedelta(days=final_days)
 
         return next_review, new_strength
+
+    def calculate_next_reviews(self,
+                               current_strengths: Sequence[int],
+                               is_correct: Sequence[bool],
+                               difficulty_levels: Optional[Sequence[Optional[str]]] = None,
+                               consecutive_correct: Optional[Sequence[int]] = None,
+                               rng: Union[np.random.Generator, int, None] = None,
+                               now: Optional[datetime] = None) -> Tuple[List[datetime], np.ndarray]:
+        """Batch version of calculate_next_review: one NumPy pass over many words
+
+        Same rules as the single-word call. `rng` is a Generator or a seed, so a seeded run
+        always produces the same jitter; by default the service's own generator is used.
+        Returns the next review datetimes and the new strengths, in input order.
+        """
+
+        strengths = np.clip(np.asarray(current_strengths, dtype=np.int64), 0, 6)
+        correct = np.asarray(is_correct, dtype=bool)
+        count = len(strengths)
+        if consecutive_correct is None:
+            consecutive = np.zeros(count)
+        else:
+            consecutive = np.asarray(consecutive_correct, dtype=float)
+
+        new_strengths = np.where(correct, np.minimum(strengths + 1, 6), np.maximum(strengths - 2, 0))
+        bonus_multipliers = np.where(correct, 1 + consecutive * 0.1, 1.0)
+
+        difficulty_multipliers = np.ones(count)
+        if difficulty_levels is not None:
+            levels = np.asarray(difficulty_levels, dtype=object)
+            for level, multiplier in self.difficulty_multipliers.items():
+                difficulty_multipliers[levels == level] = multiplier
+
+        generator = self.rng if rng is None else np.random.default_rng(rng)
+        randomness = generator.uniform(0.8, 1.2, size=count)
+
+        final_days = self.base_interval_array[new_strengths] * difficulty_multipliers * bonus_multipliers * randomness
+        offsets = np.round(final_days * 86400 * 1_000_000).astype("timedelta64[us]")
+        next_reviews = np.datetime64(now or datetime.now(), "us") + offsets
+
+        return next_reviews.tolist(), new_strengths
     
     def get_strength_description(self,strength: int) -> str:
         descriptions = {
@@ -0,0 +1,189 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+import httpx
+
+from src.utils import logging
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when the circuit is open or the bulkhead is full"""
+
+
+class LatencyTracker:
+    """Sliding window of recent successful request latencies (seconds)"""
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window_size)
+
+    def record(self, latency: float):
+        self._samples.append(latency)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        position = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[position]
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probe_in_flight = False
+
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        return False
+
+    def release_probe(self):
+        """Free the probe slot of a call that ended without an outcome (rejected or cancelled)"""
+        if self.state == "half_open":
+            self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logging.warning(f"Circuit opened after {self.failures} upstream failures")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class OutboundPolicy:
+    """Adaptive timeout, hedging, circuit breaker and bulkhead for one upstream"""
+
+    def __init__(
+        self,
+        default_timeout: float = 5.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 10.0,
+        timeout_multiplier: float = 3.0,
+        hedging: bool = True,
+        max_concurrent: int = 20,
+        bulkhead_wait: float = 0.5,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30
+    ):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.hedging = hedging
+        self.bulkhead_wait = bulkhead_wait
+
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._bulkhead = asyncio.Semaphore(max_concurrent)
+
+        self.hedged_requests = 0
+        self.rejected_requests = 0
+
+    def current_timeout(self) -> float:
+        """Timeout derived from the observed p99 latency, clamped to [min, max]"""
+        p99 = self.latency.percentile(99)
+        if p99 is None:
+            return self.default_timeout
+        return max(self.min_timeout, min(self.max_timeout, p99 * self.timeout_multiplier))
+
+    async def call(self, request: Callable[[float], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Run `request(timeout)` under the policy"""
+
+        if not self.breaker.allow():
+            self.rejected_requests += 1
+            raise UpstreamUnavailableError("circuit open")
+
+        probe = self.breaker.state == "half_open"
+        try:
+            return await self._call(request)
+        finally:
+            # Otherwise a probe that never reached an outcome would keep the circuit shut
+            if probe:
+                self.breaker.release_probe()
+
+    async def _call(self, request: Callable[[float], Awaitable[httpx.Response]]) -> httpx.Response:
+        try:
+            await asyncio.wait_for(self._bulkhead.acquire(), timeout=self.bulkhead_wait)
+        except asyncio.TimeoutError:
+            self.rejected_requests += 1
+            raise UpstreamUnavailableError("too many concurrent upstream requests")
+
+        started = time.monotonic()
+        try:
+            response = await self._hedged(request, self.current_timeout())
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._bulkhead.release()
+
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+            self.latency.record(time.monotonic() - started)
+        return response
+
+    async def _hedged(self, request, timeout: float) -> httpx.Response:
+        first = asyncio.ensure_future(request(timeout))
+        hedge_delay = self.latency.percentile(95) if self.hedging else None
+        if hedge_delay is None:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+        if done:
+            return first.result()
+
+        # The first attempt is slower than p95, race a second one against it
+        self.hedged_requests += 1
+        pending = {first, asyncio.ensure_future(request(timeout))}
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "timeout_seconds": round(self.current_timeout(), 2),
+            "hedged_requests": self.hedged_requests,
+            "rejected_requests": self.rejected_requests
+        }
@@ -3,32 +3,29 @@ from typing import List,Optional,Dict,Any
 from firebase_admin import firestore
 
 
-from src.services import learning_service
-from src.firebase import db
-from src.utils import logging
+from src.services import learning_service, entry_service
+from src.services.stats_service import stats_service, StatsDelta, today_key
+from src.firebase import async_db
+from src.utils import logging, token_cache, progress_doc_id, data_version_update
+
+
+# Fields a review changes on an existing progress document
+REVIEW_FIELDS = ("strength", "totalReviews", "correctReviews", "consecutiveCorrect",
+                 "nextReviewDate", "lastReviewed", "updatedAt")
+
+# Word fields due-word cards need (dictionary fields come from the shared entry)
+DUE_WORD_FIELDS = ["word", "entryId", "userNotes", "definitions", "phonetics", "synonyms", "antonyms"]
+
+# Each review writes a progress entry and a quiz result; a commit holds at most 500 writes
+REVIEW_SESSION_CHUNK = 200
 
 
 class ProgressService:
     """Service for managing user learning progress"""
     
-    async def get_or_create_progress(self, user_id: str, word_id: str) -> Dict[str, Any]:
-        """Get existing progress or create new progress entry for a word"""
-        
-        # Check if progress already exists
-        progress_query = db.collection("progress").filter(
-            "userId", "==", user_id,
-            "wordId", "==", word_id
-        )
-        existing_progress = list(progress_query.stream())
-
-        
-        if existing_progress:
-            # Return existing progress
-            doc = existing_progress[0]
-            return {"id": doc.id, **doc.to_dict()}
-        
-        # Create new progress entry
-        new_progress = {
+    @staticmethod
+    def _new_progress(user_id: str, word_id: str) -> Dict[str, Any]:
+        return {
             "userId": user_id,
             "wordId": word_id,
             "strength": 0,  # New word
@@ -40,11 +37,6 @@ class ProgressService:
             "createdAt": firestore.SERVER_TIMESTAMP,
             "updatedAt": firestore.SERVER_TIMESTAMP
         }
-        
-        doc_ref = db.collection("progress").add(new_progress)
-        progress_id = doc_ref[1].id
-        
-        return {"id": progress_id, **new_progress}
     
     async def update_progress(
         self, 
@@ -56,93 +48,213 @@ class ProgressService:
     ) -> Dict[str, Any]:
         """Update word progress based on review result"""
         
-        # Get current progress
-        progress = await self.get_or_create_progress(user_id, word_id)
-        progress_id = progress["id"]
+        session = await self.record_review_session(user_id, [{
+            "word_id": word_id,
+            "is_correct": is_correct,
+            "quiz_type": quiz_type,
+            "response_time_ms": response_time_ms
+        }])
+        if not session["updated_words"]:
+            raise ValueError("Word not found")
         
-        # Get word difficulty level
-        word_doc = db.collection("words").document(word_id).get()
-        word_data = word_doc.to_dict() if word_doc.exists else {}
-        difficulty_level = word_data.get("difficultyLevel")
+        # Return updated progress
+        return session["updated_words"][0]
         
-        # Calculate new strength and next review date
-        current_strength = progress.get("strength", 0)
-        consecutive_correct = progress.get("consecutiveCorrect", 0)
+    def _schedule_reviews(
+        self,
+        progresses: List[Dict[str, Any]],
+        is_correct: List[bool],
+        difficulty_levels: List[Optional[str]]
+    ) -> List[Dict[str, Any]]:
+        """Progress fields after one review of each word, scheduled in a single batch call"""
         
-        next_review_date, new_strength = learning_service.calculate_next_review(
-            current_strength=current_strength,
+        consecutive = [progress.get("consecutiveCorrect", 0) for progress in progresses]
+        next_review_dates, new_strengths = learning_service.calculate_next_reviews(
+            current_strengths=[progress.get("strength", 0) for progress in progresses],
             is_correct=is_correct,
-            difficulty_level=difficulty_level,
-            consecutive_correct=consecutive_correct if is_correct else 0
+            difficulty_levels=difficulty_levels,
+            consecutive_correct=[count if correct else 0 for count, correct in zip(consecutive, is_correct)]
         )
         
-        # Update counters
-        new_total_reviews = progress.get("totalReviews", 0) + 1
-        new_correct_reviews = progress.get("correctReviews", 0) + (1 if is_correct else 0)
-        new_consecutive_correct = (consecutive_correct + 1) if is_correct else 0
+        return [
+            {
+                "strength": int(new_strength),
+                "totalReviews": progress.get("totalReviews", 0) + 1,
+                "correctReviews": progress.get("correctReviews", 0) + (1 if correct else 0),
+                "consecutiveCorrect": (count + 1) if correct else 0,
+                "nextReviewDate": next_review_date,
+                "lastReviewed": firestore.SERVER_TIMESTAMP,
+                "updatedAt": firestore.SERVER_TIMESTAMP
+            }
+            for progress, correct, count, next_review_date, new_strength
+            in zip(progresses, is_correct, consecutive, next_review_dates, new_strengths)
+        ]
+    
+    async def record_review_session(self, user_id: str, reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply a whole review session with one read and one atomic commit per chunk
         
-        # Prepare update data
-        update_data = {
-            "strength": new_strength,
-            "totalReviews": new_total_reviews,
-            "correctReviews": new_correct_reviews,
-            "consecutiveCorrect": new_consecutive_correct,
-            "nextReviewDate": next_review_date,
-            "lastReviewed": firestore.SERVER_TIMESTAMP,
-            "updatedAt": firestore.SERVER_TIMESTAMP
-        }
-
-
-
-
-        db.collection("progress").document(progress_id).update(update_data)
+        Reviews of words the user does not own are skipped. Returns the final progress of
+        every reviewed word (with its strength before the session as "strengthBefore") plus
+        the number of applied and correct reviews. The user's stats document changes in the
+        same commit.
+        """
         
-        # Record this review in quiz_results collection
-        quiz_result = {
-            "userId": user_id,
-            "wordId": word_id,
-            "isCorrect": is_correct,
-            "quizType": quiz_type,
-            "responseTimeMs": response_time_ms,
-            "strengthBefore": current_strength,
-            "strengthAfter": new_strength,
-            "reviewDate": firestore.SERVER_TIMESTAMP
-        }
-        db.collection("quiz_results").add(quiz_result)
+        updated_words: Dict[str, Dict[str, Any]] = {}
+        applied = correct = 0
+        for start in range(0, len(reviews), REVIEW_SESSION_CHUNK):
+            chunk = reviews[start:start + REVIEW_SESSION_CHUNK]
+            chunk_words, chunk_applied, chunk_correct = await self._commit_reviews(user_id, chunk)
+            updated_words.update(chunk_words)
+            applied += chunk_applied
+            correct += chunk_correct
         
-        # Update user stats
-        await self._update_user_stats(user_id, is_correct)
+        if applied:
+            token_cache.invalidate_user(user_id)
+        return {"updated_words": list(updated_words.values()), "reviewed": applied, "correct": correct}
+    
+    async def _commit_reviews(self, user_id: str, reviews: List[Dict[str, Any]]):
+        word_ids = list(dict.fromkeys(review["word_id"] for review in reviews))
+        word_refs = {word_id: async_db.collection("words").document(word_id) for word_id in word_ids}
+        progress_refs = {
+            word_id: async_db.collection("progress").document(progress_doc_id(user_id, word_id))
+            for word_id in word_ids
+        }
+        stats_ref = stats_service.stats_ref(user_id)
         
-        # Return updated progress
-        updated_progress = {**progress, **update_data}
-        updated_progress["id"] = progress_id
-        return updated_progress
+        @firestore.async_transactional
+        async def apply(transaction):
+            # Runs again from the reads if another request changed these documents meanwhile
+            snapshots = {}
+            async for doc in async_db.get_all([*word_refs.values(), *progress_refs.values(), stats_ref], transaction=transaction):
+                snapshots[doc.reference.path] = doc
+            
+            states = {}
+            for word_id in word_ids:
+                word_doc = snapshots.get(word_refs[word_id].path)
+                word_data = word_doc.to_dict() if word_doc is not None and word_doc.exists else {}
+                if word_data.get("userId") != user_id:
+                    continue
+                progress_doc = snapshots.get(progress_refs[word_id].path)
+                if progress_doc is not None and progress_doc.exists:
+                    progress = progress_doc.to_dict()
+                    is_new = False
+                else:
+                    progress = self._new_progress(user_id, word_id)
+                    is_new = True
+                states[word_id] = {
+                    "progress": progress,
+                    "original": progress,
+                    "is_new": is_new,
+                    "word": word_data.get("word"),
+                    "difficulty_level": word_data.get("difficultyLevel")
+                }
+            
+            today = today_key()
+            delta = StatsDelta()
+            # The n-th review of every word is scheduled in round n, on top of the previous round
+            rounds: List[List[Dict[str, Any]]] = []
+            review_counts: Dict[str, int] = {}
+            for review in reviews:
+                if review["word_id"] not in states:
+                    logging.warning(f"Skipping review of unknown word {review['word_id']} for user {user_id}")
+                    continue
+                position = review_counts.get(review["word_id"], 0)
+                review_counts[review["word_id"]] = position + 1
+                if position == len(rounds):
+                    rounds.append([])
+                rounds[position].append(review)
+            
+            scheduled = []
+            for round_reviews in rounds:
+                round_states = [states[review["word_id"]] for review in round_reviews]
+                updates = self._schedule_reviews(
+                    [state["progress"] for state in round_states],
+                    [review["is_correct"] for review in round_reviews],
+                    [state["difficulty_level"] for state in round_states]
+                )
+                for review, state, update_data in zip(round_reviews, round_states, updates):
+                    scheduled.append((review, state["progress"].get("strength", 0), update_data))
+                    state["progress"] = {**state["progress"], **update_data}
+            
+            applied = correct = 0
+            for review, strength_before, update_data in scheduled:
+                quiz_result = {
+                    "userId": user_id,
+                    "wordId": review["word_id"],
+                    "isCorrect": review["is_correct"],
+                    "quizType": review["quiz_type"],
+                    "responseTimeMs": review.get("response_time_ms"),
+                    "strengthBefore": strength_before,
+                    "strengthAfter": update_data["strength"],
+                    "reviewDate": firestore.SERVER_TIMESTAMP
+                }
+                transaction.set(async_db.collection("quiz_results").document(), quiz_result)
+                delta.add_review(quiz_result, day=today)
+                applied += 1
+                correct += 1 if review["is_correct"] else 0
+            
+            if not applied:
+                return {}, 0, 0
+            
+            for word_id, state in states.items():
+                if state["is_new"]:
+                    transaction.set(progress_refs[word_id], state["progress"])
+                else:
+                    delta.remove_progress(state["original"])
+                    transaction.update(progress_refs[word_id], {
+                        field: state["progress"][field] for field in REVIEW_FIELDS
+                    })
+                delta.add_progress(state["progress"])
+            
+            stats_doc = snapshots.get(stats_ref.path)
+            stats_data = stats_doc.to_dict() if stats_doc is not None and stats_doc.exists else {}
+            stats_service.apply(transaction, user_id, delta, extra=stats_service.streak_update(stats_data, today))
+            transaction.update(async_db.collection("users").document(user_id), {
+                "stats.totalQuizzesTaken": firestore.Increment(applied),
+                **data_version_update()
+            })
+            
+            updated_words = {
+                word_id: {
+                    **state["progress"],
+                    "id": progress_refs[word_id].id,
+                    "word": state["word"],
+                    "strengthBefore": state["original"].get("strength", 0)
+                }
+                for word_id, state in states.items()
+            }
+            return updated_words, applied, correct
         
+        return await apply(async_db.transaction())
+    
     async def get_due_words(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Get words that are due for review"""
         
         now = datetime.now()
         print("we are inside due word function")
         # Get all progress for user where next review is due
-        progress_query = (db.collection("progress")
+        progress_query = (async_db.collection("progress")
                         .where("userId", "==", user_id)
                         .where("nextReviewDate", "<=", now)
                         .order_by("nextReviewDate")
                         .limit(limit))
         
-        progress_docs = list(progress_query.stream())
+        progress_docs = await progress_query.get()
+        progress_list = [progress_doc.to_dict() for progress_doc in progress_docs]
+        
+        # Get the words of all entries with one batched, projected read
+        word_refs = [async_db.collection("words").document(progress_data["wordId"]) for progress_data in progress_list]
+        words_by_id = {}
+        async for word_doc in async_db.get_all(word_refs, field_paths=DUE_WORD_FIELDS):
+            if word_doc.exists:
+                words_by_id[word_doc.id] = word_doc.to_dict()
+        await entry_service.resolve_words(list(words_by_id.values()))
         
-        # Get word details for each progress entry
         due_words = []
-        for progress_doc in progress_docs:
-            progress_data = progress_doc.to_dict()
+        for progress_doc, progress_data in zip(progress_docs, progress_list):
             word_id = progress_data["wordId"]
-            
-            # Get word details
-            word_doc = db.collection("words").document(word_id).get()
-            if word_doc.exists:
-                word_data = word_doc.to_dict()
-                
+            word_data = words_by_id.get(word_id)
+            if word_data is not None:
                 # Combine progress and word data
                 combined_data = {
                     "progress_id": progress_doc.id,
@@ -160,131 +272,8 @@ class ProgressService:
         return due_words
     
     async def get_learning_stats(self, user_id: str) -> Dict[str, Any]:
-        """Get comprehensive learning statistics"""    
-        try:
-            # Get user's progress entries
-            progress_query = db.collection("progress").where("userId", "==", user_id)
-            progress_docs = list(progress_query.stream())
-            
-            # Get user document for streak info
-            user_doc = db.collection("users").document(user_id).get()
-            user_data = user_doc.to_dict() if user_doc.exists else {}
-            user_stats = user_data.get("stats", {})
-            
-            # Initialize stats
-            stats = {
-                "total_words_added": len(progress_docs),
-                "words_learning": 0,  # strength 1-3
-                "words_strong": 0,    # strength 4-5  
-                "words_mastered": 0,  # strength 6+
-                "due_for_review": 0,
-                "overdue_words": 0,
-                "overall_accuracy": 0,
-                "current_streak": user_stats.get("currentStreak", 0),  # ← ADD THIS
-                "longest_streak": user_stats.get("longestStreak", 0),   # ← ADD THIS
-                "reviews_today": 0,
-                "reviews_this_week": 0,
-                "reviews_total": 0
-            }
-            
-            # Rest of your existing logic...
-            now = datetime.now()
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            week_start = today_start - timedelta(days=7)
-            
-            total_reviews = 0
-            correct_reviews = 0
-            
-            for doc in progress_docs:
-                data = doc.to_dict()
-                strength = data.get("strength", 0)
-                next_review = data.get("nextReviewDate")
-                total_word_reviews = data.get("totalReviews", 0)
-                correct_word_reviews = data.get("correctReviews", 0)
-                
-                # Categorize by strength
-                if strength <= 1:
-                    stats["words_learning"] += 1
-                elif strength <= 3:
-                    stats["words_learning"] += 1
-                elif strength <= 5:
-                    stats["words_strong"] += 1
-                else:
-                    stats["words_mastered"] += 1
-                
-                # Check if due for review
-                if next_review:
-                    if hasattr(next_review, 'timestamp'):
-                        next_review_dt = datetime.fromtimestamp(next_review.timestamp())
-                        if next_review_dt <= now:
-                            stats["due_for_review"] += 1
-                            if next_review_dt < today_start:
-                                stats["overdue_words"] += 1
-                
-                # Add to totals
-                total_reviews += total_word_reviews
-                correct_reviews += correct_word_reviews
-            
-            # Calculate overall accuracy
-            if total_reviews > 0:
-                stats["overall_accuracy"] = round((correct_reviews / total_reviews) * 100, 1)
-            
-            # Get recent review activity
-           
-            quiz_results_query = (db.collection('quiz_results').filter(
-                "userId", "==", user_id,
-                "reviewDate", ">=", today_start
-            ))
-            
-            today_results = list(quiz_results_query.stream())
-            stats["reviews_today"] = len(today_results)
-            
-            # Get week activity  
-            week_results_query = (db.collection("quiz_results")
-                                .where("userId", "==", user_id)
-                                .where("reviewDate", ">=", week_start))
-            
-            week_results = list(week_results_query.stream())
-            stats["reviews_this_week"] = len(week_results)
-            stats["reviews_total"] = total_reviews
-            
-            return stats
-            
-        except Exception as e:
-            logging.error(f"Error getting learning stats: {str(e)}")
-            # Return default stats if error
-            return {
-                "total_words": 0,
-                "words_learning": 0,
-                "words_strong": 0,
-                "words_mastered": 0,
-                "due_for_review": 0,
-                "overdue_words": 0,
-                "overall_accuracy": 0,
-                "current_streak": 0,
-                "longest_streak": 0,
-                "reviews_today": 0,
-                "reviews_this_week": 0,
-                "reviews_total": 0
-            }
-
-    
-    async def _update_user_stats(self, user_id: str, is_correct: bool):
-        """Update user's overall statistics"""
-        
-        user_ref = db.collection("users").document(user_id)
-        
-        # Update quiz count
-        user_ref.update({
-            "stats.totalQuizzesTaken": firestore.Increment(1)
-        })
-        
-        # Update streak if correct
-        if is_correct:
-            # This is simplified - in a real app you'd track daily streaks
-            user_ref.update({
-                "stats.currentStreak": firestore.Increment(1)
-            })
+        """Get comprehensive learning statistics (one read of the user's stats document)"""
+        return await stats_service.get_stats(user_id)
 
 # Create global instance
 progress_service = ProgressService()
\ No newline at end of file
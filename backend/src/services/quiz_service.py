@@ -7,8 +7,9 @@ from src.models import (
     QuizType, QuizDifficulty, QuizQuestion, QuizOption, 
     QuizResponse, QuizResult, QuizSubmissionResponse
 )
-from src.services import progress_service
-from src.firebase import db
+from src.services import progress_service, entry_service
+from src.firebase import async_db
+from src.utils import progress_doc_id
 
 class QuizService:
     """Service for generating and managing quizzes"""
@@ -120,9 +121,6 @@ class QuizService:
                 correct_count += 1
             
             # Update word progress using spaced repetition
-            old_progress = await progress_service.get_or_create_progress(user_id, word_id)
-            old_strength = old_progress.get("strength", 0)
-            
             updated_progress = await progress_service.update_progress(
                 user_id=user_id,
                 word_id=word_id,
@@ -131,6 +129,7 @@ class QuizService:
                 response_time_ms=time_taken
             )
             
+            old_strength = updated_progress.get("strengthBefore", 0)
             new_strength = updated_progress.get("strength", 0)
             
             # Track learning progress
@@ -194,18 +193,21 @@ class QuizService:
             remaining_limit = limit - len(candidate_words)
             
             # Get user's words that don't have progress entries (new words)
-            user_words_query = db.collection("words").where("userId", "==", user_id).limit(remaining_limit * 2)
-            user_words = list(user_words_query.stream())
+            user_words_query = async_db.collection("words").where("userId", "==", user_id).limit(remaining_limit * 2)
+            user_words = await user_words_query.get()
+            
+            # Check which of these words have progress with one batched read
+            progress_refs = [
+                async_db.collection("progress").document(progress_doc_id(user_id, word_doc.id))
+                for word_doc in user_words
+            ]
+            reviewed_ids = {doc.get("wordId") async for doc in async_db.get_all(progress_refs) if doc.exists}
             
             for word_doc in user_words:
                 word_data = word_doc.to_dict()
                 word_id = word_doc.id
                 
-                # Check if this word has progress
-                progress_query = db.collection("progress").where("userId", "==", user_id).where("wordId", "==", word_id)
-                has_progress = len(list(progress_query.stream())) > 0
-                
-                if not has_progress:
+                if word_id not in reviewed_ids:
                     # This is a new word
                     word_data["word_id"] = word_id
                     word_data["progress_id"] = None
@@ -216,7 +218,9 @@ class QuizService:
                     if len(candidate_words) >= limit:
                         break
         
-        return candidate_words[:limit]
+        candidate_words = candidate_words[:limit]
+        await entry_service.resolve_words(candidate_words)
+        return candidate_words
     
     def _select_quiz_words(self, candidate_words: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
         """Select words for quiz based on learning priority"""
@@ -355,15 +359,15 @@ class QuizService:
         """Get wrong definitions for MCQ distractors"""
         
         # Get random definitions from other words
-        words_query = db.collection("words").limit(count * 3)
-        words = list(words_query.stream())
+        words_query = async_db.collection("words").limit(count * 3)
+        words = await words_query.get()
+        
+        other_words = await entry_service.resolve_words(
+            [word_doc.to_dict() for word_doc in words if word_doc.id != exclude_word_id]
+        )
         
         wrong_definitions = []
-        for word_doc in words:
-            if word_doc.id == exclude_word_id:
-                continue
-                
-            word_data = word_doc.to_dict()
+        for word_data in other_words:
             definitions = word_data.get("definitions", [])
             
             if definitions:
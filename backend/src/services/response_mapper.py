@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional
+
+from fastapi import Response
+
+from src.services.learning_service import learning_service
+from src.utils import FastJSONResponse
+
+
+def to_isoformat(value: Any, default: Optional[str] = None) -> Optional[str]:
+    """Firestore timestamp (or datetime) as a local ISO string"""
+    if value and hasattr(value, "timestamp"):
+        return datetime.fromtimestamp(value.timestamp()).isoformat()
+    return default
+
+
+def word_dict(doc_id: str, data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """WordResponse-shaped dict for a (resolved) word document"""
+    return {
+        "id": doc_id,
+        "user_id": data.get("userId", user_id),
+        "word": data.get("word", ""),
+        "added_at": to_isoformat(data.get("addedAt")) or datetime.now().isoformat(),
+        "source": data.get("source", "manual"),
+        "source_url": data.get("sourceUrl"),
+        "definitions": data.get("definitions", []),
+        "phonetics": data.get("phonetics", []),
+        "synonyms": data.get("synonyms", []),
+        "antonyms": data.get("antonyms", []),
+        "user_notes": data.get("userNotes"),
+        "is_favorite": data.get("isFavorite", False),
+        "difficulty_level": data.get("difficultyLevel")
+    }
+
+
+def word_summary_dict(doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """WordSummaryResponse-shaped dict: the headword and its first definition"""
+    definitions = data.get("definitions")
+    return {
+        "id": doc_id,
+        "word": data.get("word", ""),
+        "added_at": to_isoformat(data.get("addedAt")) or datetime.now().isoformat(),
+        "source": data.get("source", "manual"),
+        "definition": definitions[0] if definitions else None,
+        "is_favorite": data.get("isFavorite", False),
+        "difficulty_level": data.get("difficultyLevel")
+    }
+
+
+def word_fields_dict(doc_id: str, data: Dict[str, Any], user_id: str, fields: Iterable[str]) -> Dict[str, Any]:
+    values = word_dict(doc_id, data, user_id)
+    return {field: values[field] for field in fields}
+
+
+def progress_dict(
+    progress_id: str,
+    user_id: str,
+    word_id: str,
+    word: str,
+    progress: Dict[str, Any],
+    last_reviewed_default: Optional[str] = None
+) -> Dict[str, Any]:
+    """ProgressResponse-shaped dict for a progress document"""
+
+    strength = progress.get("strength", 0)
+    total_reviews = progress.get("totalReviews", 0)
+    correct_reviews = progress.get("correctReviews", 0)
+    last_reviewed = to_isoformat(progress.get("lastReviewed"), last_reviewed_default)
+    created_at = to_isoformat(progress.get("createdAt")) or datetime.now().isoformat()
+
+    return {
+        "id": progress_id,
+        "user_id": user_id,
+        "word_id": word_id,
+        "word": word,
+        "strength": strength,
+        "strength_description": learning_service.get_strength_description(strength),
+        "next_review_date": to_isoformat(progress.get("nextReviewDate")) or datetime.now().isoformat(),
+        "total_reviews": total_reviews,
+        "correct_reviews": correct_reviews,
+        "consecutive_correct": progress.get("consecutiveCorrect", 0),
+        "retention_rate": learning_service.calculate_retention_score(correct_reviews, total_reviews),
+        "last_reviewed": last_reviewed,
+        "created_at": created_at,
+        "updated_at": last_reviewed or created_at
+    }
+
+
+def trusted_response(content: Any, status_code: int = 200) -> Response:
+    """Send server-built data as JSON without validating it again
+
+    Word and progress documents are only ever written by this server, so the dicts above
+    already have the response model's shape. The route's response_model still documents it.
+    """
+    return FastJSONResponse(content=content, status_code=status_code)
@@ -0,0 +1,317 @@
+import asyncio
+import json
+import os
+import re
+from collections import OrderedDict, defaultdict
+from typing import List, Dict, Any, Optional, Set, Iterable, Tuple
+
+from src.config import settings
+from src.firebase import async_db
+from src.services.entry_service import entry_service
+from src.utils import logging
+from src.utils.versions import WORDS_VERSION_FIELD
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+FIELD_WEIGHTS = {
+    "word": 5.0,
+    "synonyms": 2.0,
+    "userNotes": 1.5,
+    "definitions": 1.0
+}
+
+MIN_SIMILARITY = 0.35
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over one user's words with trigram-based fuzzy term matching
+
+    `version` is the user's wordsVersion the index reflects.
+    """
+
+    def __init__(self, version: int = 0):
+        self.version = version
+        self.documents: Dict[str, Dict[str, float]] = {}
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.grams: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, word_id: str, token_weights: Dict[str, float]):
+        self.remove(word_id)
+        self.documents[word_id] = token_weights
+        for token, weight in token_weights.items():
+            if not self.postings[token]:
+                for gram in trigrams(token):
+                    self.grams[gram].add(token)
+            self.postings[token][word_id] = weight
+
+    def remove(self, word_id: str):
+        for token in self.documents.pop(word_id, {}):
+            postings = self.postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(word_id, None)
+            if not postings:
+                del self.postings[token]
+                for gram in trigrams(token):
+                    self.grams[gram].discard(token)
+                    if not self.grams[gram]:
+                        del self.grams[gram]
+
+    def search(self, query: str) -> List[str]:
+        """Return word ids ranked by weighted, typo-tolerant term matches"""
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            term_scores: Dict[str, float] = {}
+            for token, similarity in self._matching_tokens(term).items():
+                for word_id, weight in self.postings[token].items():
+                    term_scores[word_id] = max(term_scores.get(word_id, 0), weight * similarity)
+            for word_id, score in term_scores.items():
+                scores[word_id] += score
+
+        return sorted(scores, key=lambda word_id: scores[word_id], reverse=True)
+
+    def _matching_tokens(self, term: str) -> Dict[str, float]:
+        if len(term) < 3:
+            return {token: 1.0 if token == term else 0.8
+                    for token in self.postings if token.startswith(term)}
+
+        term_grams = trigrams(term)
+        shared = defaultdict(int)
+        for gram in term_grams:
+            for token in self.grams.get(gram, ()):
+                shared[token] += 1
+
+        matches = {}
+        for token, shared_count in shared.items():
+            if token == term:
+                similarity = 1.0
+            elif token.startswith(term):
+                similarity = 0.8
+            elif term in token:
+                similarity = 0.6
+            else:
+                similarity = shared_count / (len(term_grams) + len(trigrams(token)) - shared_count)
+            if similarity >= MIN_SIMILARITY:
+                matches[token] = similarity
+        return matches
+
+    def to_dict(self) -> Dict[str, Any]:
+        # A shallow copy is a consistent snapshot: add() replaces token weights, never edits them
+        return {"version": self.version, "documents": dict(self.documents)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchIndex":
+        if not isinstance(data.get("version"), int) or not isinstance(data.get("documents"), dict):
+            raise ValueError("index file has no version")
+        index = cls(data["version"])
+        for word_id, token_weights in data["documents"].items():
+            index.add(word_id, token_weights)
+        return index
+
+
+# (upserts, removals) of one committed write
+Change = Tuple[Dict[str, Dict[str, Any]], List[str]]
+
+
+class SearchService:
+    """Per-user search indexes kept in memory, optionally persisted to disk
+
+    Every index carries the wordsVersion it reflects. Writes made by this process are
+    applied incrementally; a search that sees a newer version (a write made elsewhere,
+    or by an offline tool) rebuilds the index from Firestore.
+    """
+
+    def __init__(self, max_users: int = 500, persist_path: Optional[str] = None):
+        self.max_users = max_users
+        self.persist_path = persist_path
+        self._indexes: "OrderedDict[str, SearchIndex]" = OrderedDict()
+        self._builds: Dict[str, asyncio.Future] = {}
+        # Writes committed while a user's index is being built, re-applied to the result
+        self._pending: Dict[str, List[Change]] = {}
+        # Index files are written off the event loop, at most one write per user at a time
+        self._unsaved: Dict[str, SearchIndex] = {}
+        self._saving: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def document_tokens(word_data: Dict[str, Any]) -> Dict[str, float]:
+        """Weighted tokens of a (resolved) word document"""
+
+        texts = {
+            "word": [word_data.get("word", "")],
+            "synonyms": word_data.get("synonyms", []) or [],
+            "userNotes": [word_data.get("userNotes") or ""],
+            "definitions": [d.get("definition", "") for d in word_data.get("definitions", []) or []]
+        }
+
+        token_weights: Dict[str, float] = {}
+        for field, values in texts.items():
+            weight = FIELD_WEIGHTS[field]
+            for value in values:
+                for token in tokenize(value):
+                    token_weights[token] = max(token_weights.get(token, 0), weight)
+        return token_weights
+
+    async def search(self, user_id: str, query: str, words_version: int = 0) -> List[str]:
+        """Ranked word ids; the index is rebuilt first if it is older than `words_version`"""
+
+        index = self._get_index(user_id)
+        if index is None or index.version < words_version:
+            index = await self._build_shared(user_id)
+        return index.search(query)
+
+    async def apply_changes(
+        self,
+        user_id: str,
+        upserts: Optional[Dict[str, Dict[str, Any]]] = None,
+        removals: Iterable[str] = ()
+    ):
+        """Apply one committed write (one wordsVersion increment) to the user's index
+
+        `upserts` maps word ids to resolved word data.
+        """
+
+        change = (upserts or {}, list(removals))
+        if user_id in self._pending:
+            self._pending[user_id].append(change)
+
+        index = self._get_index(user_id)
+        if index is not None:
+            self._apply(index, change)
+            index.version += 1
+            self._persist(user_id, index)
+
+    def forget_words(self, user_id: str, word_ids: Iterable[str]):
+        """Drop ids whose documents turned out to be gone (no version change)"""
+
+        index = self._indexes.get(user_id)
+        if index is not None:
+            for word_id in word_ids:
+                index.remove(word_id)
+            self._persist(user_id, index)
+
+    def _apply(self, index: SearchIndex, change: Change):
+        upserts, removals = change
+        for word_id, word_data in upserts.items():
+            index.add(word_id, self.document_tokens(word_data))
+        for word_id in removals:
+            index.remove(word_id)
+
+    def _get_index(self, user_id: str) -> Optional[SearchIndex]:
+        index = self._indexes.get(user_id)
+        if index is not None:
+            self._indexes.move_to_end(user_id)
+            return index
+
+        index = self._load(user_id)
+        if index is not None:
+            self._register(user_id, index)
+        return index
+
+    def _register(self, user_id: str, index: SearchIndex):
+        self._indexes[user_id] = index
+        self._indexes.move_to_end(user_id)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+
+    async def _build_shared(self, user_id: str) -> SearchIndex:
+        """Concurrent searches for the same user share one build"""
+
+        build = self._builds.get(user_id)
+        if build is None:
+            self._pending[user_id] = []
+            build = asyncio.ensure_future(self._build(user_id))
+            self._builds[user_id] = build
+        return await asyncio.shield(build)
+
+    async def _build(self, user_id: str) -> SearchIndex:
+        """Build a user's index from Firestore"""
+
+        try:
+            # Version first: a write landing before the word query is then rebuilt once more, never missed
+            user_doc = await async_db.collection("users").document(user_id).get()
+            version = (user_doc.to_dict() or {}).get(WORDS_VERSION_FIELD, 0)
+
+            docs = await async_db.collection("words").where("userId", "==", user_id).get()
+            words_data = await entry_service.resolve_words([doc.to_dict() for doc in docs])
+
+            index = SearchIndex(version)
+            for doc, word_data in zip(docs, words_data):
+                index.add(doc.id, self.document_tokens(word_data))
+
+            # Writes made here while the words were read; their version is not counted,
+            # so the index may be rebuilt once more but never trails the data
+            for change in self._pending.get(user_id, []):
+                self._apply(index, change)
+
+            self._register(user_id, index)
+            self._persist(user_id, index)
+            logging.info(f"Search index built for user {user_id} with {len(docs)} words (version {version})")
+            return index
+        finally:
+            self._builds.pop(user_id, None)
+            self._pending.pop(user_id, None)
+
+    def _index_file(self, user_id: str) -> str:
+        return os.path.join(self.persist_path, f"{user_id}.json")
+
+    def _load(self, user_id: str) -> Optional[SearchIndex]:
+        if not self.persist_path or not os.path.exists(self._index_file(user_id)):
+            return None
+        try:
+            with open(self._index_file(user_id), "r", encoding="utf-8") as index_file:
+                return SearchIndex.from_dict(json.load(index_file))
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not load search index for user {user_id}: {str(e)}")
+            return None
+
+    def _persist(self, user_id: str, index: SearchIndex):
+        """Schedule a write of the user's index file
+
+        Changes made while a write is running are coalesced into one more write.
+        """
+
+        if not self.persist_path:
+            return
+        self._unsaved[user_id] = index
+        if user_id not in self._saving:
+            self._saving[user_id] = asyncio.ensure_future(self._save(user_id))
+
+    async def _save(self, user_id: str):
+        try:
+            while user_id in self._unsaved:
+                snapshot = self._unsaved.pop(user_id).to_dict()
+                await asyncio.to_thread(self._write_file, user_id, snapshot)
+        finally:
+            self._saving.pop(user_id, None)
+
+    async def flush(self):
+        """Wait for scheduled index writes (called from the app lifespan)"""
+        while self._saving:
+            await asyncio.gather(*self._saving.values())
+
+    def _write_file(self, user_id: str, snapshot: Dict[str, Any]):
+        try:
+            os.makedirs(self.persist_path, exist_ok=True)
+            temp_file = self._index_file(user_id) + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as index_file:
+                json.dump(snapshot, index_file, separators=(",", ":"))
+            os.replace(temp_file, self._index_file(user_id))
+        except OSError as e:
+            logging.error(f"Could not persist search index for user {user_id}: {str(e)}")
+
+
+search_service = SearchService(
+    max_users=settings.SEARCH_INDEX_MAX_USERS,
+    persist_path=settings.SEARCH_INDEX_PATH
+)
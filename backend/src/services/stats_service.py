@@ -0,0 +1,333 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from firebase_admin import firestore
+
+from src.firebase import async_db
+from src.utils import logging
+
+
+def day_key(value: Any) -> Optional[str]:
+    """Local calendar day (YYYY-MM-DD) of a Firestore timestamp or datetime"""
+    if value and hasattr(value, "timestamp"):
+        return datetime.fromtimestamp(value.timestamp()).date().isoformat()
+    return None
+
+
+def today_key() -> str:
+    return datetime.now().date().isoformat()
+
+
+def strength_band(strength: int) -> str:
+    """Difficulty band analytics reports for the strength a word had when it was reviewed"""
+    return "easy" if strength >= 4 else "medium" if strength >= 2 else "hard"
+
+
+def nest(counts: Dict[tuple, int], wrap=lambda count: count) -> Dict[str, Any]:
+    """{("quizTypes", "meaning", "total"): 3} -> {"quizTypes": {"meaning": {"total": 3}}}, zeros dropped"""
+    nested: Dict[str, Any] = {}
+    for path, count in counts.items():
+        if not count:
+            continue
+        node = nested
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = wrap(count)
+    return nested
+
+
+class DailyRollup:
+    """Review counters per day, by quiz type and strength band, for the daily_stats documents"""
+
+    def __init__(self):
+        self.days: Dict[str, Dict[tuple, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add_review(self, day: str, quiz_type: str, is_correct: bool, strength_before: int, sign: int = 1):
+        counts = self.days[day]
+        for prefix in ((), ("quizTypes", quiz_type), ("strengthBands", strength_band(strength_before))):
+            counts[prefix + ("total",)] += sign
+            if is_correct:
+                counts[prefix + ("correct",)] += sign
+
+    def to_update(self, day: str) -> Dict[str, Any]:
+        """Nested increments for set(..., merge=True)"""
+        return nest(self.days[day], firestore.Increment)
+
+    def to_document(self, day: str) -> Dict[str, Any]:
+        return nest(self.days[day])
+
+
+class StatsDelta:
+    """Counter changes to apply to a user's stats document in one write"""
+
+    def __init__(self):
+        self.total_words = 0
+        self.total_reviews = 0
+        self.correct_reviews = 0
+        self.strength_counts: Dict[str, int] = defaultdict(int)
+        self.due_by_day: Dict[str, int] = defaultdict(int)
+        self.reviews_by_day: Dict[str, int] = defaultdict(int)
+        self.rollup = DailyRollup()
+
+    def add_progress(self, progress: Dict[str, Any], sign: int = 1):
+        """Count (or, with sign=-1, uncount) one progress entry"""
+        self.strength_counts[str(progress.get("strength", 0))] += sign
+        due_day = day_key(progress.get("nextReviewDate"))
+        if due_day:
+            self.due_by_day[due_day] += sign
+        self.total_reviews += sign * progress.get("totalReviews", 0)
+        self.correct_reviews += sign * progress.get("correctReviews", 0)
+
+    def remove_progress(self, progress: Dict[str, Any]):
+        self.add_progress(progress, sign=-1)
+
+    def add_review(self, result: Dict[str, Any], day: Optional[str] = None, sign: int = 1):
+        """Count (or uncount) one quiz result; `day` defaults to the day of its reviewDate"""
+        day = day or day_key(result.get("reviewDate"))
+        if not day:
+            return
+        self.reviews_by_day[day] += sign
+        self.rollup.add_review(day, result.get("quizType", "unknown"), result.get("isCorrect", False),
+                               result.get("strengthBefore", 0), sign)
+
+    def to_update(self) -> Dict[str, Any]:
+        """Nested increments for set(..., merge=True), which also creates the document"""
+
+        def increments(counts: Dict[str, int]) -> Dict[str, Any]:
+            return {key: firestore.Increment(count) for key, count in counts.items() if count}
+
+        update = {}
+        for field, count in (("totalWords", self.total_words),
+                             ("totalReviews", self.total_reviews),
+                             ("correctReviews", self.correct_reviews)):
+            if count:
+                update[field] = firestore.Increment(count)
+        for field, counts in (("strengthCounts", self.strength_counts),
+                              ("dueByDay", self.due_by_day),
+                              ("reviewsByDay", self.reviews_by_day)):
+            if increments(counts):
+                update[field] = increments(counts)
+        return update
+
+
+class StatsService:
+    """Per-user learning stats kept in one document, updated with every write that changes them"""
+
+    def __init__(self):
+        self.collection = "user_stats"
+        self.daily_collection = "daily_stats"
+        # Only a full rebuild sets this; increments on a missing document create one without it.
+        # Bump the version when a rebuild starts producing something new (v2: daily rollups).
+        self.marker_field = "schemaVersion"
+        self.schema_version = 2
+
+    def stats_ref(self, user_id: str):
+        return async_db.collection(self.collection).document(user_id)
+
+    def daily_ref(self, user_id: str, day: str):
+        return async_db.collection(self.daily_collection).document(f"{user_id}_{day}")
+
+    def is_current(self, stats_data: Dict[str, Any]) -> bool:
+        return stats_data.get(self.marker_field, 0) >= self.schema_version
+
+    def apply(self, writer, user_id: str, delta: StatsDelta, extra: Optional[Dict[str, Any]] = None,
+              include_rollup: bool = True):
+        """Add the delta to a write batch or transaction
+
+        Every reviewed day adds one daily_stats write; callers that may touch many days
+        pass include_rollup=False and use commit_rollup instead.
+        """
+
+        update = {**delta.to_update(), **(extra or {})}
+        if update:
+            writer.set(self.stats_ref(user_id), update, merge=True)
+        if include_rollup:
+            for day in delta.rollup.days:
+                self._apply_day(writer, user_id, delta.rollup, day)
+
+    def _apply_day(self, writer, user_id: str, rollup: DailyRollup, day: str):
+        update = rollup.to_update(day)
+        if update:
+            writer.set(self.daily_ref(user_id, day), {"userId": user_id, "date": day, **update}, merge=True)
+
+    async def commit_rollup(self, user_id: str, rollup: DailyRollup, batch_limit: int = 500):
+        """Apply rollup increments for any number of days in as many batches as needed"""
+
+        days = list(rollup.days)
+        for start in range(0, len(days), batch_limit):
+            batch = async_db.batch()
+            for day in days[start:start + batch_limit]:
+                self._apply_day(batch, user_id, rollup, day)
+            await batch.commit()
+
+    @staticmethod
+    def streak_update(stats_data: Dict[str, Any], day: str) -> Dict[str, Any]:
+        """Daily review streak after reviewing on `day` (needs the current stats document)"""
+
+        last_day = stats_data.get("lastReviewDay")
+        current = stats_data.get("currentStreak", 0)
+        if last_day == day:
+            return {}
+
+        yesterday = (datetime.fromisoformat(day) - timedelta(days=1)).date().isoformat()
+        current = current + 1 if last_day == yesterday else 1
+        return {
+            "lastReviewDay": day,
+            "currentStreak": current,
+            "longestStreak": max(current, stats_data.get("longestStreak", 0))
+        }
+
+    async def get_stats(self, user_id: str) -> Dict[str, Any]:
+        """LearningStats fields from the user's stats document (built once if missing)"""
+
+        doc = await self.stats_ref(user_id).get()
+        stats_data = doc.to_dict() if doc.exists else {}
+        if not self.is_current(stats_data):
+            stats_data = await self.rebuild(user_id)
+        return self.summarize(stats_data)
+
+    async def get_daily(self, user_id: str, days: int) -> Dict[str, Dict[str, Any]]:
+        """daily_stats documents of the last `days` days (today included), keyed by date
+
+        One batched read of at most `days` small documents; days without reviews are left out.
+        """
+
+        start = datetime.now().date()
+        refs = [self.daily_ref(user_id, (start - timedelta(days=offset)).isoformat()) for offset in range(days)]
+        daily = {}
+        async for doc in async_db.get_all(refs):
+            if doc.exists:
+                data = doc.to_dict()
+                daily[data["date"]] = data
+        return dict(sorted(daily.items()))
+
+    @staticmethod
+    def summarize(stats_data: Dict[str, Any]) -> Dict[str, Any]:
+        today = today_key()
+        yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+        week_start = (datetime.now() - timedelta(days=7)).date().isoformat()
+
+        strength_counts = stats_data.get("strengthCounts", {})
+        due_by_day = stats_data.get("dueByDay", {})
+        reviews_by_day = stats_data.get("reviewsByDay", {})
+        total_reviews = stats_data.get("totalReviews", 0)
+        correct_reviews = stats_data.get("correctReviews", 0)
+
+        def strength_total(low: int, high: int) -> int:
+            return sum(count for strength, count in strength_counts.items() if low <= int(strength) <= high)
+
+        # Streaks only survive if the user reviewed today or yesterday
+        current_streak = stats_data.get("currentStreak", 0)
+        if stats_data.get("lastReviewDay") not in (today, yesterday):
+            current_streak = 0
+
+        return {
+            "total_words_added": stats_data.get("totalWords", 0),
+            "words_learning": strength_total(0, 3),
+            "words_strong": strength_total(4, 5),
+            "words_mastered": strength_total(6, 99),
+            # Due dates are bucketed by day: everything scheduled up to the end of today counts as due
+            "due_for_review": sum(count for day, count in due_by_day.items() if day <= today),
+            "overdue_words": sum(count for day, count in due_by_day.items() if day < today),
+            "overall_accuracy": round(correct_reviews / total_reviews * 100, 1) if total_reviews > 0 else 0,
+            "current_streak": current_streak,
+            "longest_streak": stats_data.get("longestStreak", 0),
+            "reviews_today": reviews_by_day.get(today, 0),
+            "reviews_this_week": sum(count for day, count in reviews_by_day.items() if day >= week_start),
+            "reviews_total": total_reviews
+        }
+
+    async def compute(self, user_id: str) -> Tuple[Dict[str, Any], DailyRollup]:
+        """Stats document and daily rollups recomputed from words, progress and quiz_results"""
+
+        words = async_db.collection("words").where("userId", "==", user_id)
+        count_result = await words.count(alias="total").get()
+
+        progress_docs = await (async_db.collection("progress")
+                               .where("userId", "==", user_id)
+                               .select(["strength", "nextReviewDate", "totalReviews", "correctReviews"])
+                               .get())
+        quiz_results = await (async_db.collection("quiz_results")
+                              .where("userId", "==", user_id)
+                              .select(["reviewDate", "quizType", "isCorrect", "strengthBefore"])
+                              .get())
+
+        delta = StatsDelta()
+        for doc in progress_docs:
+            delta.add_progress(doc.to_dict())
+        for doc in quiz_results:
+            delta.add_review(doc.to_dict())
+
+        stats_data = {
+            "totalWords": int(count_result[0][0].value),
+            "totalReviews": delta.total_reviews,
+            "correctReviews": delta.correct_reviews,
+            "strengthCounts": {key: count for key, count in delta.strength_counts.items() if count},
+            "dueByDay": {key: count for key, count in delta.due_by_day.items() if count},
+            "reviewsByDay": dict(sorted(delta.reviews_by_day.items())),
+            "currentStreak": 0,
+            "longestStreak": 0,
+            "lastReviewDay": None
+        }
+
+        # Replay review days to recover the streaks
+        for day in stats_data["reviewsByDay"]:
+            stats_data.update(self.streak_update(stats_data, day))
+        return stats_data, delta.rollup
+
+    async def stored_days(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """All of the user's daily_stats documents keyed by date"""
+
+        docs = await async_db.collection(self.daily_collection).where("userId", "==", user_id).get()
+        return {doc.get("date"): doc.to_dict() for doc in docs}
+
+    async def rebuild(self, user_id: str, batch_limit: int = 500, attempts: int = 5) -> Dict[str, Any]:
+        """Recompute and overwrite the user's stats document and daily rollups
+
+        The stats document is only replaced if no write changed it while the rebuild ran
+        (every stats write touches it); otherwise the rebuild starts over.
+        """
+
+        stats_ref = self.stats_ref(user_id)
+        for _ in range(attempts):
+            seen = await stats_ref.get()
+            stats_data, rollup = await self.compute(user_id)
+            stale_days = set(await self.stored_days(user_id)) - set(rollup.days)
+
+            # (ref, data) pairs; None deletes a day that no longer has any reviews
+            writes = [(self.daily_ref(user_id, day), {"userId": user_id, "date": day, **rollup.to_document(day)})
+                      for day in rollup.days]
+            writes += [(self.daily_ref(user_id, day), None) for day in stale_days]
+            for start in range(0, len(writes), batch_limit):
+                batch = async_db.batch()
+                for ref, data in writes[start:start + batch_limit]:
+                    if data is None:
+                        batch.delete(ref)
+                    else:
+                        batch.set(ref, data)
+                await batch.commit()
+
+            # The stats document goes last: its version marks the rollups as complete
+            @firestore.async_transactional
+            async def write_if_unchanged(transaction) -> bool:
+                async for current in async_db.get_all([stats_ref], transaction=transaction):
+                    if current.exists != seen.exists or current.update_time != seen.update_time:
+                        return False
+                transaction.set(stats_ref, {
+                    **stats_data,
+                    self.marker_field: self.schema_version,
+                    "rebuiltAt": firestore.SERVER_TIMESTAMP
+                })
+                return True
+
+            if await write_if_unchanged(async_db.transaction()):
+                logging.info(f"Stats document and {len(rollup.days)} daily rollups rebuilt for user {user_id}")
+                return stats_data
+
+        # Left without the version marker, so the next read rebuilds again
+        logging.warning(f"Stats rebuild for user {user_id} kept racing concurrent writes, not stored")
+        return stats_data
+
+
+stats_service = StatsService()
@@ -0,0 +1,51 @@
+from bisect import bisect_left, insort
+from typing import List, Iterable
+
+from src.utils import logging
+
+
+class SuggestionIndex:
+    """Sorted in-memory headword list answering prefix queries with bisect"""
+
+    def __init__(self):
+        self._words: List[str] = []
+        self._known = set()
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def build(self, words: Iterable[str]):
+        """Replace the index with the given headwords"""
+
+        known = {word.strip().lower() for word in words if word and word.strip()}
+        self._words = sorted(known)
+        self._known = known
+        logging.info(f"Suggestion index built with {len(self._words)} words")
+
+    def add(self, word: str):
+        """Insert a single headword, keeping the list sorted"""
+
+        clean_word = word.strip().lower()
+        if clean_word and clean_word not in self._known:
+            self._known.add(clean_word)
+            insort(self._words, clean_word)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return up to `limit` words starting with `prefix`, alphabetically"""
+
+        clean_prefix = prefix.strip().lower()
+        if not clean_prefix:
+            return []
+
+        suggestions = []
+        position = bisect_left(self._words, clean_prefix)
+        while position < len(self._words) and len(suggestions) < limit:
+            word = self._words[position]
+            if not word.startswith(clean_prefix):
+                break
+            suggestions.append(word)
+            position += 1
+        return suggestions
+
+
+suggestion_index = SuggestionIndex()
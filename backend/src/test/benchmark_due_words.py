@@ -0,0 +1,148 @@
+"""
+Latency of get_due_words as a function of `limit`
+
+Runs ProgressService.get_due_words against an in-memory Firestore stand-in that
+sleeps one round trip per RPC. It compares the current batched read with the
+previous behaviour, which read the words one `document(...).get()` after another.
+
+Usage:
+    python -m src.test.benchmark_due_words [--rtt-ms 25] [--limits 5,10,20,50,100]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src.services.progress_service import progress_service
+
+progress_module = sys.modules["src.services.progress_service"]
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+    def get(self, field):
+        return self._data.get(field)
+
+
+class FakeDocument:
+    def __init__(self, client, collection, doc_id):
+        self.client = client
+        self.collection = collection
+        self.id = doc_id
+
+    async def get(self):
+        await self.client.round_trip()
+        return FakeSnapshot(self.id, self.client.data[self.collection].get(self.id))
+
+
+class FakeQuery:
+    def __init__(self, client, collection):
+        self.client = client
+        self.collection = collection
+        self._limit = None
+
+    def where(self, *args):
+        return self
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def document(self, doc_id):
+        return FakeDocument(self.client, self.collection, doc_id)
+
+    async def get(self):
+        await self.client.round_trip()
+        docs = list(self.client.data[self.collection].items())[:self._limit]
+        return [FakeSnapshot(doc_id, data) for doc_id, data in docs]
+
+
+class FakeClient:
+    """Just enough of the async Firestore client for get_due_words, one RTT per RPC"""
+
+    def __init__(self, word_count: int, rtt: float):
+        self.rtt = rtt
+        self.rpcs = 0
+        due = datetime.now() - timedelta(days=1)
+        self.data = {
+            "words": {
+                f"w{index}": {
+                    "word": f"word{index}",
+                    "definitions": [{"partOfSpeech": "noun", "definition": "A benchmark word.", "example": ""}],
+                    "synonyms": [], "antonyms": [], "phonetics": []
+                }
+                for index in range(word_count)
+            },
+            "progress": {
+                f"u_w{index}": {"userId": "u", "wordId": f"w{index}", "strength": 1, "nextReviewDate": due}
+                for index in range(word_count)
+            }
+        }
+
+    async def round_trip(self):
+        self.rpcs += 1
+        await asyncio.sleep(self.rtt)
+
+    def collection(self, name):
+        return FakeQuery(self, name)
+
+    async def get_all(self, refs, field_paths=None):
+        await self.round_trip()
+        for ref in refs:
+            yield FakeSnapshot(ref.id, self.data[ref.collection].get(ref.id))
+
+
+async def sequential_due_words(user_id: str, limit: int):
+    """The previous implementation: one word read per due entry"""
+    client = progress_module.async_db
+    progress_docs = await client.collection("progress").where("userId", "==", user_id).limit(limit).get()
+    due_words = []
+    for progress_doc in progress_docs:
+        progress_data = progress_doc.to_dict()
+        word_doc = await client.collection("words").document(progress_data["wordId"]).get()
+        if word_doc.exists:
+            due_words.append({"word_id": progress_data["wordId"], **word_doc.to_dict(), **progress_data})
+    return due_words
+
+
+async def measure(fetch, client: FakeClient, limit: int, rounds: int):
+    client.rpcs = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        words = await fetch("u", limit)
+    elapsed = (time.perf_counter() - started) / rounds * 1000
+    return elapsed, client.rpcs // rounds, len(words)
+
+
+async def main(rtt_ms: float, limits, rounds: int):
+    client = FakeClient(max(limits), rtt_ms / 1000)
+    progress_module.async_db = client
+
+    print(f"📏 get_due_words with a simulated {rtt_ms:g} ms round trip ({rounds} rounds)")
+    print(f"   {'limit':>5}  {'sequential ms':>13} {'rpcs':>5}  {'batched ms':>10} {'rpcs':>5}")
+    for limit in limits:
+        sequential_ms, sequential_rpcs, _ = await measure(sequential_due_words, client, limit, rounds)
+        batched_ms, batched_rpcs, _ = await measure(progress_service.get_due_words, client, limit, rounds)
+        print(f"   {limit:>5}  {sequential_ms:>13.1f} {sequential_rpcs:>5}  {batched_ms:>10.1f} {batched_rpcs:>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark get_due_words latency against limit")
+    parser.add_argument("--rtt-ms", type=float, default=25, help="simulated Firestore round trip")
+    parser.add_argument("--limits", default="5,10,20,50,100", help="comma-separated limits")
+    parser.add_argument("--rounds", type=int, default=3, help="runs averaged per limit")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rtt_ms, [int(limit) for limit in args.limits.split(",")], args.rounds))
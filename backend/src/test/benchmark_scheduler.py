@@ -0,0 +1,72 @@
+"""
+Per-review cost of the spaced repetition scheduler
+
+Compares calculate_next_review called once per word with calculate_next_reviews
+scheduling the whole batch in one NumPy pass, and checks that a seeded batch is
+reproducible.
+
+Usage:
+    python -m src.test.benchmark_scheduler [--words 1000] [--rounds 50] [--seed 7]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.services.learning_service import learning_service
+
+DIFFICULTY_LEVELS = [None, "easy", "intermediate", "hard"]
+
+
+def make_batch(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(0, 7, size=count).tolist(),
+        (rng.random(count) < 0.7).tolist(),
+        [DIFFICULTY_LEVELS[index] for index in rng.integers(0, len(DIFFICULTY_LEVELS), size=count)],
+        rng.integers(0, 6, size=count).tolist()
+    )
+
+
+def per_item(strengths, correct, levels, consecutive):
+    return [
+        learning_service.calculate_next_review(strength, is_correct, level, streak)
+        for strength, is_correct, level, streak in zip(strengths, correct, levels, consecutive)
+    ]
+
+
+def batched(strengths, correct, levels, consecutive):
+    return learning_service.calculate_next_reviews(strengths, correct, levels, consecutive)
+
+
+def measure(schedule, batch, rounds: int) -> float:
+    """Microseconds per review"""
+    schedule(*batch)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        schedule(*batch)
+    return (time.perf_counter() - started) / rounds / len(batch[0]) * 1_000_000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-word and batched review scheduling")
+    parser.add_argument("--words", type=int, default=1000, help="reviews per batch")
+    parser.add_argument("--rounds", type=int, default=50, help="batches per measurement")
+    parser.add_argument("--seed", type=int, default=7, help="seed for the batch and its jitter")
+    args = parser.parse_args()
+
+    batch = make_batch(args.words, args.seed)
+
+    # Same strengths as the per-word rules, and the same dates for the same seed
+    expected = [strength for _, strength in per_item(*batch)]
+    now = datetime.now()
+    first_dates, strengths = learning_service.calculate_next_reviews(*batch, rng=args.seed, now=now)
+    second_dates, _ = learning_service.calculate_next_reviews(*batch, rng=args.seed, now=now)
+    assert strengths.tolist() == expected, "batch strengths differ from calculate_next_review"
+    assert first_dates == second_dates, "seeded batches are not reproducible"
+
+    print(f"📏 {args.words} reviews per batch, {args.rounds} rounds (µs per review)")
+    print(f"   {'per word (calculate_next_review)':<36} {measure(per_item, batch, args.rounds):8.2f}")
+    print(f"   {'batched (calculate_next_reviews)':<36} {measure(batched, batch, args.rounds):8.2f}")
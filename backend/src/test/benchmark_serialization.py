@@ -0,0 +1,159 @@
+"""
+Per-item cost of building and encoding a 100-word page
+
+Compares the validated Pydantic path (build models field by field, let FastAPI
+validate and encode them) with the trusted mapping path (plain dicts from
+src.services.response_mapper rendered by FastJSONResponse).
+
+Usage:
+    python -m src.test.benchmark_serialization [--words 100] [--rounds 300]
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+from pydantic import TypeAdapter
+
+from src.models import WordResponse, WordListResponse, ProgressResponse, DueWordsResponse
+from src.services.learning_service import learning_service
+from src.services.response_mapper import word_dict, word_summary_dict, progress_dict, trusted_response
+
+
+def make_word_doc(index: int) -> dict:
+    return {
+        "userId": "benchmark-user",
+        "word": f"serendipity{index}",
+        "addedAt": datetime.now(timezone.utc),
+        "source": "manual",
+        "sourceUrl": None,
+        "definitions": [
+            {
+                "partOfSpeech": "noun",
+                "definition": "The occurrence and development of events by chance in a happy or beneficial way.",
+                "example": "A fortunate stroke of serendipity."
+            }
+            for _ in range(5)
+        ],
+        "phonetics": [{"text": "/ˌsɛɹ.ən.ˈdɪp.ɪ.ti/", "audio": "https://example.com/serendipity.mp3"}],
+        "synonyms": ["chance", "luck", "fortune", "fluke", "coincidence"],
+        "antonyms": ["misfortune"],
+        "userNotes": "Seen in a novel",
+        "isFavorite": False,
+        "difficultyLevel": "intermediate"
+    }
+
+
+def make_progress_doc(index: int) -> dict:
+    return {
+        "progress_id": f"benchmark-user_{index}",
+        "word_id": str(index),
+        "word": f"serendipity{index}",
+        "strength": index % 7,
+        "totalReviews": 10,
+        "correctReviews": 7,
+        "consecutiveCorrect": 2,
+        "nextReviewDate": datetime.now(timezone.utc),
+        "lastReviewed": datetime.now(timezone.utc),
+        "createdAt": datetime.now(timezone.utc)
+    }
+
+
+def validated_words(docs):
+    words = []
+    for index, doc in enumerate(docs):
+        added_at = doc.get("addedAt")
+        words.append(WordResponse(
+            id=str(index),
+            user_id=doc["userId"],
+            word=doc["word"],
+            added_at=datetime.fromtimestamp(added_at.timestamp()).isoformat(),
+            source=doc.get("source", "manual"),
+            source_url=doc.get("sourceUrl"),
+            definitions=doc.get("definitions", []),
+            phonetics=doc.get("phonetics", []),
+            synonyms=doc.get("synonyms", []),
+            antonyms=doc.get("antonyms", []),
+            user_notes=doc.get("userNotes"),
+            is_favorite=doc.get("isFavorite", False),
+            difficulty_level=doc.get("difficultyLevel")
+        ))
+    page = WordListResponse(words=words, total=len(words), page=1, per_page=len(words),
+                            has_next=False, has_prev=False)
+    # What FastAPI does with a response_model: validate the returned value, then dump it
+    adapter = TypeAdapter(WordListResponse)
+    return adapter.dump_json(adapter.validate_python(page))
+
+
+def trusted_words(docs):
+    words = [word_dict(str(index), doc, "benchmark-user") for index, doc in enumerate(docs)]
+    return trusted_response({"words": words, "total": len(words), "page": 1, "per_page": len(words),
+                             "has_next": False, "has_prev": False, "next_cursor": None}).body
+
+
+def trusted_summaries(docs):
+    words = [word_summary_dict(str(index), doc) for index, doc in enumerate(docs)]
+    return trusted_response({"words": words, "total": len(words), "page": 1, "per_page": len(words),
+                             "has_next": False, "has_prev": False, "next_cursor": None}).body
+
+
+def validated_progress(docs):
+    words = []
+    for doc in docs:
+        strength = doc["strength"]
+        words.append(ProgressResponse(
+            id=doc["progress_id"],
+            user_id="benchmark-user",
+            word_id=doc["word_id"],
+            word=doc["word"],
+            strength=strength,
+            strength_description=learning_service.get_strength_description(strength),
+            next_review_date=datetime.fromtimestamp(doc["nextReviewDate"].timestamp()).isoformat(),
+            total_reviews=doc["totalReviews"],
+            correct_reviews=doc["correctReviews"],
+            consecutive_correct=doc["consecutiveCorrect"],
+            retention_rate=learning_service.calculate_retention_score(doc["correctReviews"], doc["totalReviews"]),
+            last_reviewed=datetime.fromtimestamp(doc["lastReviewed"].timestamp()).isoformat(),
+            created_at=datetime.fromtimestamp(doc["createdAt"].timestamp()).isoformat(),
+            updated_at=datetime.fromtimestamp(doc["lastReviewed"].timestamp()).isoformat()
+        ))
+    page = DueWordsResponse(words=words, total_due=len(words), overdue_count=0, new_words_count=0)
+    adapter = TypeAdapter(DueWordsResponse)
+    return adapter.dump_json(adapter.validate_python(page))
+
+
+def trusted_progress(docs):
+    words = [progress_dict(doc["progress_id"], "benchmark-user", doc["word_id"], doc["word"], doc)
+             for doc in docs]
+    return trusted_response({"words": words, "total_due": len(words), "overdue_count": 0,
+                             "new_words_count": 0}).body
+
+
+def measure(build, docs, rounds: int) -> float:
+    """Microseconds per item"""
+    build(docs)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        build(docs)
+    return (time.perf_counter() - started) / rounds / len(docs) * 1_000_000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--words", type=int, default=100, help="items per page")
+    parser.add_argument("--rounds", type=int, default=300, help="pages built per measurement")
+    args = parser.parse_args()
+
+    word_docs = [make_word_doc(index) for index in range(args.words)]
+    progress_docs = [make_progress_doc(index) for index in range(args.words)]
+
+    print(f"📏 {args.words}-item pages, {args.rounds} rounds (µs per item)")
+    cases = [
+        ("words, validated models", validated_words, word_docs),
+        ("words, trusted dicts", trusted_words, word_docs),
+        ("words, trusted summaries", trusted_summaries, word_docs),
+        ("due words, validated models", validated_progress, progress_docs),
+        ("due words, trusted dicts", trusted_progress, progress_docs)
+    ]
+    for name, build, docs in cases:
+        print(f"   {name:<30} {measure(build, docs, args.rounds):8.2f}")
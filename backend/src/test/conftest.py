@@ -0,0 +1,45 @@
+"""
+Shared setup for the unit tests
+
+src.firebase connects with real credentials on import, so it is replaced by mocks
+before any module under test is imported. Tests that read or write documents take the
+`fake_db` fixture, an in-memory Firestore (see fake_firestore.py).
+
+Usage (from backend/):
+    python -m pytest src/test
+"""
+
+import os
+import sys
+import types
+from collections import OrderedDict
+from unittest.mock import MagicMock
+
+import pytest
+from firebase_admin import firestore
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+firebase = types.ModuleType("src.firebase")
+firebase.db = MagicMock()
+firebase.async_db = MagicMock()
+sys.modules.setdefault("src.firebase", firebase)
+sys.modules.setdefault("src.firebase.firebase_setup", firebase)
+
+from fake_firestore import FakeFirestore, run_transactional  # noqa: E402
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """An in-memory Firestore behind every imported module's async_db"""
+
+    from src.utils.etag import user_versions
+
+    db = FakeFirestore()
+    # Versions read from an earlier test's database must not leak into this one
+    monkeypatch.setattr(user_versions, "_versions", OrderedDict())
+    for name, module in list(sys.modules.items()):
+        if name.startswith("src.") and hasattr(module, "async_db"):
+            monkeypatch.setattr(module, "async_db", db)
+    monkeypatch.setattr(firestore, "async_transactional", run_transactional)
+    return db
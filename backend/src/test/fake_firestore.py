@@ -0,0 +1,463 @@
+"""
+In-memory stand-in for the async Firestore client, for service and route tests
+
+Covers the parts of the API this backend uses: document reads and writes (with
+Increment, SERVER_TIMESTAMP and dotted update paths), batches, transactions, get_all,
+where/order_by/start_after/offset/limit/select queries and count aggregations. Shapes
+follow google-cloud-firestore's async client, including AsyncTransaction.get_all
+being a coroutine, so code that misuses the real API fails here too.
+"""
+
+import copy
+import itertools
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+from google.cloud.firestore_v1 import transforms
+
+
+_clock = itertools.count(1)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _normalize(value: Any) -> Any:
+    """Firestore hands naive datetimes back as UTC-aware ones"""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _get_path(data: Dict[str, Any], path: str, default: Any = None) -> Any:
+    node: Any = data
+    for key in path.split("."):
+        if not isinstance(node, dict) or key not in node:
+            return default
+        node = node[key]
+    return node
+
+
+_MISSING = object()
+
+
+def _apply_value(target: Dict[str, Any], key: str, value: Any):
+    if isinstance(value, transforms.Increment):
+        current = target.get(key, 0)
+        target[key] = (current if isinstance(current, (int, float)) else 0) + value.value
+    elif value is transforms.SERVER_TIMESTAMP:
+        target[key] = _now()
+    elif value is transforms.DELETE_FIELD:
+        target.pop(key, None)
+    else:
+        target[key] = _normalize(copy.deepcopy(value))
+
+
+def _merge(target: Dict[str, Any], data: Dict[str, Any]):
+    for key, value in data.items():
+        if isinstance(value, dict) and value:
+            node = target.get(key)
+            if not isinstance(node, dict):
+                node = target[key] = {}
+            _merge(node, value)
+        else:
+            _apply_value(target, key, value)
+
+
+def _resolve(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Document content written by a plain set: transforms are applied to an empty document"""
+    resolved: Dict[str, Any] = {}
+    _merge(resolved, data)
+    return resolved
+
+
+def _update(target: Dict[str, Any], data: Dict[str, Any]):
+    for path, value in data.items():
+        keys = path.split(".")
+        node = target
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        if isinstance(value, dict):
+            node[keys[-1]] = _resolve(value)
+        else:
+            _apply_value(node, keys[-1], value)
+
+
+def _project(data: Dict[str, Any], field_paths: Optional[List[str]]) -> Dict[str, Any]:
+    if field_paths is None:
+        return copy.deepcopy(data)
+    projected: Dict[str, Any] = {}
+    for path in field_paths:
+        value = _get_path(data, path, _MISSING)
+        if value is _MISSING:
+            continue
+        node = projected
+        keys = path.split(".")
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = copy.deepcopy(value)
+    return projected
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocumentReference", data: Optional[Dict[str, Any]],
+                 update_time: Optional[int] = None, field_paths: Optional[List[str]] = None):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self.update_time = update_time
+        self._data = _project(data, field_paths) if data is not None else None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+    def get(self, field_path: str) -> Any:
+        if self._data is None:
+            return None
+        value = _get_path(self._data, field_path, _MISSING)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return value
+
+
+class FakeDocumentReference:
+    def __init__(self, client: "FakeFirestore", collection: str, document_id: str):
+        self._client = client
+        self.collection_name = collection
+        self.id = document_id
+        self.path = f"{collection}/{document_id}"
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def snapshot(self, field_paths: Optional[List[str]] = None) -> FakeSnapshot:
+        stored = self._client.store.get(self.path)
+        if stored is None:
+            return FakeSnapshot(self, None)
+        return FakeSnapshot(self, stored["data"], stored["update_time"], field_paths)
+
+    async def get(self, field_paths: Optional[List[str]] = None, transaction=None) -> FakeSnapshot:
+        self._client.reads += 1
+        return self.snapshot(field_paths)
+
+    async def set(self, data: Dict[str, Any], merge: bool = False):
+        self._client.commit_writes([("set", self, data, merge)])
+
+    async def create(self, data: Dict[str, Any]):
+        self._client.commit_writes([("create", self, data, False)])
+
+    async def update(self, data: Dict[str, Any]):
+        self._client.commit_writes([("update", self, data, False)])
+
+    async def delete(self):
+        self._client.commit_writes([("delete", self, None, False)])
+
+
+class FakeAggregationResult:
+    def __init__(self, alias: str, value: int):
+        self.alias = alias
+        self.value = value
+
+
+class FakeAggregationQuery:
+    def __init__(self, query: "FakeQuery", alias: str):
+        self._query = query
+        self._alias = alias
+
+    async def get(self, transaction=None):
+        return [[FakeAggregationResult(self._alias, len(self._query.matching()))]]
+
+
+class FakeQuery:
+    OPERATORS = {
+        "==": lambda value, target: value == target,
+        "!=": lambda value, target: value != target,
+        "<": lambda value, target: value < target,
+        "<=": lambda value, target: value <= target,
+        ">": lambda value, target: value > target,
+        ">=": lambda value, target: value >= target,
+        "in": lambda value, target: value in target,
+        "not-in": lambda value, target: value not in target,
+        "array_contains": lambda value, target: isinstance(value, list) and target in value,
+    }
+
+    def __init__(self, client: "FakeFirestore", collection: str):
+        self._client = client
+        self._collection = collection
+        self._filters: List[tuple] = []
+        self._orders: List[tuple] = []
+        self._start_after: Optional[FakeSnapshot] = None
+        self._offset = 0
+        self._limit: Optional[int] = None
+        self._fields: Optional[List[str]] = None
+
+    def _copy(self) -> "FakeQuery":
+        query = copy.copy(self)
+        query._filters = list(self._filters)
+        query._orders = list(self._orders)
+        return query
+
+    def where(self, field_path: str = None, op_string: str = None, value: Any = None, *, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        if op_string not in self.OPERATORS:
+            raise ValueError(f"Unsupported operator {op_string}")
+        query = self._copy()
+        query._filters.append((field_path, op_string, _normalize(value)))
+        return query
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING"):
+        query = self._copy()
+        query._orders.append((field_path, direction))
+        return query
+
+    def start_after(self, snapshot: FakeSnapshot):
+        query = self._copy()
+        query._start_after = snapshot
+        return query
+
+    def offset(self, count: int):
+        query = self._copy()
+        query._offset = count
+        return query
+
+    def limit(self, count: int):
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def select(self, field_paths: List[str]):
+        query = self._copy()
+        query._fields = list(field_paths)
+        return query
+
+    def count(self, alias: Optional[str] = None):
+        return FakeAggregationQuery(self, alias or "count")
+
+    def _value(self, reference: FakeDocumentReference, data: Dict[str, Any], field_path: str) -> Any:
+        return reference.id if field_path == "__name__" else _get_path(data, field_path, _MISSING)
+
+    def _sort_key(self, reference: FakeDocumentReference, data: Dict[str, Any]) -> tuple:
+        key = []
+        for field_path, direction in self._orders:
+            value = self._value(reference, data, field_path)
+            key.append(_Descending(value) if direction == "DESCENDING" else value)
+        key.append(reference.id)
+        return tuple(key)
+
+    def matching(self) -> List[tuple]:
+        documents = []
+        for reference, data in self._client.documents(self._collection):
+            if all(self._matches(reference, data, field_path, op_string, value)
+                   for field_path, op_string, value in self._filters):
+                if all(self._value(reference, data, field_path) is not _MISSING for field_path, _ in self._orders):
+                    documents.append((reference, data))
+        documents.sort(key=lambda item: self._sort_key(*item))
+
+        if self._start_after is not None:
+            boundary = self._sort_key(self._start_after.reference, self._client.store[self._start_after.reference.path]["data"])
+            documents = [item for item in documents if self._sort_key(*item) > boundary]
+        documents = documents[self._offset:]
+        if self._limit is not None:
+            documents = documents[:self._limit]
+        return documents
+
+    def _matches(self, reference, data, field_path, op_string, target) -> bool:
+        value = self._value(reference, data, field_path)
+        if value is _MISSING:
+            return False
+        try:
+            return self.OPERATORS[op_string](value, target)
+        except TypeError:
+            return False
+
+    async def get(self, transaction=None) -> List[FakeSnapshot]:
+        documents = self.matching()
+        self._client.reads += max(1, len(documents))
+        return [reference.snapshot(self._fields) for reference, _ in documents]
+
+    async def stream(self, transaction=None):
+        for snapshot in await self.get():
+            yield snapshot
+
+
+class _Descending:
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __gt__(self, other):
+        return self.value < other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client: "FakeFirestore", name: str):
+        super().__init__(client, name)
+        self.id = name
+
+    def document(self, document_id: Optional[str] = None) -> FakeDocumentReference:
+        return FakeDocumentReference(self._client, self._collection, document_id or uuid.uuid4().hex[:20])
+
+    async def add(self, data: Dict[str, Any]):
+        reference = self.document()
+        await reference.set(data)
+        return None, reference
+
+
+class FakeWriteBatch:
+    def __init__(self, client: "FakeFirestore"):
+        self._client = client
+        self._writes: List[tuple] = []
+
+    def __len__(self):
+        return len(self._writes)
+
+    def set(self, reference, data, merge: bool = False):
+        self._writes.append(("set", reference, data, merge))
+
+    def create(self, reference, data):
+        self._writes.append(("create", reference, data, False))
+
+    def update(self, reference, data):
+        self._writes.append(("update", reference, data, False))
+
+    def delete(self, reference):
+        self._writes.append(("delete", reference, None, False))
+
+    async def commit(self):
+        if len(self._writes) > 500:
+            raise ValueError("a batch holds at most 500 writes")
+        self._client.commit_writes(self._writes)
+        self._writes = []
+
+
+class FakeTransaction(FakeWriteBatch):
+    """Buffers writes like a batch; commits fail if a document read in the transaction changed since"""
+
+    def __init__(self, client: "FakeFirestore"):
+        super().__init__(client)
+        self._read_versions: Dict[str, Optional[int]] = {}
+
+    def _record(self, snapshot: FakeSnapshot):
+        self._read_versions.setdefault(snapshot.reference.path, snapshot.update_time)
+
+    async def get_all(self, references, field_paths=None):
+        # A coroutine returning an async generator, as in AsyncTransaction
+        snapshots = [reference.snapshot(field_paths) for reference in references]
+        for snapshot in snapshots:
+            self._record(snapshot)
+
+        async def generator():
+            for snapshot in snapshots:
+                yield snapshot
+        return generator()
+
+    async def get(self, reference, field_paths=None):
+        snapshot = reference.snapshot(field_paths)
+        self._record(snapshot)
+
+        async def generator():
+            yield snapshot
+        return generator()
+
+    async def commit(self):
+        for path, update_time in self._read_versions.items():
+            stored = self._client.store.get(path)
+            if (stored["update_time"] if stored else None) != update_time:
+                raise RuntimeError(f"transaction contention on {path}")
+        await super().commit()
+
+
+class FakeFirestore:
+    """The async client: collections, get_all, batches and transactions over one dict"""
+
+    def __init__(self):
+        self.store: Dict[str, Dict[str, Any]] = {}
+        self.reads = 0
+        self.commits = 0
+
+    def collection(self, name: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def transaction(self, **kwargs) -> FakeTransaction:
+        return FakeTransaction(self)
+
+    async def get_all(self, references, field_paths=None, transaction=None):
+        for reference in references:
+            self.reads += 1
+            snapshot = reference.snapshot(field_paths)
+            if transaction is not None:
+                transaction._record(snapshot)
+            yield snapshot
+
+    def documents(self, collection: str):
+        prefix = collection + "/"
+        for path, stored in list(self.store.items()):
+            if path.startswith(prefix) and "/" not in path[len(prefix):]:
+                yield FakeDocumentReference(self, collection, path[len(prefix):]), stored["data"]
+
+    def commit_writes(self, writes: List[tuple]):
+        # Preconditions first, so a failing batch changes nothing
+        for kind, reference, _, _ in writes:
+            if kind == "create" and reference.path in self.store:
+                raise AlreadyExists(f"Document already exists: {reference.path}")
+            if kind == "update" and reference.path not in self.store:
+                raise NotFound(f"No document to update: {reference.path}")
+
+        self.commits += 1
+        for kind, reference, data, merge in writes:
+            stored = self.store.get(reference.path)
+            if kind == "delete":
+                self.store.pop(reference.path, None)
+                continue
+            if kind == "update":
+                content = copy.deepcopy(stored["data"])
+                _update(content, data)
+            elif kind == "set" and merge and stored is not None:
+                content = copy.deepcopy(stored["data"])
+                _merge(content, data)
+            else:
+                content = _resolve(data)
+            self.store[reference.path] = {"data": content, "update_time": next(_clock)}
+
+    # Test helpers
+
+    def seed(self, collection: str, document_id: str, data: Dict[str, Any]):
+        self.store[f"{collection}/{document_id}"] = {"data": _resolve(data), "update_time": next(_clock)}
+
+    def data(self, collection: str, document_id: str) -> Optional[Dict[str, Any]]:
+        stored = self.store.get(f"{collection}/{document_id}")
+        return copy.deepcopy(stored["data"]) if stored else None
+
+    def ids(self, collection: str) -> List[str]:
+        return sorted(reference.id for reference, _ in self.documents(collection))
+
+
+def run_transactional(function):
+    """Stand-in for firestore.async_transactional: run once, then commit"""
+
+    async def runner(transaction, *args, **kwargs):
+        result = await function(transaction, *args, **kwargs)
+        await transaction.commit()
+        return result
+    return runner
@@ -0,0 +1,72 @@
+import pytest
+
+from src.services.dictionary_bundle import DictionaryBundle, HEADER
+
+
+ENTRIES = [
+    ("Apple", {"word": "apple", "definitions": [{"definition": "a fruit"}]}),
+    ("apricot", {"word": "apricot", "definitions": []}),
+    ("banana", {"word": "banana", "definitions": []}),
+    ("café", {"word": "café", "definitions": []}),
+    ("APPLE", {"word": "duplicate"}),
+]
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    path = str(tmp_path / "dictionary.bundle")
+    assert DictionaryBundle.build(ENTRIES, path) == 4
+    return path
+
+
+def test_round_trip(bundle_path):
+    bundle = DictionaryBundle(bundle_path)
+    try:
+        assert len(bundle) == 4
+        assert bundle.lookup("apple") == ENTRIES[0][1]
+        assert bundle.lookup("café") == {"word": "café", "definitions": []}
+        assert bundle.lookup("cherry") is None
+        assert list(bundle.headwords()) == ["apple", "apricot", "banana", "café"]
+    finally:
+        bundle.close()
+
+
+def test_suggest_reads_the_sorted_index(bundle_path):
+    bundle = DictionaryBundle(bundle_path)
+    try:
+        assert bundle.suggest("ap") == ["apple", "apricot"]
+        assert bundle.suggest("ap", limit=1) == ["apple"]
+        assert bundle.suggest("c") == ["café"]
+        assert bundle.suggest("z") == []
+    finally:
+        bundle.close()
+
+
+def test_empty_bundle(tmp_path):
+    path = str(tmp_path / "empty.bundle")
+    DictionaryBundle.build([], path)
+    bundle = DictionaryBundle(path)
+    try:
+        assert len(bundle) == 0
+        assert bundle.lookup("apple") is None
+        assert bundle.suggest("a") == []
+    finally:
+        bundle.close()
+
+
+@pytest.mark.parametrize("keep", [3, HEADER.size, HEADER.size + 8, -1])
+def test_truncated_bundle_raises_value_error(bundle_path, keep):
+    with open(bundle_path, "rb") as bundle_file:
+        data = bundle_file.read()
+    with open(bundle_path, "wb") as bundle_file:
+        bundle_file.write(data[:keep])
+
+    with pytest.raises(ValueError):
+        DictionaryBundle(bundle_path)
+
+
+def test_wrong_magic_raises_value_error(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"NOTADICT" + b"\x00" * 16)
+    with pytest.raises(ValueError):
+        DictionaryBundle(str(path))
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from src.services.dictionary_cache import DictionaryCache
+
+
+ENTRY = {"word": "lucid", "definitions": [{"definition": "clear"}]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DictionaryCache(max_size=2, disk_path=str(tmp_path / "dictionary.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_memory_then_disk(cache, tmp_path):
+    asyncio.run(cache.set("lucid", ENTRY))
+    assert asyncio.run(cache.get("lucid")) == ENTRY
+    assert cache.memory_hits == 1
+
+    # A fresh process only has the disk tier
+    reopened = DictionaryCache(disk_path=cache.disk_path)
+    try:
+        assert asyncio.run(reopened.get("lucid")) == ENTRY
+        assert asyncio.run(reopened.get("lucid")) == ENTRY
+        assert (reopened.disk_hits, reopened.memory_hits) == (1, 1)
+    finally:
+        reopened.close()
+
+
+def test_memory_tier_is_a_bounded_lru(cache):
+    for word in ("a", "b", "c"):
+        asyncio.run(cache.set(word, {"word": word}))
+    assert list(cache._memory) == ["b", "c"]
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DictionaryCache(ttl_seconds=-1, disk_path=str(tmp_path / "cache.sqlite3"), disk_ttl_seconds=-1)
+    try:
+        asyncio.run(cache.set("lucid", ENTRY))
+        assert asyncio.run(cache.get("lucid")) is None
+        assert cache.stats()["misses"] == 1
+    finally:
+        cache.close()
+
+
+def test_stats_hit_rate(cache):
+    asyncio.run(cache.set("lucid", ENTRY))
+    asyncio.run(cache.get("lucid"))
+    asyncio.run(cache.get("missing"))
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 50.0)
+
+
+def test_negative_entries_expire_and_are_bounded():
+    cache = DictionaryCache(negative_max_size=2, negative_ttl_seconds=60)
+    for word in ("a", "b", "c"):
+        cache.set_missing(word)
+    assert not cache.is_known_missing("a")
+    assert cache.is_known_missing("b") and cache.is_known_missing("c")
+    assert cache.negative_hits == 2
+
+    expired = DictionaryCache(negative_ttl_seconds=-1)
+    expired.set_missing("a")
+    assert not expired.is_known_missing("a")
+
+
+def test_storing_an_entry_clears_its_negative_entry():
+    cache = DictionaryCache()
+    cache.set_missing("lucid")
+    asyncio.run(cache.set("lucid", ENTRY))
+    assert not cache.is_known_missing("lucid")
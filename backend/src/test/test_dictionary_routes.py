@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import dictionary
+from src.services import dictionary_service
+from src.utils import get_current_user
+
+
+def entry(word: str, definition: str):
+    return {"word": word, "definitions": [{"definition": definition, "partOfSpeech": "noun"}], "source": "dictionaryapi.dev"}
+
+
+KNOWN = {"apple": entry("apple", "a fruit"), "banana": entry("banana", "a long fruit")}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    looked_up = []
+
+    async def lookup_word(word):
+        looked_up.append(word)
+        return KNOWN.get(word)
+
+    monkeypatch.setattr(dictionary_service, "lookup_word", lookup_word)
+    app = FastAPI()
+    app.include_router(dictionary.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    client = TestClient(app)
+    client.looked_up = looked_up
+    return client
+
+
+def test_lookup_batch_dedupes_and_counts(client):
+    response = client.post("/api/dictionary/lookup-batch", json={"words": ["Apple", "apple ", "banana", "qwerty", " "]})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert sorted(client.looked_up) == ["apple", "banana", "qwerty"]
+    assert body["results"]["apple"]["data"]["definitions"][0]["definition"] == "a fruit"
+    assert body["results"]["qwerty"]["success"] is False
+    assert (body["found"], body["not_found"]) == (2, 1)
+
+
+@pytest.mark.parametrize("words, status_code", [([" "], 400), ([], 422), (["w"] * 51, 422)])
+def test_lookup_batch_rejects_empty_or_oversized_batches(client, words, status_code):
+    assert client.post("/api/dictionary/lookup-batch", json={"words": words}).status_code == status_code
+
+
+def test_suggest_returns_the_index_matches(client, monkeypatch):
+    monkeypatch.setattr(dictionary_service.suggestions, "suggest", lambda prefix, limit: ["apple"])
+    response = client.get("/api/dictionary/suggest", params={"prefix": "ap", "limit": 5})
+    assert response.status_code == 200
+    assert response.json() == {"prefix": "ap", "suggestions": ["apple"]}
+
+    assert client.get("/api/dictionary/suggest", params={"prefix": ""}).status_code == 422
@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+
+from src.config import settings
+from src.services.dictionary_bundle import DictionaryBundle
+from src.services.dictionary_cache import DictionaryCache
+from src.services.dictionary_service import DictionaryService
+
+
+API_ENTRY = {
+    "word": "lucid",
+    "phonetics": [{"text": "/ˈluːsɪd/", "audio": ""}],
+    "meanings": [{
+        "partOfSpeech": "adjective",
+        "synonyms": ["clear"],
+        "definitions": [{"definition": "Expressed clearly", "example": "a lucid account"}]
+    }]
+}
+
+
+def service_with(handler):
+    """A DictionaryService whose shared client answers with `handler` instead of the network"""
+
+    requests = []
+
+    def recording_handler(request: httpx.Request):
+        requests.append(request.url.path)
+        return handler(request)
+
+    service = DictionaryService()
+    service.cache = DictionaryCache()
+    service.client = httpx.AsyncClient(base_url=service.base_url, transport=httpx.MockTransport(recording_handler))
+    return service, requests
+
+
+def found(request: httpx.Request):
+    if request.url.path.endswith("/lucid"):
+        return httpx.Response(200, json=[API_ENTRY])
+    return httpx.Response(404, json={"title": "No Definitions Found"})
+
+
+def test_lookup_formats_the_api_entry():
+    service, _ = service_with(found)
+    result = asyncio.run(service.lookup_word("Lucid"))
+
+    assert result["word"] == "lucid"
+    assert result["phonetic"] == "/ˈluːsɪd/"
+    assert result["definitions"] == [
+        {"partOfSpeech": "adjective", "definition": "Expressed clearly", "example": "a lucid account"}
+    ]
+    assert result["synonyms"] == ["clear"]
+
+
+def test_unknown_word_is_none():
+    service, _ = service_with(found)
+    assert asyncio.run(service.lookup_word("qwertyuiop")) is None
+
+
+def test_lookups_share_one_client():
+    async def scenario():
+        service, requests = service_with(found)
+        client = service.client
+        await service.start()
+        await service.lookup_word("lucid")
+        await service.lookup_word("qwertyuiop")
+        assert service.client is client
+        await service.close()
+        assert service.client is None
+        return requests
+
+    assert len(asyncio.run(scenario())) == 2
+
+
+def test_concurrent_lookups_share_one_request():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_found(request: httpx.Request):
+            await release.wait()
+            return found(request)
+
+        service, requests = service_with(slow_found)
+        lookups = asyncio.gather(*(service.lookup_word("lucid") for _ in range(5)))
+        await asyncio.sleep(0.01)
+        release.set()
+        return service, requests, await lookups
+
+    service, requests, results = asyncio.run(scenario())
+    assert len(requests) == 1
+    assert all(result["word"] == "lucid" for result in results)
+    assert service.coalesced_lookups == 4
+    assert service.cache_stats()["in_flight"] == 0
+
+
+def test_not_found_is_remembered():
+    service, requests = service_with(found)
+    assert asyncio.run(service.lookup_word("qwertyuiop")) is None
+    assert asyncio.run(service.lookup_word("qwertyuiop")) is None
+
+    assert len(requests) == 1
+    assert service.is_known_missing(" Qwertyuiop ")
+
+
+def test_bundle_entries_need_no_request(tmp_path, monkeypatch):
+    path = str(tmp_path / "dictionary.bundle")
+    DictionaryBundle.build([("lucid", {"word": "lucid", "definitions": []})], path)
+    monkeypatch.setattr(settings, "DICTIONARY_BUNDLE_PATH", path)
+
+    async def scenario():
+        service, requests = service_with(found)
+        await service.start()
+        try:
+            result = await service.lookup_word("lucid")
+        finally:
+            await service.close()
+        return service, requests, result
+
+    service, requests, result = asyncio.run(scenario())
+    assert result == {"word": "lucid", "definitions": []}
+    assert requests == [] and service.bundle_hits == 1
+
+
+def test_upstream_failure_serves_the_expired_entry(tmp_path):
+    async def scenario():
+        service, requests = service_with(lambda request: httpx.Response(503))
+        service.cache = DictionaryCache(disk_path=str(tmp_path / "cache.sqlite3"), disk_ttl_seconds=-1)
+        await service.cache.set("lucid", {"word": "lucid", "definitions": []})
+        service.cache._memory.clear()
+        try:
+            return await service.lookup_word("lucid"), service.cache.stale_hits
+        finally:
+            service.cache.close()
+
+    assert asyncio.run(scenario()) == ({"word": "lucid", "definitions": []}, 1)
@@ -0,0 +1,39 @@
+import asyncio
+
+from src.tools.migrate_document_ids import migrate
+from src.utils import word_doc_id, progress_doc_id
+
+
+def test_word_ids_normalize_the_headword():
+    assert word_doc_id("u1", " Lucid ") == word_doc_id("u1", "lucid")
+    assert word_doc_id("u1", "lucid") != word_doc_id("u2", "lucid")
+    assert progress_doc_id("u1", "w1") == "u1_w1"
+
+
+def test_migration_merges_duplicates_and_repoints_history(fake_db):
+    fake_db.seed("users", "u1", {"email": "u1@example.com"})
+    fake_db.seed("words", "auto1", {"userId": "u1", "word": "Lucid"})
+    fake_db.seed("words", "auto2", {"userId": "u1", "word": "lucid"})
+    fake_db.seed("progress", "p1", {"userId": "u1", "wordId": "auto1", "totalReviews": 1})
+    fake_db.seed("progress", "p2", {"userId": "u1", "wordId": "auto2", "totalReviews": 5})
+    fake_db.seed("quiz_results", "q1", {"userId": "u1", "wordId": "auto2"})
+
+    totals = asyncio.run(migrate(dry_run=False, concurrency=2))
+
+    word_id = word_doc_id("u1", "lucid")
+    assert (totals["users"], totals["words"]) == (1, 2)
+    assert fake_db.ids("words") == [word_id]
+    assert fake_db.ids("progress") == [progress_doc_id("u1", word_id)]
+    assert fake_db.data("progress", progress_doc_id("u1", word_id))["totalReviews"] == 5
+    assert fake_db.data("quiz_results", "q1")["wordId"] == word_id
+    assert fake_db.data("users", "u1")["wordsVersion"] == 1
+
+
+def test_dry_run_writes_nothing(fake_db):
+    fake_db.seed("users", "u1", {})
+    fake_db.seed("words", "auto1", {"userId": "u1", "word": "lucid"})
+
+    totals = asyncio.run(migrate(dry_run=True, concurrency=2))
+
+    assert totals["operations"] == 2
+    assert fake_db.ids("words") == ["auto1"]
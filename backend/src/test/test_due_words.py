@@ -0,0 +1,51 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services.entry_service import entry_service
+from src.services.progress_service import ProgressService
+from src.utils import progress_doc_id
+
+
+@pytest.fixture
+def seeded(fake_db, monkeypatch):
+    monkeypatch.setattr(entry_service, "_cache", OrderedDict())
+    now = datetime.now()
+    fake_db.seed("dictionary_entries", "e1", {"word": "lucid", "definitions": [{"definition": "clear"}]})
+    fake_db.seed("words", "w1", {"userId": "u1", "word": "lucid", "entryId": "e1", "userNotes": "note"})
+    fake_db.seed("words", "w2", {"userId": "u1", "word": "terse", "definitions": [{"definition": "brief"}]})
+    fake_db.seed("words", "w3", {"userId": "u1", "word": "later"})
+    for word_id, due in (("w1", now - timedelta(days=2)), ("w2", now - timedelta(hours=1)),
+                         ("w3", now + timedelta(days=3)), ("gone", now - timedelta(days=5))):
+        fake_db.seed("progress", progress_doc_id("u1", word_id), {
+            "userId": "u1", "wordId": word_id, "strength": 1, "nextReviewDate": due
+        })
+    return fake_db
+
+
+def test_due_words_are_read_with_one_get_all(seeded, monkeypatch):
+    calls = []
+    get_all = seeded.get_all
+
+    def counting_get_all(references, *args, **kwargs):
+        calls.append([reference.collection_name for reference in references])
+        return get_all(references, *args, **kwargs)
+
+    monkeypatch.setattr(seeded, "get_all", counting_get_all)
+
+    due_words = asyncio.run(ProgressService().get_due_words("u1", limit=10))
+
+    # Oldest first; the progress entry of a deleted word is skipped
+    assert [word["word"] for word in due_words] == ["lucid", "terse"]
+    assert due_words[0]["definitions"] == [{"definition": "clear"}]
+    assert due_words[0]["user_notes"] == "note"
+    assert due_words[1]["definitions"] == [{"definition": "brief"}]
+    assert calls == [["words", "words", "words"], ["dictionary_entries"]]
+
+
+def test_limit_caps_the_progress_query(seeded):
+    # The single most overdue entry belongs to a deleted word
+    assert asyncio.run(ProgressService().get_due_words("u1", limit=1)) == []
+    assert len(asyncio.run(ProgressService().get_due_words("u1", limit=2))) == 1
@@ -0,0 +1,45 @@
+import asyncio
+
+from src.services.entry_service import EntryService
+
+
+LUCID = {
+    "definitions": [{"definition": "clear", "partOfSpeech": "adjective"}],
+    "phonetics": [],
+    "synonyms": ["clear", "plain", "limpid"],
+    "antonyms": [],
+    "source": "dictionaryapi.dev"
+}
+
+
+def test_entry_id_ignores_synonym_order(fake_db):
+    first = asyncio.run(EntryService().save_entry("lucid", LUCID))
+    second = asyncio.run(EntryService().save_entry("lucid", {**LUCID, "synonyms": ["plain", "limpid", "clear"]}))
+
+    assert first == second
+    assert fake_db.ids("dictionary_entries") == [first]
+    assert fake_db.data("dictionary_entries", first)["synonyms"] == ["clear", "limpid", "plain"]
+
+
+def test_cached_entries_are_written_once(fake_db):
+    service = EntryService()
+    asyncio.run(service.save_entry("lucid", LUCID))
+    commits = fake_db.commits
+    asyncio.run(service.save_entry("lucid", LUCID))
+    assert fake_db.commits == commits
+
+
+def test_resolve_words_fills_referenced_fields_in_place(fake_db):
+    service = EntryService()
+    entry_id = asyncio.run(service.save_entry("lucid", LUCID))
+
+    words = [
+        {"word": "lucid", "entryId": entry_id},
+        {"word": "old", "definitions": [{"definition": "stored inline"}]},
+        {"word": "gone", "entryId": "missing"}
+    ]
+    asyncio.run(EntryService().resolve_words(words))
+
+    assert words[0]["definitions"] == LUCID["definitions"]
+    assert words[1]["definitions"] == [{"definition": "stored inline"}]
+    assert "definitions" not in words[2]
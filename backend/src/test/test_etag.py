@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import words
+from src.services.search_service import SearchService
+from src.utils import get_current_user, user_versions
+
+
+@pytest.fixture
+def client(fake_db, monkeypatch):
+    monkeypatch.setattr(words, "search_service", SearchService())
+    fake_db.seed("users", "u1", {"email": "u1@example.com", "dataVersion": 3})
+    fake_db.seed("words", "w1", {
+        "userId": "u1",
+        "word": "lucid",
+        "addedAt": datetime(2024, 5, 1),
+        "source": "manual",
+        "definitions": [{"definition": "clear", "partOfSpeech": "adjective"}]
+    })
+    app = FastAPI()
+    app.include_router(words.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    return TestClient(app)
+
+
+def test_unchanged_word_answers_304_without_reads(client, fake_db):
+    first = client.get("/api/words/w1")
+    etag = first.headers["ETag"]
+    reads = fake_db.reads
+
+    second = client.get("/api/words/w1", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert fake_db.reads == reads
+
+
+def test_a_write_changes_the_etag_at_once(client):
+    etag = client.get("/api/words/w1").headers["ETag"]
+
+    assert client.put("/api/words/w1", json={"user_notes": "note"}).status_code == 200
+
+    response = client.get("/api/words/w1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_versions_bumped_elsewhere_are_seen_after_the_ttl(client, fake_db, monkeypatch):
+    etag = client.get("/api/words/", params={"view": "summary"}).headers["ETag"]
+    # Another worker or a maintenance tool writes
+    fake_db.seed("users", "u1", {"email": "u1@example.com", "dataVersion": 4})
+
+    cached = client.get("/api/words/", params={"view": "summary"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    monkeypatch.setattr(user_versions, "ttl_seconds", 0)
+    fresh = client.get("/api/words/", params={"view": "summary"}, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+
+def test_etags_depend_on_the_request(client):
+    summary = client.get("/api/words/", params={"view": "summary"}).headers["ETag"]
+    full = client.get("/api/words/").headers["ETag"]
+    assert summary != full
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import words
+from src.services.export_service import ExportService
+from src.utils import get_current_user, progress_doc_id
+
+
+@pytest.fixture
+def client(fake_db, monkeypatch):
+    # A page size below the vocabulary size makes the export page with start_after
+    monkeypatch.setattr(words, "export_service", ExportService(page_size=2))
+    for word_id, word in (("w1", "lucid"), ("w2", "limpid"), ("w3", "terse")):
+        fake_db.seed("words", word_id, {
+            "userId": "u1",
+            "word": word,
+            "addedAt": datetime(2024, 5, 1),
+            "definitions": [{"definition": f"meaning of {word}", "partOfSpeech": "adjective"}],
+            "synonyms": ["clear", "plain"]
+        })
+    fake_db.seed("words", "x1", {"userId": "u2", "word": "other"})
+    fake_db.seed("progress", progress_doc_id("u1", "w2"), {
+        "userId": "u1", "wordId": "w2", "strength": 3, "totalReviews": 4, "correctReviews": 3
+    })
+    app = FastAPI()
+    app.include_router(words.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    return TestClient(app)
+
+
+def test_ndjson_export_joins_progress_across_pages(client):
+    response = client.get("/api/words/export")
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["word"] for row in rows] == ["lucid", "limpid", "terse"]
+    assert (rows[1]["strength"], rows[1]["total_reviews"]) == (3, 4)
+    assert (rows[0]["strength"], rows[0]["total_reviews"]) == (None, 0)
+
+
+def test_csv_export_flattens_lists(client):
+    response = client.get("/api/words/export", params={"format": "csv"})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["word"] for row in rows] == ["lucid", "limpid", "terse"]
+    assert rows[0]["definitions"] == "meaning of lucid"
+    assert rows[0]["synonyms"] == "clear, plain"
+
+
+def test_unknown_export_format_is_rejected(client):
+    assert client.get("/api/words/export", params={"format": "xml"}).status_code == 422
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.services.import_service import ImportService, iter_lines, parse_line
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def read(*chunks: bytes, file_format: str = "text"):
+    return asyncio.run(ImportService().read_upload(stream(*chunks), file_format))
+
+
+def test_parse_plain_line():
+    assert parse_line("  Serendipity ", "text") == ("serendipity", None)
+    assert parse_line("   ", "text") is None
+
+
+def test_parse_csv_line_with_quoted_notes():
+    assert parse_line('Ephemeral,"short-lived, fleeting"', "csv") == ("ephemeral", "short-lived, fleeting")
+    assert parse_line(",notes only", "csv") is None
+
+
+def test_parse_anki_line_strips_html_and_headers():
+    assert parse_line("<b>Lucid</b>\t<i>clear</i>", "anki") == ("lucid", "clear")
+    assert parse_line("#separator:tab", "anki") is None
+
+
+def test_notes_are_truncated():
+    assert len(parse_line("word," + "x" * 600, "csv")[1]) == 500
+
+
+def test_iter_lines_joins_chunks_and_strips_bom_and_cr():
+    async def collect():
+        return [line async for line in iter_lines(stream(b"\xef\xbb\xbfal", b"pha\r\nbe", b"ta\ngamma"))]
+
+    assert asyncio.run(collect()) == ["alpha", "beta", "gamma"]
+
+
+@pytest.mark.parametrize("chunks, limits", [
+    ((b"x" * 50,), {"max_line_length": 20}),
+    ((b"short\n" + b"y" * 30 + b"\n",), {"max_line_length": 20}),
+    ((b"a\n",) * 20, {"max_bytes": 30}),
+])
+def test_iter_lines_rejects_oversized_input(chunks, limits):
+    async def collect():
+        return [line async for line in iter_lines(stream(*chunks), **limits)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
+
+
+def test_read_upload_dedupes_and_skips_csv_header():
+    entries = read(b"word,notes\nApple,fruit\napple,again\n", b"banana\n", file_format="csv")
+    assert entries == [("apple", "fruit"), ("banana", None)]
+
+
+def test_read_upload_skips_overlong_words():
+    assert read(b"a" * 101 + b"\nok\n") == [("ok", None)]
+
+
+def test_read_upload_enforces_word_limit(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_WORDS", 2)
+    with pytest.raises(ValueError):
+        read(b"one\ntwo\nthree\n")
@@ -0,0 +1,95 @@
+import asyncio
+import importlib
+from collections import OrderedDict
+
+import pytest
+
+from src.services.dictionary_service import DictionaryUnavailableError
+from src.services.entry_service import entry_service
+from src.services.import_service import ImportService
+from src.services.search_service import SearchService
+from src.utils import word_doc_id
+
+# The package re-exports the service instance under the module's name
+import_module = importlib.import_module("src.services.import_service")
+
+
+LUCID = {
+    "word": "lucid",
+    "definitions": [{"partOfSpeech": "adjective", "definition": "expressed clearly", "example": ""}],
+    "phonetics": [],
+    "synonyms": [],
+    "antonyms": [],
+    "source": "dictionaryapi.dev"
+}
+
+
+@pytest.fixture
+def service(fake_db, monkeypatch):
+    async def lookup_words(words, concurrency=8):
+        results = {"lucid": LUCID, "limpid": {**LUCID, "word": "limpid"}, "qwerty": None}
+        return {word: results.get(word, DictionaryUnavailableError("timeout")) for word in words}
+
+    monkeypatch.setattr(import_module.dictionary_service, "lookup_words", lookup_words)
+    monkeypatch.setattr(import_module, "search_service", SearchService())
+    monkeypatch.setattr(entry_service, "_cache", OrderedDict())
+    fake_db.seed("users", "u1", {"email": "u1@example.com", "stats": {"total_words_added": 1}})
+    fake_db.seed("words", "old", {"userId": "u1", "word": "lucid"})
+    return ImportService()
+
+
+def run_import(service, entries):
+    async def run():
+        job = service.start_import("u1", entries, "import")
+        await asyncio.gather(*service._tasks)
+        return job
+
+    return asyncio.run(run())
+
+
+def test_import_counts_every_outcome(service, fake_db):
+    job = run_import(service, [("lucid", None), ("limpid", "clear"), ("qwerty", None), ("offline", None)])
+
+    assert job["status"] == "completed"
+    assert (job["processed"], job["imported"], job["duplicates"]) == (4, 1, 1)
+    assert (job["not_found"], job["failed"]) == (1, 1)
+    assert job["not_found_words"] == ["qwerty"]
+
+    added = [fake_db.data("words", word_id) for word_id in fake_db.ids("words") if word_id != "old"]
+    assert [(word["word"], word["userNotes"]) for word in added] == [("limpid", "clear")]
+    user = fake_db.data("users", "u1")
+    assert user["stats"]["total_words_added"] == 2
+    assert user["wordsVersion"] == 1
+
+
+def test_chunks_are_committed_separately(service, fake_db, monkeypatch):
+    monkeypatch.setattr(import_module.settings, "IMPORT_BATCH_SIZE", 1)
+    commits = fake_db.commits
+
+    job = run_import(service, [("limpid", None), ("lucid", None), ("qwerty", None)])
+
+    assert job["imported"] == 1
+    # Only chunks that add a word write anything
+    assert fake_db.commits == commits + 1
+
+
+def test_words_created_during_the_commit_are_dropped_and_the_rest_retried(service, fake_db, monkeypatch):
+    create_batch = fake_db.batch
+    batches = []
+
+    def racing_batch():
+        # Another request adds "limpid" between the duplicate read and the first commit
+        if not batches:
+            fake_db.seed("words", word_doc_id("u1", "limpid"), {"userId": "u1", "word": "limpid"})
+        batches.append(create_batch())
+        return batches[-1]
+
+    monkeypatch.setattr(fake_db, "batch", racing_batch)
+    fake_db.seed("words", "old", {"userId": "u1", "word": "other"})
+
+    job = run_import(service, [("limpid", None), ("lucid", None)])
+
+    assert len(batches) == 2
+    assert (job["imported"], job["duplicates"], job["failed"]) == (1, 1, 0)
+    assert fake_db.data("words", word_doc_id("u1", "lucid"))["word"] == "lucid"
+    assert fake_db.data("users", "u1")["stats"]["total_words_added"] == 2
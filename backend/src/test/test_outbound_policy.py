@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from src.services.outbound_policy import CircuitBreaker, LatencyTracker, OutboundPolicy, UpstreamUnavailableError
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, label: str = ""):
+        self.status_code = status_code
+        self.label = label
+
+
+def responding(status_code: int = 200):
+    async def request(timeout):
+        return FakeResponse(status_code)
+    return request
+
+
+def test_latency_percentiles_need_enough_samples():
+    tracker = LatencyTracker(window_size=100, min_samples=10)
+    for latency in range(9):
+        tracker.record(latency)
+    assert tracker.percentile(50) is None
+
+    tracker.record(9)
+    assert tracker.percentile(50) == 5
+    assert tracker.percentile(99) == 9
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # After the cool-down exactly one probe gets through
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_open_circuit_rejects_without_calling_upstream():
+    policy = OutboundPolicy(failure_threshold=1, reset_timeout=60)
+    asyncio.run(policy.call(responding(503)))
+    assert policy.breaker.state == "open"
+
+    with pytest.raises(UpstreamUnavailableError):
+        asyncio.run(policy.call(responding(200)))
+    assert policy.rejected_requests == 1
+
+
+def test_client_errors_do_not_trip_the_breaker():
+    policy = OutboundPolicy(failure_threshold=1)
+    asyncio.run(policy.call(responding(404)))
+    assert policy.breaker.state == "closed"
+
+
+def test_full_bulkhead_rejects():
+    async def scenario():
+        policy = OutboundPolicy(max_concurrent=1, bulkhead_wait=0.01)
+        release = asyncio.Event()
+
+        async def slow(timeout):
+            await release.wait()
+            return FakeResponse()
+
+        first = asyncio.ensure_future(policy.call(slow))
+        await asyncio.sleep(0)
+        with pytest.raises(UpstreamUnavailableError):
+            await policy.call(responding())
+        release.set()
+        await first
+        return policy
+
+    assert asyncio.run(scenario()).rejected_requests == 1
+
+
+def test_timeout_follows_p99_within_bounds():
+    policy = OutboundPolicy(default_timeout=5, min_timeout=1, max_timeout=10, timeout_multiplier=3)
+    assert policy.current_timeout() == 5
+    for _ in range(20):
+        policy.latency.record(0.1)
+    assert policy.current_timeout() == 1
+    for _ in range(200):
+        policy.latency.record(2.0)
+    assert policy.current_timeout() == 6
+
+
+def test_slow_request_is_hedged_and_the_faster_answer_wins():
+    async def scenario():
+        policy = OutboundPolicy()
+        for _ in range(20):
+            policy.latency.record(0.01)
+
+        attempts = []
+
+        async def request(timeout):
+            attempts.append(timeout)
+            if len(attempts) == 1:
+                await asyncio.sleep(1)
+                return FakeResponse(label="first")
+            return FakeResponse(label="hedge")
+
+        response = await policy.call(request)
+        return policy, attempts, response
+
+    policy, attempts, response = asyncio.run(scenario())
+    assert response.label == "hedge"
+    assert len(attempts) == 2
+    assert policy.hedged_requests == 1
+
+
+def test_no_hedging_without_latency_history_or_when_disabled():
+    async def scenario(policy):
+        attempts = []
+
+        async def request(timeout):
+            attempts.append(timeout)
+            await asyncio.sleep(0.02)
+            return FakeResponse()
+
+        await policy.call(request)
+        return attempts
+
+    assert len(asyncio.run(scenario(OutboundPolicy()))) == 1
+
+    disabled = OutboundPolicy(hedging=False)
+    for _ in range(20):
+        disabled.latency.record(0.001)
+    assert len(asyncio.run(scenario(disabled))) == 1
+
+
+def test_probe_slot_is_freed_when_the_probe_never_completes():
+    async def scenario():
+        policy = OutboundPolicy(max_concurrent=1, bulkhead_wait=0.01, failure_threshold=1, reset_timeout=0)
+        policy.breaker.record_failure()
+
+        # The probe cannot get into the full bulkhead
+        release = asyncio.Event()
+
+        async def slow(timeout):
+            await release.wait()
+            return FakeResponse()
+
+        await policy._bulkhead.acquire()
+        with pytest.raises(UpstreamUnavailableError):
+            await policy.call(slow)
+        policy._bulkhead.release()
+
+        # The next probe is cancelled mid-request
+        probe = asyncio.ensure_future(policy.call(slow))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        # Neither left the circuit rejecting forever
+        response = await policy.call(responding(200))
+        return policy, response
+
+    policy, response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert policy.breaker.state == "closed"
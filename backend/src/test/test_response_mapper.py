@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from src.models import ProgressResponse, WordResponse, WordSummaryResponse
+from src.services.response_mapper import progress_dict, word_dict, word_fields_dict, word_summary_dict
+
+
+WORD = {
+    "userId": "u1",
+    "word": "lucid",
+    "addedAt": datetime(2024, 5, 1, tzinfo=timezone.utc),
+    "source": "manual",
+    "definitions": [{"partOfSpeech": "adjective", "definition": "expressed clearly", "example": ""}],
+    "phonetics": [{"text": "/ˈluːsɪd/", "audio": ""}],
+    "synonyms": ["clear"],
+    "userNotes": "note",
+    "difficultyLevel": "easy"
+}
+
+
+def test_trusted_word_dicts_match_their_response_models():
+    # Skipping validation is only safe while the mapped dicts validate unchanged
+    full = word_dict("w1", WORD, "u1")
+    assert WordResponse(**full).model_dump() == full
+
+    summary = word_summary_dict("w1", WORD)
+    assert WordSummaryResponse(**summary).model_dump() == summary
+
+
+def test_sparse_words_keep_only_the_requested_fields():
+    assert word_fields_dict("w1", WORD, "u1", ["id", "word", "user_notes"]) == {
+        "id": "w1", "word": "lucid", "user_notes": "note"
+    }
+
+
+def test_missing_fields_fall_back_to_model_defaults():
+    full = word_dict("w1", {"word": "bare"}, "u1")
+    assert (full["user_id"], full["source"], full["definitions"], full["is_favorite"]) == ("u1", "manual", [], False)
+
+
+def test_trusted_progress_dict_matches_progress_response():
+    progress = {
+        "strength": 2,
+        "totalReviews": 4,
+        "correctReviews": 3,
+        "consecutiveCorrect": 1,
+        "nextReviewDate": datetime(2024, 5, 3, tzinfo=timezone.utc),
+        "lastReviewed": datetime(2024, 5, 2, tzinfo=timezone.utc),
+        "createdAt": datetime(2024, 5, 1, tzinfo=timezone.utc)
+    }
+
+    mapped = progress_dict("u1_w1", "u1", "w1", "lucid", progress)
+
+    assert ProgressResponse(**mapped).model_dump() == mapped
+    assert mapped["updated_at"] == mapped["last_reviewed"]
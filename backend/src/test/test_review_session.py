@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import progress
+from src.services.progress_service import ProgressService
+from src.utils import get_current_user, progress_doc_id
+
+
+def review(word_id: str, is_correct: bool):
+    return {"word_id": word_id, "is_correct": is_correct, "quiz_type": "definition", "response_time_ms": 900}
+
+
+@pytest.fixture
+def seeded(fake_db):
+    fake_db.seed("users", "u1", {"stats": {"totalQuizzesTaken": 2}})
+    fake_db.seed("words", "w1", {"userId": "u1", "word": "lucid"})
+    fake_db.seed("words", "w2", {"userId": "u1", "word": "terse", "difficultyLevel": "hard"})
+    fake_db.seed("words", "x1", {"userId": "u2", "word": "other"})
+    fake_db.seed("progress", progress_doc_id("u1", "w2"), {
+        "userId": "u1", "wordId": "w2", "strength": 3, "totalReviews": 5, "correctReviews": 4,
+        "consecutiveCorrect": 2, "nextReviewDate": datetime.now(timezone.utc) - timedelta(days=1)
+    })
+    return fake_db
+
+
+def test_session_is_one_read_and_one_commit(seeded):
+    reads, commits = seeded.reads, seeded.commits
+
+    result = asyncio.run(ProgressService().record_review_session("u1", [
+        review("w1", True), review("w2", False), review("w1", True), review("x1", True)
+    ]))
+
+    assert (result["reviewed"], result["correct"]) == (3, 2)
+    assert seeded.commits == commits + 1
+    # Both words, both progress ids (the foreign word's too) and the stats document, read once
+    assert seeded.reads == reads + 7
+
+    new_progress = seeded.data("progress", progress_doc_id("u1", "w1"))
+    assert (new_progress["totalReviews"], new_progress["correctReviews"]) == (2, 2)
+    old_progress = seeded.data("progress", progress_doc_id("u1", "w2"))
+    assert (old_progress["totalReviews"], old_progress["consecutiveCorrect"]) == (6, 0)
+    assert progress_doc_id("u1", "x1") not in seeded.ids("progress")
+
+    assert len(seeded.ids("quiz_results")) == 3
+    user = seeded.data("users", "u1")
+    assert user["stats"]["totalQuizzesTaken"] == 5
+    assert user["dataVersion"] == 1
+
+    stats = seeded.data("user_stats", "u1")
+    assert (stats["totalReviews"], stats["correctReviews"]) == (3, 2)
+    assert stats["strengthCounts"]["3"] == -1
+    assert (stats["currentStreak"], stats["lastReviewDay"]) == (1, datetime.now().date().isoformat())
+
+
+def test_session_of_unknown_words_writes_nothing(seeded):
+    result = asyncio.run(ProgressService().record_review_session("u1", [review("x1", True)]))
+
+    assert result == {"updated_words": [], "reviewed": 0, "correct": 0}
+    assert seeded.ids("quiz_results") == []
+    assert "dataVersion" not in seeded.data("users", "u1")
+    assert seeded.data("user_stats", "u1") is None
+
+
+def test_review_session_route(seeded):
+    app = FastAPI()
+    app.include_router(progress.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+
+    response = TestClient(app).post("/api/progress/review-session", json={
+        "reviews": [review("w1", True), review("w2", True)]
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["words_reviewed"], body["correct_answers"], body["accuracy"]) == (2, 2, 100)
+    assert sorted(word["word"] for word in body["updated_words"]) == ["lucid", "terse"]
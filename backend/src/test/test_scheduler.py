@@ -0,0 +1,51 @@
+import random
+from datetime import datetime
+
+import numpy as np
+
+from src.services.learning_service import learning_service
+
+NOW = datetime(2026, 5, 1, 12)
+STRENGTHS = [0, 1, 3, 6, 6, 2, 0]
+CORRECT = [True, False, True, True, False, True, False]
+LEVELS = [None, "easy", "intermediate", "hard", "easy", None, "hard"]
+CONSECUTIVE = [0, 0, 2, 5, 1, 3, 0]
+
+
+def test_batch_matches_the_per_word_rules(monkeypatch):
+    jitter = iter(np.random.default_rng(11).uniform(0.8, 1.2, size=len(STRENGTHS)))
+    monkeypatch.setattr(random, "uniform", lambda low, high: float(next(jitter)))
+    per_word = [
+        learning_service.calculate_next_review(strength, is_correct, level, streak)
+        for strength, is_correct, level, streak in zip(STRENGTHS, CORRECT, LEVELS, CONSECUTIVE)
+    ]
+    started = datetime.now()
+
+    next_reviews, new_strengths = learning_service.calculate_next_reviews(
+        STRENGTHS, CORRECT, LEVELS, CONSECUTIVE, rng=11, now=started
+    )
+
+    assert new_strengths.tolist() == [strength for _, strength in per_word]
+    for batched, (single, _) in zip(next_reviews, per_word):
+        # The per-word call reads the clock itself, a moment before `started`
+        assert abs((batched - single).total_seconds()) < 1
+
+
+def test_seeded_batches_are_reproducible():
+    first = learning_service.calculate_next_reviews(STRENGTHS, CORRECT, LEVELS, CONSECUTIVE, rng=7, now=NOW)
+    second = learning_service.calculate_next_reviews(STRENGTHS, CORRECT, LEVELS, CONSECUTIVE, rng=7, now=NOW)
+    other = learning_service.calculate_next_reviews(STRENGTHS, CORRECT, LEVELS, CONSECUTIVE, rng=8, now=NOW)
+
+    assert first[0] == second[0]
+    assert first[0] != other[0]
+    assert all(isinstance(review, datetime) and review > NOW for review in first[0])
+
+
+def test_defaults_and_out_of_range_strengths():
+    next_reviews, new_strengths = learning_service.calculate_next_reviews([9, -3], [True, True], rng=1, now=NOW)
+
+    assert new_strengths.tolist() == [6, 1]
+    # 64 and 2 days, each within the ±20% jitter
+    days = [(review - NOW).total_seconds() / 86400 for review in next_reviews]
+    assert 51.2 <= days[0] <= 76.8
+    assert 1.6 <= days[1] <= 2.4
@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from src.services.search_service import SearchIndex, SearchService, tokenize, trigrams
+
+
+def build_index(words):
+    index = SearchIndex(version=3)
+    for word_id, word_data in words.items():
+        index.add(word_id, SearchService.document_tokens(word_data))
+    return index
+
+
+WORDS = {
+    "w1": {"word": "serendipity", "definitions": [{"definition": "a happy accident"}]},
+    "w2": {"word": "accident", "synonyms": ["mishap"]},
+    "w3": {"word": "happy", "userNotes": "serendipity makes me happy"},
+}
+
+
+def test_tokenize_and_trigrams():
+    assert tokenize("Don't STOP-believing 42") == ["don't", "stop", "believing", "42"]
+    assert trigrams("cat") == {" ca", "cat", "at "}
+
+
+def test_document_tokens_keep_the_highest_field_weight():
+    tokens = SearchService.document_tokens({
+        "word": "happy",
+        "synonyms": ["glad"],
+        "userNotes": "happy notes",
+        "definitions": [{"definition": "feeling glad"}]
+    })
+    assert tokens == {"happy": 5.0, "glad": 2.0, "notes": 1.5, "feeling": 1.0}
+
+
+def test_headword_outranks_notes_and_definitions():
+    index = build_index(WORDS)
+    assert index.search("serendipity") == ["w1", "w3"]
+    assert index.search("accident") == ["w2", "w1"]
+
+
+def test_typos_prefixes_and_short_terms_match():
+    index = build_index(WORDS)
+    assert index.search("serendiptiy")[0] == "w1"
+    assert index.search("acci")[0] == "w2"
+    assert index.search("ha")[0] == "w3"
+    assert index.search("zzzz") == []
+
+
+def test_remove_and_readd_update_postings():
+    index = build_index(WORDS)
+    index.remove("w2")
+    assert index.search("mishap") == []
+    assert "mishap" not in index.postings
+
+    index.add("w1", SearchService.document_tokens({"word": "mishap"}))
+    assert index.search("mishap") == ["w1"]
+    assert index.search("serendipity") == ["w3"]
+
+
+def test_round_trip_keeps_version_and_ranking():
+    index = build_index(WORDS)
+    restored = SearchIndex.from_dict(index.to_dict())
+    assert restored.version == 3
+    assert restored.search("happy accident") == index.search("happy accident")
+
+
+def test_index_file_without_a_version_is_rejected():
+    with pytest.raises(ValueError):
+        SearchIndex.from_dict({"w1": {"happy": 5.0}})
+
+
+def seed_words(fake_db, version: int = 0):
+    fake_db.seed("users", "u1", {"wordsVersion": version})
+    for word_id, word_data in WORDS.items():
+        fake_db.seed("words", word_id, {"userId": "u1", **word_data})
+
+
+def test_index_is_built_once_and_updated_incrementally(fake_db):
+    seed_words(fake_db, version=2)
+    service = SearchService()
+
+    async def scenario():
+        first, second = await asyncio.gather(service.search("u1", "happy"), service.search("u1", "happy"))
+        reads = fake_db.reads
+        await service.apply_changes("u1", {"w4": {"word": "happiness"}}, removals=["w3"])
+        return first, second, reads, await service.search("u1", "happ", words_version=3)
+
+    first, second, reads, after = asyncio.run(scenario())
+    assert first == second == ["w3", "w1"]
+    assert reads == 1 + len(WORDS)  # users document and words, read by one shared build
+    assert after[0] == "w4" and "w3" not in after
+    assert fake_db.reads == reads
+    assert service._indexes["u1"].version == 3
+
+
+def test_newer_words_version_rebuilds_the_index(fake_db):
+    seed_words(fake_db, version=1)
+    service = SearchService()
+    asyncio.run(service.search("u1", "happy", words_version=1))
+
+    # Another process added a word and bumped the version
+    fake_db.seed("words", "w4", {"userId": "u1", "word": "happenstance"})
+    fake_db.seed("users", "u1", {"wordsVersion": 2})
+    assert asyncio.run(service.search("u1", "happenstance", words_version=1)) == []
+    assert asyncio.run(service.search("u1", "happenstance", words_version=2)) == ["w4"]
+
+
+def test_index_files_are_written_off_the_loop_and_coalesced(fake_db, tmp_path, monkeypatch):
+    seed_words(fake_db, version=5)
+    service = SearchService(persist_path=str(tmp_path))
+    writes = []
+    write_file = service._write_file
+    monkeypatch.setattr(service, "_write_file", lambda user_id, snapshot: writes.append(snapshot["version"]) or write_file(user_id, snapshot))
+
+    async def scenario():
+        await service.search("u1", "happy")
+        for number in range(3):
+            await service.apply_changes("u1", {f"n{number}": {"word": f"new{number}"}})
+        await service.flush()
+
+    asyncio.run(scenario())
+    assert writes[-1] == 8 and len(writes) < 4
+    with open(tmp_path / "u1.json", encoding="utf-8") as index_file:
+        assert json.load(index_file)["version"] == 8
+
+    restored = SearchService(persist_path=str(tmp_path))
+    assert asyncio.run(restored.search("u1", "new2", words_version=8)) == ["n2"]
@@ -0,0 +1,260 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from firebase_admin import firestore
+
+from src.routes import progress
+from src.services.stats_service import StatsDelta, DailyRollup, StatsService, stats_service, nest, strength_band
+from src.tools.reconcile_stats import drifted, reconcile, without_zeros
+from src.utils import get_current_user
+
+
+def days_ago(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).date().isoformat()
+
+
+def current_stats(fields, **overrides):
+    return {**fields, **overrides, stats_service.marker_field: stats_service.schema_version}
+
+
+def seed_user(fake_db, user_id: str = "u1"):
+    fake_db.seed("users", user_id, {"email": f"{user_id}@example.com"})
+    fake_db.seed("words", f"{user_id}-w1", {"userId": user_id, "word": "lucid"})
+    fake_db.seed("words", f"{user_id}-w2", {"userId": user_id, "word": "terse"})
+    fake_db.seed("progress", f"{user_id}-p1", {
+        "userId": user_id, "wordId": f"{user_id}-w1", "strength": 4, "totalReviews": 3, "correctReviews": 2,
+        "nextReviewDate": datetime.now() - timedelta(days=1)
+    })
+    fake_db.seed("quiz_results", f"{user_id}-q1", {
+        "userId": user_id, "wordId": f"{user_id}-w1", "quizType": "definition", "isCorrect": True,
+        "strengthBefore": 4, "reviewDate": datetime.now() - timedelta(days=1)
+    })
+    fake_db.seed("quiz_results", f"{user_id}-q2", {
+        "userId": user_id, "wordId": f"{user_id}-w1", "quizType": "spelling", "isCorrect": False,
+        "strengthBefore": 0, "reviewDate": datetime.now()
+    })
+
+
+def test_add_and_remove_progress_cancel_out():
+    progress = {"strength": 3, "nextReviewDate": datetime(2026, 5, 1, 12), "totalReviews": 4, "correctReviews": 3}
+    delta = StatsDelta()
+    delta.add_progress(progress)
+    assert delta.strength_counts == {"3": 1}
+    assert delta.due_by_day == {"2026-05-01": 1}
+    assert (delta.total_reviews, delta.correct_reviews) == (4, 3)
+
+    delta.remove_progress(progress)
+    assert delta.to_update() == {}
+
+
+def test_to_update_skips_zero_counters():
+    delta = StatsDelta()
+    delta.total_words = 2
+    delta.strength_counts["0"] += 1
+    delta.strength_counts["1"] += 0
+    delta.add_review({"quizType": "definition", "isCorrect": True})
+    delta.add_review({"quizType": "definition", "isCorrect": True}, day="2026-05-01", sign=-1)
+
+    assert delta.to_update() == {
+        "totalWords": firestore.Increment(2),
+        "strengthCounts": {"0": firestore.Increment(1)},
+        "reviewsByDay": {"2026-05-01": firestore.Increment(-1)}
+    }
+
+
+def test_add_review_counts_day_and_rollup():
+    delta = StatsDelta()
+    delta.add_review({"reviewDate": datetime(2026, 5, 1, 9), "quizType": "meaning",
+                      "isCorrect": True, "strengthBefore": 4})
+    delta.add_review({"quizType": "spelling", "isCorrect": False, "strengthBefore": 0}, day="2026-05-01")
+
+    assert delta.reviews_by_day == {"2026-05-01": 2}
+    assert delta.rollup.to_document("2026-05-01") == {
+        "total": 2,
+        "correct": 1,
+        "quizTypes": {"meaning": {"total": 1, "correct": 1}, "spelling": {"total": 1}},
+        "strengthBands": {"easy": {"total": 1, "correct": 1}, "hard": {"total": 1}}
+    }
+
+
+def test_nest_and_strength_band():
+    assert nest({("a", "b"): 1, ("a", "c"): 0, ("d",): 2}) == {"a": {"b": 1}, "d": 2}
+    assert [strength_band(strength) for strength in (0, 1, 2, 3, 4, 6)] == \
+        ["hard", "hard", "medium", "medium", "easy", "easy"]
+
+
+def test_streak_counts_days_not_answers():
+    assert StatsService.streak_update({"lastReviewDay": "2026-05-01", "currentStreak": 3}, "2026-05-01") == {}
+    assert StatsService.streak_update({"lastReviewDay": "2026-05-01", "currentStreak": 3, "longestStreak": 3},
+                                      "2026-05-02") == {"lastReviewDay": "2026-05-02", "currentStreak": 4,
+                                                        "longestStreak": 4}
+    assert StatsService.streak_update({"lastReviewDay": "2026-05-01", "currentStreak": 3, "longestStreak": 7},
+                                      "2026-05-05") == {"lastReviewDay": "2026-05-05", "currentStreak": 1,
+                                                        "longestStreak": 7}
+
+
+def test_summarize_counts_due_strength_and_reviews():
+    today, yesterday = days_ago(0), days_ago(1)
+    summary = StatsService.summarize({
+        "totalWords": 6,
+        "totalReviews": 8,
+        "correctReviews": 6,
+        "strengthCounts": {"0": 1, "3": 2, "4": 1, "6": 2},
+        "dueByDay": {yesterday: 2, today: 1, days_ago(-3): 4},
+        "reviewsByDay": {today: 3, days_ago(3): 2, days_ago(30): 3},
+        "currentStreak": 4,
+        "longestStreak": 9,
+        "lastReviewDay": yesterday
+    })
+
+    assert summary["total_words_added"] == 6
+    assert (summary["words_learning"], summary["words_strong"], summary["words_mastered"]) == (3, 1, 2)
+    # Due by the end of today, so a word scheduled for later today counts
+    assert (summary["due_for_review"], summary["overdue_words"]) == (3, 2)
+    assert summary["overall_accuracy"] == 75.0
+    assert (summary["current_streak"], summary["longest_streak"]) == (4, 9)
+    assert (summary["reviews_today"], summary["reviews_this_week"], summary["reviews_total"]) == (3, 5, 8)
+
+
+def test_summarize_empty_and_broken_streak():
+    summary = StatsService.summarize({"currentStreak": 5, "lastReviewDay": days_ago(2)})
+    assert summary["current_streak"] == 0
+    assert summary["overall_accuracy"] == 0
+    assert summary["due_for_review"] == 0
+
+
+def test_without_zeros_drops_empty_counters():
+    assert without_zeros({"a": 0, "b": {"c": 0}, "d": {"e": 1, "f": 0}, "g": 2}) == {"d": {"e": 1}, "g": 2}
+
+
+def test_drifted_ignores_zero_counters_left_by_increments():
+    computed = {"totalWords": 2, "totalReviews": 1, "correctReviews": 1, "strengthCounts": {"1": 2},
+                "dueByDay": {}, "reviewsByDay": {"2026-05-01": 1}}
+    rollup = DailyRollup()
+    rollup.add_review("2026-05-01", "meaning", True, 1)
+
+    stored = current_stats(computed, strengthCounts={"0": 0, "1": 2}, dueByDay={"2026-04-30": 0})
+    stored_days = {
+        "2026-05-01": {"userId": "u", "date": "2026-05-01", **rollup.to_document("2026-05-01")},
+        "2026-04-30": {"userId": "u", "date": "2026-04-30", "total": 0}
+    }
+    assert not drifted(stored, computed, stored_days, rollup)
+
+
+def test_drifted_detects_changed_counters_days_and_old_schema():
+    computed = {"totalWords": 2, "totalReviews": 0, "correctReviews": 0, "strengthCounts": {},
+                "dueByDay": {}, "reviewsByDay": {}}
+    rollup = DailyRollup()
+
+    assert drifted(current_stats(computed, totalWords=3), computed, {}, rollup)
+    assert drifted({**computed}, computed, {}, rollup)
+    assert drifted(current_stats(computed), computed,
+                   {"2026-05-01": {"userId": "u", "date": "2026-05-01", "total": 1}}, rollup)
+    assert not drifted(current_stats(computed), computed, {}, rollup)
+
+
+def test_missing_document_is_rebuilt_on_first_read(fake_db):
+    seed_user(fake_db)
+
+    summary = asyncio.run(stats_service.get_stats("u1"))
+
+    assert summary["total_words_added"] == 2
+    assert (summary["words_strong"], summary["due_for_review"], summary["overdue_words"]) == (1, 1, 1)
+    assert (summary["reviews_today"], summary["reviews_total"]) == (1, 3)
+    assert (summary["current_streak"], summary["longest_streak"]) == (2, 2)
+
+    stored = fake_db.data("user_stats", "u1")
+    assert stats_service.is_current(stored)
+    assert sorted(fake_db.ids("daily_stats")) == [f"u1_{days_ago(1)}", f"u1_{days_ago(0)}"]
+
+    reads = fake_db.reads
+    assert asyncio.run(stats_service.get_stats("u1")) == summary
+    assert fake_db.reads == reads + 1
+
+
+def test_rebuild_starts_over_when_a_write_lands_meanwhile(fake_db, monkeypatch):
+    seed_user(fake_db)
+    compute = StatsService.compute
+    calls = []
+
+    async def racing_compute(self, user_id):
+        stats_data = await compute(self, user_id)
+        if not calls:
+            # A review session commits its increment while the first rebuild computes
+            fake_db.seed("user_stats", user_id, {"totalReviews": 99})
+        calls.append(user_id)
+        return stats_data
+
+    monkeypatch.setattr(StatsService, "compute", racing_compute)
+
+    stats_data = asyncio.run(stats_service.rebuild("u1"))
+
+    assert len(calls) == 2
+    stored = fake_db.data("user_stats", "u1")
+    assert stored["totalReviews"] == stats_data["totalReviews"] == 3
+    assert stats_service.is_current(stored)
+
+
+def test_rebuild_that_keeps_racing_is_not_stored(fake_db, monkeypatch):
+    seed_user(fake_db)
+    compute = StatsService.compute
+
+    async def racing_compute(self, user_id):
+        fake_db.seed("user_stats", user_id, {"totalReviews": 99})
+        return await compute(self, user_id)
+
+    monkeypatch.setattr(StatsService, "compute", racing_compute)
+
+    asyncio.run(stats_service.rebuild("u1", attempts=2))
+
+    assert fake_db.data("user_stats", "u1") == {"totalReviews": 99}
+
+
+def test_reconcile_rebuilds_only_drifted_documents(fake_db):
+    seed_user(fake_db, "u1")
+    seed_user(fake_db, "u2")
+    asyncio.run(stats_service.rebuild("u1"))
+    asyncio.run(stats_service.rebuild("u2"))
+    fake_db.seed("user_stats", "u2", {**fake_db.data("user_stats", "u2"), "totalWords": 7})
+
+    assert asyncio.run(reconcile(dry_run=True, concurrency=2)) == {"users": 2, "rebuilt": 1}
+    assert fake_db.data("user_stats", "u2")["totalWords"] == 7
+
+    assert asyncio.run(reconcile(dry_run=False, concurrency=2)) == {"users": 2, "rebuilt": 1}
+    assert fake_db.data("user_stats", "u2")["totalWords"] == 2
+    assert fake_db.data("users", "u2")["dataVersion"] == 1
+    assert "dataVersion" not in fake_db.data("users", "u1")
+
+
+def test_get_daily_reads_only_the_requested_days(fake_db):
+    seed_user(fake_db)
+    asyncio.run(stats_service.rebuild("u1"))
+    fake_db.seed("daily_stats", f"u1_{days_ago(40)}", {"userId": "u1", "date": days_ago(40), "total": 5})
+    reads = fake_db.reads
+
+    daily = asyncio.run(stats_service.get_daily("u1", 7))
+
+    assert fake_db.reads == reads + 7
+    assert list(daily) == [days_ago(1), days_ago(0)]
+    assert daily[days_ago(1)]["quizTypes"] == {"definition": {"total": 1, "correct": 1}}
+
+
+def test_analytics_route_uses_rollups_and_bounds_days(fake_db):
+    seed_user(fake_db)
+    app = FastAPI()
+    app.include_router(progress.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    client = TestClient(app)
+
+    response = client.get("/api/progress/analytics", params={"days": 7})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [day["date"] for day in body["performance_trend"]] == [days_ago(1), days_ago(0)]
+    assert body["quiz_type_performance"]["spelling"] == {"accuracy": 0, "total_questions": 1}
+    assert body["difficulty_analysis"]["easy"] == {"accuracy": 100.0, "total_questions": 1}
+
+    assert client.get("/api/progress/analytics", params={"days": 0}).status_code == 422
+    assert client.get("/api/progress/analytics", params={"days": 10000}).status_code == 422
@@ -0,0 +1,25 @@
+from src.services.suggestion_index import SuggestionIndex
+
+
+def test_build_normalizes_and_dedupes():
+    index = SuggestionIndex()
+    index.build(["Apple", "apple ", "", "banana", "apricot"])
+    assert len(index) == 3
+    assert index.suggest("AP") == ["apple", "apricot"]
+
+
+def test_add_keeps_the_list_sorted():
+    index = SuggestionIndex()
+    index.build(["apple", "banana"])
+    index.add("apex")
+    index.add("Apple")
+    assert index.suggest("ap") == ["apex", "apple"]
+    assert len(index) == 3
+
+
+def test_suggest_limits_and_stops_at_the_prefix_boundary():
+    index = SuggestionIndex()
+    index.build(["car", "card", "care", "cat", "dog"])
+    assert index.suggest("car", limit=2) == ["car", "card"]
+    assert index.suggest("ca") == ["car", "card", "care", "cat"]
+    assert index.suggest("x") == [] and index.suggest("  ") == []
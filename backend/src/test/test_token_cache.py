@@ -0,0 +1,69 @@
+import time
+
+from src.utils.token_cache import TokenCache
+
+
+def claims(user_id: str = "u1", expires_in: float = 60):
+    return {"uid": user_id, "exp": time.time() + expires_in}
+
+
+def test_returns_a_copy_of_the_cached_user():
+    cache = TokenCache()
+    cache.set("t1", claims(), {"id": "u1", "dataVersion": 1})
+
+    user = cache.get("t1")
+    user["dataVersion"] = 2
+    assert cache.get("t1")["dataVersion"] == 1
+
+
+def test_expired_tokens_are_not_cached():
+    cache = TokenCache()
+    cache.set("t1", claims(expires_in=-1), {"id": "u1"})
+    assert cache.get("t1") is None
+
+
+def test_invalidate_user_drops_all_of_their_tokens():
+    cache = TokenCache()
+    cache.set("t1", claims("u1"), {"id": "u1"})
+    cache.set("t2", claims("u1"), {"id": "u1"})
+    cache.set("t3", claims("u2"), {"id": "u2"})
+
+    cache.invalidate_user("u1")
+    assert cache.get("t1") is None and cache.get("t2") is None
+    assert cache.get("t3") is not None
+
+
+def test_read_that_raced_an_invalidation_is_not_cached():
+    cache = TokenCache()
+    generation = cache.generation("u1")
+    cache.invalidate_user("u1")  # a write lands while the user document is being read
+
+    cache.set("t1", claims(), {"id": "u1"}, generation)
+    assert cache.get("t1") is None
+
+    cache.set("t1", claims(), {"id": "u1"}, cache.generation("u1"))
+    assert cache.get("t1") is not None
+
+
+def test_generations_are_bounded_and_never_go_back():
+    cache = TokenCache(max_size=2)
+    generation = cache.generation("u1")
+    cache.invalidate_user("u1")
+    for user_id in ("u2", "u3", "u4"):
+        cache.invalidate_user(user_id)
+
+    assert len(cache._generations) == 2
+    # u1 was evicted from the table, but its read still counts as raced
+    cache.set("t1", claims("u1"), {"id": "u1"}, generation)
+    assert cache.get("t1") is None
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = TokenCache(max_size=2)
+    cache.set("t1", claims("u1"), {"id": "u1"})
+    cache.set("t2", claims("u2"), {"id": "u2"})
+    cache.get("t1")
+    cache.set("t3", claims("u3"), {"id": "u3"})
+
+    assert cache.get("t2") is None
+    assert cache.get("t1") is not None and cache.get("t3") is not None
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import words
+from src.services.search_service import SearchService
+from src.tools.sweep_orphans import sweep
+from src.utils import get_current_user
+
+
+@pytest.fixture
+def client(fake_db, monkeypatch):
+    monkeypatch.setattr(words, "search_service", SearchService())
+    fake_db.seed("users", "u1", {"stats": {"total_words_added": 3}})
+    fake_db.seed("users", "u2", {"stats": {"total_words_added": 1}})
+    for word_id, user_id in (("w1", "u1"), ("w2", "u1"), ("w3", "u1"), ("x1", "u2")):
+        fake_db.seed("words", word_id, {"userId": user_id, "word": word_id})
+        fake_db.seed("progress", f"{user_id}_{word_id}", {"userId": user_id, "wordId": word_id})
+        fake_db.seed("quiz_results", f"q_{word_id}", {"userId": user_id, "wordId": word_id})
+
+    app = FastAPI()
+    app.include_router(words.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    return TestClient(app)
+
+
+def test_delete_cascades_to_progress_and_quiz_results(client, fake_db):
+    response = client.delete("/api/words/w1")
+
+    assert response.status_code == 200
+    assert fake_db.ids("words") == ["w2", "w3", "x1"]
+    assert "u1_w1" not in fake_db.ids("progress")
+    assert "q_w1" not in fake_db.ids("quiz_results")
+    user = fake_db.data("users", "u1")
+    assert user["stats"]["total_words_added"] == 2
+    assert user["wordsVersion"] == 1
+
+
+def test_delete_tells_missing_words_from_other_users_words(client, fake_db):
+    assert client.delete("/api/words/x1").status_code == 403
+    assert client.delete("/api/words/nope").status_code == 404
+    assert fake_db.ids("progress") == ["u1_w1", "u1_w2", "u1_w3", "u2_x1"]
+
+
+def test_bulk_delete_reports_words_it_did_not_delete(client, fake_db):
+    response = client.post("/api/words/bulk-delete", json={"word_ids": ["w1", "w2", "w2", "x1", "nope"]})
+
+    body = response.json()
+    assert (body["deleted"], body["progress_deleted"], body["quiz_results_deleted"]) == (2, 2, 2)
+    assert body["not_found"] == ["x1", "nope"]
+    assert fake_db.ids("words") == ["w3", "x1"]
+    assert fake_db.ids("quiz_results") == ["q_w3", "q_x1"]
+    assert fake_db.data("users", "u1")["stats"]["total_words_added"] == 1
+
+
+def test_sweep_removes_only_orphans(client, fake_db):
+    fake_db.seed("progress", "u1_gone", {"userId": "u1", "wordId": "gone"})
+    fake_db.seed("quiz_results", "q_gone", {"userId": "u2", "wordId": "gone"})
+
+    assert asyncio.run(sweep(dry_run=True, concurrency=2)) == {"users": 2, "progress": 1, "quiz_results": 1}
+    assert "u1_gone" in fake_db.ids("progress")
+
+    asyncio.run(sweep(dry_run=False, concurrency=2))
+    assert "u1_gone" not in fake_db.ids("progress")
+    assert "q_gone" not in fake_db.ids("quiz_results")
+    assert len(fake_db.ids("progress")) == 4
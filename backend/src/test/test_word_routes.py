@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.routes import words
+from src.services.dictionary_cache import DictionaryCache
+from src.services.entry_service import entry_service
+from src.services.search_service import SearchService
+from src.utils import get_current_user, word_doc_id
+
+
+def word_doc(word: str, user_id: str = "u1", **fields):
+    return {
+        "userId": user_id,
+        "word": word,
+        "addedAt": datetime(2024, 5, 1),
+        "source": "manual",
+        "definitions": [{"definition": f"meaning of {word}", "partOfSpeech": "noun"}],
+        **fields
+    }
+
+
+LUCID = {
+    "word": "lucid",
+    "definitions": [{"partOfSpeech": "adjective", "definition": "expressed clearly", "example": ""}],
+    "phonetics": [],
+    "synonyms": ["clear"],
+    "antonyms": [],
+    "source": "dictionaryapi.dev"
+}
+
+
+@pytest.fixture
+def client(fake_db, monkeypatch):
+    async def lookup_word(word):
+        return LUCID if word == "lucid" else None
+
+    monkeypatch.setattr(words.dictionary_service, "lookup_word", lookup_word)
+    monkeypatch.setattr(entry_service, "_cache", OrderedDict())
+    monkeypatch.setattr(words, "search_service", SearchService())
+    fake_db.seed("users", "u1", {"email": "u1@example.com"})
+    fake_db.seed("users", "u2", {"email": "u2@example.com"})
+    app = FastAPI()
+    app.include_router(words.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    return TestClient(app)
+
+
+def test_add_word_fails_fast_for_a_known_missing_word(client, fake_db, monkeypatch):
+    monkeypatch.setattr(words.dictionary_service, "cache", DictionaryCache())
+    words.dictionary_service.cache.set_missing("qwertyuiop")
+
+    response = client.post("/api/words/", json={"word": "Qwertyuiop"})
+    assert response.status_code == 404
+    assert fake_db.reads == 0
+
+
+def test_added_words_share_one_dictionary_entry(client, fake_db):
+    response = client.post("/api/words/", json={"word": "Lucid", "user_notes": "clear"})
+    assert response.status_code == 200
+    assert response.json()["data"]["definitions"] == LUCID["definitions"]
+
+    client.app.dependency_overrides[get_current_user] = lambda: {"id": "u2"}
+    assert client.post("/api/words/", json={"word": "lucid"}).status_code == 200
+
+    entry_ids = fake_db.ids("dictionary_entries")
+    assert len(entry_ids) == 1
+    stored_words = [fake_db.data("words", word_id) for word_id in fake_db.ids("words")]
+    assert [word["entryId"] for word in stored_words] == entry_ids * 2
+    assert all("definitions" not in word for word in stored_words)
+
+    word_id = fake_db.ids("words")[0]
+    owner = fake_db.data("words", word_id)["userId"]
+    client.app.dependency_overrides[get_current_user] = lambda: {"id": owner}
+    assert client.get(f"/api/words/{word_id}").json()["definitions"] == LUCID["definitions"]
+
+
+def test_get_word(client, fake_db):
+    fake_db.seed("words", "w1", word_doc("lucid", userNotes="clear"))
+
+    response = client.get("/api/words/w1")
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["id"], body["word"], body["user_notes"]) == ("w1", "lucid", "clear")
+    assert body["definitions"][0]["definition"] == "meaning of lucid"
+
+
+def test_get_word_checks_ownership(client, fake_db):
+    fake_db.seed("words", "w1", word_doc("lucid", user_id="u2"))
+
+    assert client.get("/api/words/w1").status_code == 403
+    assert client.get("/api/words/missing").status_code == 404
+
+
+def test_update_word_only_changes_given_fields(client, fake_db):
+    fake_db.seed("words", "w1", word_doc("lucid", userNotes="clear"))
+
+    response = client.put("/api/words/w1", json={"is_favorite": True})
+    assert response.status_code == 200
+    assert response.json()["is_favorite"] is True
+    assert fake_db.data("words", "w1")["userNotes"] == "clear"
+
+
+def test_search_ranks_and_reads_only_the_page(client, fake_db):
+    for word_id, word in (("w1", "apple"), ("w2", "apricot"), ("w3", "banana"), ("w4", "apex")):
+        fake_db.seed("words", word_id, word_doc(word))
+    fake_db.seed("words", "w5", word_doc("apple", user_id="u2"))
+
+    body = client.get("/api/words/", params={"search": "ap", "per_page": 2}).json()
+    assert body["total"] == 3 and body["has_next"]
+    first_page = [word["word"] for word in body["words"]]
+
+    reads = fake_db.reads
+    body = client.get("/api/words/", params={"search": "ap", "per_page": 2, "page": 2}).json()
+    assert fake_db.reads - reads == 1  # the index is built already, only the page is read
+    assert sorted(first_page + [word["word"] for word in body["words"]]) == ["apex", "apple", "apricot"]
+    assert not body["has_next"]
+
+
+def test_search_forgets_words_deleted_elsewhere(client, fake_db):
+    for word_id, word in (("w1", "apple"), ("w2", "apricot")):
+        fake_db.seed("words", word_id, word_doc(word))
+    assert client.get("/api/words/", params={"search": "ap"}).json()["total"] == 2
+
+    del fake_db.store["words/w2"]
+    body = client.get("/api/words/", params={"search": "ap"}).json()
+    assert [word["id"] for word in body["words"]] == ["w1"] and body["total"] == 1
+    assert client.get("/api/words/", params={"search": "ap"}).json()["total"] == 1
+
+
+def test_cursor_round_trip():
+    for word_id in ("w1", "a" * 40, "9f86d081884c7d65"):
+        cursor = words._encode_cursor(word_id)
+        assert "=" not in cursor
+        assert words._decode_cursor(cursor) == word_id
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", words._encode_cursor("users/u1"), "gA"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        words._decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def seed_dated_words(fake_db, count: int):
+    for day in range(1, count + 1):
+        fake_db.seed("words", f"w{day}", word_doc(f"word{day}", addedAt=datetime(2024, 5, day)))
+
+
+def test_cursor_pages_walk_newest_first(client, fake_db):
+    seed_dated_words(fake_db, 5)
+
+    seen = []
+    params = {"per_page": 2}
+    while True:
+        body = client.get("/api/words/", params=params).json()
+        assert body["total"] == 5
+        seen.extend(word["id"] for word in body["words"])
+        if not body["has_next"]:
+            assert body["next_cursor"] is None
+            break
+        params = {"per_page": 2, "cursor": body["next_cursor"]}
+
+    assert seen == ["w5", "w4", "w3", "w2", "w1"]
+
+
+def test_page_numbers_still_work(client, fake_db):
+    seed_dated_words(fake_db, 5)
+
+    body = client.get("/api/words/", params={"page": 3, "per_page": 2}).json()
+    assert [word["id"] for word in body["words"]] == ["w1"]
+    assert (body["has_next"], body["has_prev"]) == (False, True)
+
+
+def test_cursor_of_another_user_is_rejected(client, fake_db):
+    fake_db.seed("words", "theirs", word_doc("apple", user_id="u2"))
+    response = client.get("/api/words/", params={"cursor": words._encode_cursor("theirs")})
+    assert response.status_code == 400
+
+
+def test_adding_a_word_twice_is_rejected(client, fake_db):
+    assert client.post("/api/words/", json={"word": "Lucid"}).status_code == 200
+    response = client.post("/api/words/", json={"word": " lucid "})
+
+    assert response.status_code == 400
+    assert fake_db.ids("words") == [word_doc_id("u1", "lucid")]
+    assert fake_db.data("users", "u1")["stats"]["total_words_added"] == 1
+
+
+def test_summary_view_returns_the_first_definition_only(client, fake_db):
+    fake_db.seed("words", "w1", word_doc("lucid", userNotes="note", synonyms=["clear"]))
+
+    response = client.get("/api/words/", params={"view": "summary"})
+
+    assert response.json()["words"] == [{
+        "id": "w1",
+        "word": "lucid",
+        "added_at": response.json()["words"][0]["added_at"],
+        "source": "manual",
+        "definition": {"definition": "meaning of lucid", "partOfSpeech": "noun"},
+        "is_favorite": False,
+        "difficulty_level": None
+    }]
+
+
+def test_fields_returns_only_the_requested_fields(client, fake_db):
+    fake_db.seed("words", "w1", word_doc("lucid", userNotes="note"))
+
+    response = client.get("/api/words/", params={"fields": "word,user_notes"})
+
+    assert response.status_code == 200
+    assert response.json()["words"] == [{"id": "w1", "word": "lucid", "user_notes": "note"}]
+
+
+def test_unknown_fields_are_rejected(client, fake_db):
+    fake_db.seed("words", "w1", word_doc("lucid"))
+
+    response = client.get("/api/words/", params={"fields": "word,password"})
+
+    assert response.status_code == 400
+    # Only the users document behind the ETag, no words
+    assert fake_db.reads == 1
@@ -0,0 +1,120 @@
+"""
+Build an offline dictionary bundle from a JSON dump.
+
+Supported inputs (.json array or .jsonl, one record per line):
+  - dictionaryapi.dev entries: {"word", "phonetics", "meanings": [...]}
+  - Wiktionary (wiktextract / kaikki.org) records: {"word", "pos", "senses": [...], "sounds": [...]}
+
+Usage:
+    python -m src.tools.build_dictionary_bundle dump.jsonl dictionary.bundle
+"""
+
+import argparse
+import json
+from typing import Dict, Any, Iterator
+
+from src.services.dictionary_bundle import DictionaryBundle
+from src.services import dictionary_service
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield raw records from a JSON array or a JSON-lines file"""
+
+    with open(path, "r", encoding="utf-8") as dump_file:
+        first_char = dump_file.read(1)
+        dump_file.seek(0)
+
+        if first_char == "[":
+            for record in json.load(dump_file):
+                yield record
+            return
+
+        for line in dump_file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def wiktionary_to_raw(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a wiktextract record to the dictionaryapi.dev entry shape"""
+
+    definitions = []
+    for sense in record.get("senses", []):
+        glosses = sense.get("glosses") or []
+        if not glosses:
+            continue
+        examples = sense.get("examples") or []
+        definitions.append({
+            "definition": glosses[-1],
+            "example": examples[0].get("text", "") if examples else "",
+            "synonyms": [s.get("word", "") for s in sense.get("synonyms", []) if s.get("word")],
+            "antonyms": [a.get("word", "") for a in sense.get("antonyms", []) if a.get("word")]
+        })
+
+    phonetics = []
+    for sound in record.get("sounds", []):
+        if sound.get("ipa") or sound.get("mp3_url"):
+            phonetics.append({"text": sound.get("ipa", ""), "audio": sound.get("mp3_url", "")})
+
+    return {
+        "word": record.get("word", ""),
+        "phonetics": phonetics,
+        "meanings": [{
+            "partOfSpeech": record.get("pos", ""),
+            "definitions": definitions,
+            "synonyms": [s.get("word", "") for s in record.get("synonyms", []) if s.get("word")],
+            "antonyms": [a.get("word", "") for a in record.get("antonyms", []) if a.get("word")]
+        }]
+    }
+
+
+def merge_records(path: str) -> Dict[str, Dict[str, Any]]:
+    """Group raw entries by headword, merging Wiktionary parts of speech"""
+
+    merged = {}
+    for record in read_records(path):
+        if "senses" in record:
+            record = wiktionary_to_raw(record)
+        elif "meanings" not in record:
+            continue
+
+        word = record.get("word", "").strip().lower()
+        if not word:
+            continue
+
+        if word not in merged:
+            merged[word] = {
+                "word": record.get("word", word),
+                "phonetics": list(record.get("phonetics", [])),
+                "meanings": list(record.get("meanings", []))
+            }
+        else:
+            merged[word]["phonetics"].extend(record.get("phonetics", []))
+            merged[word]["meanings"].extend(record.get("meanings", []))
+
+    return merged
+
+
+def build_bundle(dump_path: str, output_path: str, source: str) -> int:
+    merged = merge_records(dump_path)
+
+    def formatted_entries():
+        for word, raw_entry in merged.items():
+            formatted = dictionary_service._format_word_data(raw_entry)
+            if not formatted.get("definitions"):
+                continue
+            formatted["source"] = source
+            yield word, formatted
+
+    return DictionaryBundle.build(formatted_entries(), output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an offline dictionary bundle from a JSON dump")
+    parser.add_argument("dump", help="dictionaryapi.dev or Wiktionary JSON / JSONL dump")
+    parser.add_argument("output", help="path of the bundle file to write")
+    parser.add_argument("--source", default="wiktionary", help="value of the 'source' field in each entry")
+    args = parser.parse_args()
+
+    count = build_bundle(args.dump, args.output, args.source)
+    print(f"✅ Wrote {count} entries to {args.output}")
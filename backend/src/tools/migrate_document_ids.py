@@ -0,0 +1,138 @@
+"""
+Rewrite words and progress documents to deterministic ids.
+
+    words/{sha1(userId:word)}        (see src.utils.word_doc_id)
+    progress/{userId}_{wordId}       (see src.utils.progress_doc_id)
+
+Duplicate words of the same user are merged into one document. The progress entry with
+the most reviews is kept, and quiz_results rows are re-pointed at the new word ids.
+Users are migrated in parallel and every user's writes are committed in batches.
+
+Usage:
+    python -m src.tools.migrate_document_ids [--dry-run] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+from typing import Dict, Any, List, Tuple
+
+from src.firebase import async_db
+from src.tools.per_user import for_each_user
+from src.utils import word_doc_id, progress_doc_id, data_version_update
+
+
+BATCH_LIMIT = 400
+
+
+class BatchWriter:
+    """Collect writes and commit them in Firestore-sized batches"""
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.operations: List[Tuple[str, Any, Dict[str, Any]]] = []
+
+    def set(self, ref, data: Dict[str, Any]):
+        self.operations.append(("set", ref, data))
+
+    def update(self, ref, data: Dict[str, Any]):
+        self.operations.append(("update", ref, data))
+
+    def delete(self, ref):
+        self.operations.append(("delete", ref, None))
+
+    async def commit(self) -> int:
+        if self.dry_run:
+            return len(self.operations)
+
+        # Copies land before any source document is deleted, so a failed batch loses nothing
+        order = {"set": 0, "update": 1, "delete": 2}
+        operations = sorted(self.operations, key=lambda operation: order[operation[0]])
+        for start in range(0, len(operations), BATCH_LIMIT):
+            batch = async_db.batch()
+            for operation, ref, data in operations[start:start + BATCH_LIMIT]:
+                if operation == "set":
+                    batch.set(ref, data)
+                elif operation == "update":
+                    batch.update(ref, data)
+                else:
+                    batch.delete(ref)
+            await batch.commit()
+        return len(self.operations)
+
+
+async def migrate_user(user_id: str, dry_run: bool) -> Dict[str, int]:
+    words = async_db.collection("words")
+    progress = async_db.collection("progress")
+    writer = BatchWriter(dry_run)
+
+    # 1. Words: one document per (user, word) under the deterministic id
+    word_docs = await words.where("userId", "==", user_id).get()
+    word_groups: Dict[str, list] = {}
+    for doc in word_docs:
+        word_groups.setdefault(doc.to_dict().get("word", "").strip().lower(), []).append(doc)
+
+    word_id_map = {}
+    for word, docs in word_groups.items():
+        if not word:
+            continue
+        target_id = word_doc_id(user_id, word)
+        keeper = next((doc for doc in docs if doc.id == target_id), docs[0])
+        for doc in docs:
+            word_id_map[doc.id] = target_id
+            if doc.id != target_id:
+                writer.delete(doc.reference)
+        if keeper.id != target_id:
+            writer.set(words.document(target_id), keeper.to_dict())
+
+    # 2. Progress: one document per (user, word) keyed by both ids
+    progress_docs = await progress.where("userId", "==", user_id).get()
+    progress_groups: Dict[str, list] = {}
+    for doc in progress_docs:
+        data = doc.to_dict()
+        new_word_id = word_id_map.get(data.get("wordId"), data.get("wordId"))
+        if new_word_id:
+            progress_groups.setdefault(new_word_id, []).append(doc)
+
+    for new_word_id, docs in progress_groups.items():
+        target_id = progress_doc_id(user_id, new_word_id)
+        keeper = max(docs, key=lambda doc: doc.to_dict().get("totalReviews", 0))
+        for doc in docs:
+            if doc.id != target_id:
+                writer.delete(doc.reference)
+        if keeper.id != target_id or keeper.to_dict().get("wordId") != new_word_id:
+            writer.set(progress.document(target_id), {**keeper.to_dict(), "wordId": new_word_id})
+
+    # 3. Review history keeps pointing at the right word
+    moved_word_ids = {old_id for old_id, new_id in word_id_map.items() if old_id != new_id}
+    if moved_word_ids:
+        quiz_results = await async_db.collection("quiz_results").where("userId", "==", user_id).get()
+        for doc in quiz_results:
+            old_word_id = doc.to_dict().get("wordId")
+            if old_word_id in moved_word_ids:
+                writer.update(doc.reference, {"wordId": word_id_map[old_word_id]})
+
+    operations = await writer.commit()
+    if operations and not dry_run:
+        # Last, after the deletes: ETags and search indexes keyed on the versions refresh
+        await async_db.collection("users").document(user_id).update(data_version_update(words=True))
+    return {"words": len(moved_word_ids), "operations": operations}
+
+
+async def migrate(dry_run: bool, concurrency: int) -> Dict[str, int]:
+    return await for_each_user(
+        lambda user_id: migrate_user(user_id, dry_run),
+        "Migration",
+        concurrency,
+        counts=("words", "operations")
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move words and progress to deterministic document ids")
+    parser.add_argument("--dry-run", action="store_true", help="count the writes without committing them")
+    parser.add_argument("--concurrency", type=int, default=8, help="users migrated in parallel")
+    args = parser.parse_args()
+
+    totals = asyncio.run(migrate(args.dry_run, args.concurrency))
+    mode = "Would write" if args.dry_run else "Wrote"
+    print(f"✅ {mode} {totals['operations']} operations, moved {totals['words']} words for {totals['users']} users")
@@ -0,0 +1,44 @@
+"""
+Run a maintenance job once per user with bounded parallelism.
+
+Shared by the per-user data tools: each passes a job `async (user_id) -> {count: int}`
+and prints its own summary of the totals.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable
+
+from src.firebase import async_db
+from src.utils import logging
+
+
+async def for_each_user(
+    job: Callable[[str], Awaitable[Dict[str, int]]],
+    label: str,
+    concurrency: int,
+    counts: Iterable[str] = ()
+) -> Dict[str, int]:
+    """Run `job` for every user, `concurrency` at a time, and sum the counts it returns
+
+    `counts` start at 0 so a run without users still reports them. A failing user is
+    logged and skipped; `users` counts the users that succeeded.
+    """
+
+    user_docs = await async_db.collection("users").select([]).get()
+    semaphore = asyncio.Semaphore(concurrency)
+    totals = {"users": 0, **{key: 0 for key in counts}}
+
+    async def run(user_id: str):
+        async with semaphore:
+            try:
+                result = await job(user_id)
+            except Exception as e:
+                logging.error(f"{label} failed for user {user_id}: {str(e)}")
+                print(f"💥 {user_id}: {str(e)}")
+                return
+            totals["users"] += 1
+            for key, count in result.items():
+                totals[key] = totals.get(key, 0) + count
+
+    await asyncio.gather(*(run(doc.id) for doc in user_docs))
+    return totals
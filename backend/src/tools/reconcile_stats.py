@@ -0,0 +1,86 @@
+"""
+Rebuild every user's stats document and daily rollups from their words, progress and
+quiz results.
+
+Both are kept up to date by the writes that change them; this job repairs any drift
+(failed batches, manual edits) and backfills users who have none yet. Users are
+reconciled in parallel.
+
+Usage:
+    python -m src.tools.reconcile_stats [--dry-run] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+from typing import Dict, Any
+
+from src.firebase import async_db
+from src.services.stats_service import stats_service, DailyRollup
+from src.tools.per_user import for_each_user
+from src.utils import data_version_update
+
+
+# Fields compared to decide whether a stored document has drifted
+COMPARED_FIELDS = ("totalWords", "totalReviews", "correctReviews", "strengthCounts", "dueByDay", "reviewsByDay")
+
+
+def without_zeros(value: Any) -> Any:
+    """Increments leave zero counters (and empty maps) behind"""
+    if not isinstance(value, dict):
+        return value
+    cleaned = {key: without_zeros(item) for key, item in value.items()}
+    return {key: item for key, item in cleaned.items() if item not in (0, {})}
+
+
+def drifted(stored: Dict[str, Any], computed: Dict[str, Any],
+            stored_days: Dict[str, Dict[str, Any]], rollup: DailyRollup) -> bool:
+    if not stats_service.is_current(stored):
+        return True
+    if any(without_zeros(stored.get(field)) != computed[field] for field in COMPARED_FIELDS):
+        return True
+
+    computed_days = {day: rollup.to_document(day) for day in rollup.days}
+    stored_days = {
+        day: without_zeros({key: value for key, value in data.items() if key not in ("userId", "date")})
+        for day, data in stored_days.items()
+    }
+    return {day: data for day, data in stored_days.items() if data} != computed_days
+
+
+async def reconcile_user(user_id: str, dry_run: bool) -> Dict[str, int]:
+    """Whether the user's stats document had to be (or would be) rewritten"""
+
+    stored_doc, stored_days, (computed, rollup) = await asyncio.gather(
+        stats_service.stats_ref(user_id).get(),
+        stats_service.stored_days(user_id),
+        stats_service.compute(user_id)
+    )
+    stored = stored_doc.to_dict() if stored_doc.exists else {}
+    if not drifted(stored, computed, stored_days, rollup):
+        return {"rebuilt": 0}
+
+    if not dry_run:
+        await stats_service.rebuild(user_id)
+        # ETags served so far were computed from the drifted document
+        await async_db.collection("users").document(user_id).update(data_version_update())
+    return {"rebuilt": 1}
+
+
+async def reconcile(dry_run: bool, concurrency: int) -> Dict[str, int]:
+    return await for_each_user(
+        lambda user_id: reconcile_user(user_id, dry_run),
+        "Stats reconciliation",
+        concurrency,
+        counts=("rebuilt",)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-user stats and daily rollups that have drifted")
+    parser.add_argument("--dry-run", action="store_true", help="count drifted documents without rewriting them")
+    parser.add_argument("--concurrency", type=int, default=8, help="users reconciled in parallel")
+    args = parser.parse_args()
+
+    totals = asyncio.run(reconcile(args.dry_run, args.concurrency))
+    mode = "Found" if args.dry_run else "Rebuilt"
+    print(f"✅ {mode} {totals['rebuilt']} drifted stats documents out of {totals['users']} users")
@@ -0,0 +1,60 @@
+"""
+Purge progress and quiz_results documents whose word no longer exists.
+
+Words deleted before deletes cascaded left these rows behind. Users are swept in
+parallel, and the orphans of each user are deleted in write batches. Users who had
+orphans get their stats document rebuilt afterwards.
+
+Usage:
+    python -m src.tools.sweep_orphans [--dry-run] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+from typing import Dict
+
+from src.firebase import async_db
+from src.services.deletion_service import deletion_service
+from src.services.stats_service import stats_service
+from src.tools.per_user import for_each_user
+from src.utils import data_version_update
+
+
+async def sweep_user(user_id: str, dry_run: bool) -> Dict[str, int]:
+    word_docs, progress_docs, quiz_results = await asyncio.gather(
+        async_db.collection("words").where("userId", "==", user_id).select([]).get(),
+        async_db.collection("progress").where("userId", "==", user_id).select(["wordId"]).get(),
+        async_db.collection("quiz_results").where("userId", "==", user_id).select(["wordId"]).get()
+    )
+    word_ids = {doc.id for doc in word_docs}
+
+    orphan_progress = [doc.reference for doc in progress_docs if doc.get("wordId") not in word_ids]
+    orphan_results = [doc.reference for doc in quiz_results if doc.get("wordId") not in word_ids]
+
+    if not dry_run and (orphan_progress or orphan_results):
+        await deletion_service.delete_refs(orphan_results + orphan_progress)
+        await stats_service.rebuild(user_id)
+        # ETags served so far still counted the orphans
+        await async_db.collection("users").document(user_id).update(data_version_update())
+    return {"progress": len(orphan_progress), "quiz_results": len(orphan_results)}
+
+
+async def sweep(dry_run: bool, concurrency: int) -> Dict[str, int]:
+    return await for_each_user(
+        lambda user_id: sweep_user(user_id, dry_run),
+        "Orphan sweep",
+        concurrency,
+        counts=("progress", "quiz_results")
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete progress and quiz results of deleted words")
+    parser.add_argument("--dry-run", action="store_true", help="count the orphans without deleting them")
+    parser.add_argument("--concurrency", type=int, default=8, help="users swept in parallel")
+    args = parser.parse_args()
+
+    totals = asyncio.run(sweep(args.dry_run, args.concurrency))
+    mode = "Found" if args.dry_run else "Deleted"
+    print(f"✅ {mode} {totals['progress']} progress and {totals['quiz_results']} quiz results "
+          f"for {totals['users']} users")
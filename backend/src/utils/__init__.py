@@ -1,3 +1,8 @@
 from src.utils.exception import CustomException
 from src.utils.logger import logging
-from src.utils.auth_utils import create_firebase_user,verify_firebase_token,hash_password,verify_password,get_current_user,login_user
\ No newline at end of file
+from src.utils.document_ids import word_doc_id, progress_doc_id
+from src.utils.auth_utils import create_firebase_user,verify_firebase_token,hash_password,verify_password,get_current_user,login_user
+from src.utils.token_cache import token_cache
+from src.utils.versions import DATA_VERSION_FIELD, WORDS_VERSION_FIELD, data_version_update
+from src.utils.etag import make_etag, not_modified, set_etag, user_versions
+from src.utils.json_response import FastJSONResponse
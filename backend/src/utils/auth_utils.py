@@ -13,7 +13,8 @@ from dotenv import load_dotenv
 
 
 from src.utils.exception import CustomException
-from src.firebase import db
+from src.utils.token_cache import token_cache
+from src.firebase import async_db
 
 load_dotenv()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/user/login')
@@ -81,19 +82,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # ⚡ Step 0: Reuse a token that was already verified and is still valid
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     try:
         # 🔐 Step 1: Verify the Firebase ID token
         decoded_token =verify_firebase_token(token)
         
         user_id = decoded_token["uid"]
+        generation = token_cache.generation(user_id)
 
         # 🔍 Step 2: Check if user exists in Firestore
-        user_doc = db.collection("users").document(user_id).get()
+        user_doc = await async_db.collection("users").document(user_id).get()
         if not user_doc.exists:
             raise credentials_exception
 
         user_data = user_doc.to_dict()
         user_data["id"] = user_id
+        token_cache.set(token, decoded_token, user_data, generation)
         return user_data
 
     except Exception as e:
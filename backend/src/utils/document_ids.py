@@ -0,0 +1,12 @@
+import hashlib
+
+
+def word_doc_id(user_id: str, word: str) -> str:
+    """Deterministic words/{id} for a user's headword, so duplicates are a point read"""
+    key = f"{user_id}:{word.strip().lower()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def progress_doc_id(user_id: str, word_id: str) -> str:
+    """Deterministic progress/{id} for a user's word"""
+    return f"{user_id}_{word_id}"
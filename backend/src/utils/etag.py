@@ -0,0 +1,86 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from src.config import settings
+from src.firebase import async_db
+from src.utils.token_cache import token_cache
+from src.utils.versions import DATA_VERSION_FIELD, WORDS_VERSION_FIELD
+
+
+class UserVersions:
+    """Recently read dataVersion and wordsVersion of users documents
+
+    The users document cached with a token only reflects writes made in this process
+    (token_cache.invalidate_user). Other workers and the offline tools bump the versions
+    too, so they are re-read from Firestore once older than USER_VERSION_TTL seconds, and
+    at once after a write in this process. ETags and search indexes served by one process
+    are therefore never stale, and with several processes at most USER_VERSION_TTL
+    seconds behind.
+    """
+
+    def __init__(self, ttl_seconds: int = 5, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._versions: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, user_id: str) -> Dict[str, int]:
+        generation = token_cache.generation(user_id)
+        cached = self._versions.get(user_id)
+        if cached is not None:
+            versions, read_at, cached_generation = cached
+            if cached_generation == generation and time.time() - read_at < self.ttl_seconds:
+                self._versions.move_to_end(user_id)
+                return versions
+
+        user_doc = await async_db.collection("users").document(user_id).get()
+        user_data = user_doc.to_dict() or {}
+        versions = {
+            DATA_VERSION_FIELD: user_data.get(DATA_VERSION_FIELD, 0),
+            WORDS_VERSION_FIELD: user_data.get(WORDS_VERSION_FIELD, 0)
+        }
+        self._versions[user_id] = (versions, time.time(), generation)
+        self._versions.move_to_end(user_id)
+        while len(self._versions) > self.max_size:
+            self._versions.popitem(last=False)
+        return versions
+
+
+user_versions = UserVersions(ttl_seconds=settings.USER_VERSION_TTL, max_size=settings.TOKEN_CACHE_SIZE)
+
+
+async def make_etag(user: Dict[str, Any], *parts: Any) -> str:
+    """Strong ETag from the user's data version and whatever else shapes the response"""
+
+    versions = await user_versions.get(user["id"])
+    key = "|".join(str(part) for part in (user["id"], versions[DATA_VERSION_FIELD], *parts))
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # GET uses weak comparison, so a W/ prefix added by a proxy still matches
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag in candidates
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the client already has this version, otherwise None"""
+
+    if not etag_matches(request, etag):
+        return None
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
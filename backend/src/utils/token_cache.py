@@ -0,0 +1,101 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Set
+
+from src.config import settings
+
+
+class TokenCache:
+    """Bounded LRU cache of verified ID tokens and their user documents"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        # Set by invalidate_user, so a read that raced a write is not cached. Values come
+        # from one increasing clock; users evicted from this LRU (max_size of them are
+        # kept) fall back to the highest evicted value, so a generation never goes back.
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._generation_clock = 0
+        self._generation_floor = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached user for a token, or None if missing or expired"""
+
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+
+        if entry["expires_at"] <= time.time():
+            self._remove(token)
+            return None
+
+        self._entries.move_to_end(token)
+        return dict(entry["user"])
+
+    def generation(self, user_id: str) -> int:
+        """Take this before reading the user document and pass it to set()"""
+        return self._generations.get(user_id, self._generation_floor)
+
+    def set(self, token: str, decoded_token: Dict[str, Any], user_data: Dict[str, Any],
+            generation: Optional[int] = None):
+        """Cache a verified token until its `exp` claim
+
+        Skipped if the user was invalidated since `generation` was taken: the user
+        document read in between may be older than the write that invalidated it.
+        """
+
+        expires_at = decoded_token.get("exp")
+        if not expires_at or expires_at <= time.time():
+            return
+        if generation is not None and generation != self.generation(decoded_token["uid"]):
+            return
+
+        if token in self._entries:
+            self._remove(token)
+
+        user_id = decoded_token["uid"]
+        self._entries[token] = {
+            "claims": decoded_token,
+            "user": dict(user_data),
+            "expires_at": expires_at
+        }
+        self._tokens_by_user.setdefault(user_id, set()).add(token)
+
+        while len(self._entries) > self.max_size:
+            oldest_token = next(iter(self._entries))
+            self._remove(oldest_token)
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached token of a user whose document changed"""
+
+        self._generation_clock += 1
+        self._generations[user_id] = self._generation_clock
+        self._generations.move_to_end(user_id)
+        while len(self._generations) > self.max_size:
+            _, evicted = self._generations.popitem(last=False)
+            self._generation_floor = max(self._generation_floor, evicted)
+
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self._remove(token)
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_user.clear()
+        self._generations.clear()
+        self._generation_floor = self._generation_clock
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+
+        user_id = entry["claims"]["uid"]
+        user_tokens = self._tokens_by_user.get(user_id)
+        if user_tokens is not None:
+            user_tokens.discard(token)
+            if not user_tokens:
+                del self._tokens_by_user[user_id]
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
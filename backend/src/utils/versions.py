@@ -0,0 +1,17 @@
+from typing import Any, Dict
+
+from firebase_admin import firestore
+
+
+# Bumped in the same write as every change to a user's words, progress or stats (ETags)
+DATA_VERSION_FIELD = "dataVersion"
+# Bumped only when word documents are added, changed, removed or re-keyed (search indexes)
+WORDS_VERSION_FIELD = "wordsVersion"
+
+
+def data_version_update(words: bool = False) -> Dict[str, Any]:
+    """Users document update that invalidates the user's ETags (and search index, with words=True)"""
+    update = {DATA_VERSION_FIELD: firestore.Increment(1)}
+    if words:
+        update[WORDS_VERSION_FIELD] = firestore.Increment(1)
+    return update
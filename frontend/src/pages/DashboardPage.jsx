@@ -101,7 +101,7 @@ const DashboardPage = () => {
             <Calendar className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">{stats?.due_today || 0}</div>
+            <div className="text-2xl font-bold">{stats?.due_for_review || 0}</div>
             <p className="text-xs text-muted-foreground">
               Words to review
             </p>
@@ -190,9 +190,9 @@ const DashboardPage = () => {
               <Link to="/study">
                 <Play className="h-4 w-4 mr-2" />
                 Start Study Session
-                {stats?.due_today > 0 && (
+                {stats?.due_for_review > 0 && (
                   <Badge variant="secondary" className="ml-auto">
-                    {stats.due_today}
+                    {stats.due_for_review}
                   </Badge>
                 )}
               </Link>
@@ -51,7 +51,8 @@ const WordsPage = () => {
   const loadWords = async () => {
     try {
       setLoading(true);
-      const response = await apiService.getWords(currentPage, 20, searchTerm);
+      // The list only shows the first definition, the modal loads the full word
+      const response = await apiService.getWords(currentPage, 20, searchTerm, 'summary');
       console.log(response)
       setWords(response.words || []);
       setTotalPages(response.total_pages || 1);
@@ -112,9 +113,12 @@ const WordsPage = () => {
     }
   ];
 
+  // Summary words carry `definition`, full words (and the samples) `definitions`
+  const firstDefinition = (word) => word.definition?.definition || word.definitions?.[0]?.definition;
+
   const filteredWords = words.filter(word => {
     const matchesSearch = word.word.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         word.definitions?.[0]?.definition.toLowerCase().includes(searchTerm.toLowerCase());
+                         firstDefinition(word)?.toLowerCase().includes(searchTerm.toLowerCase());
     const matchesDifficulty = filterDifficulty === 'all' || word.difficulty === filterDifficulty;
     return matchesSearch && matchesDifficulty;
   });
@@ -138,6 +142,16 @@ const WordsPage = () => {
   const handleWordAdded = () => {
   loadWords(); // Refresh the word list
 };
+const openWordDetails = async (word) => {
+  setSelectedWord(word);
+  try {
+    const fullWord = await apiService.getWord(word.id);
+    // Keep the modal closed if it was dismissed while loading
+    setSelectedWord(current => (current?.id === word.id ? fullWord : current));
+  } catch (error) {
+    console.error('Failed to load word details:', error);
+  }
+};
 const handleEditWord = (word) => {
   // You can implement edit functionality later
   console.log('Edit word:', word);
@@ -262,7 +276,7 @@ const handleStudyWord = (word) => {
       {/* Words Grid */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
         {filteredWords.map((word) => (
-          <Card key={word.id} className="hover:shadow-md transition-shadow hover:cursor-pointer " onClick ={()=>(setSelectedWord(word))}>
+          <Card key={word.id} className="hover:shadow-md transition-shadow hover:cursor-pointer " onClick ={()=>(openWordDetails(word))}>
             <CardHeader className="pb-3">
               <div className="flex items-start justify-between">
                 <div className="flex-1">
@@ -290,7 +304,7 @@ const handleStudyWord = (word) => {
                     </Button>
                   </DropdownMenuTrigger>
                   <DropdownMenuContent align="end">
-                    <DropdownMenuItem onClick={() => setSelectedWord(word)}>
+                    <DropdownMenuItem onClick={() => openWordDetails(word)}>
                       <Eye className="h-4 w-4 mr-2" />
                       View Details
                     </DropdownMenuItem>
@@ -314,7 +328,7 @@ const handleStudyWord = (word) => {
             
             <CardContent>
               <p className="text-muted-foreground mb-3">
-                {word.definitions?.[0]?.definition || 'No definition available'}
+                {firstDefinition(word) || 'No definition available'}
               </p>
               
               <div className="flex items-center justify-between text-sm text-muted-foreground">
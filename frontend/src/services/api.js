@@ -107,11 +107,12 @@ class ApiService {
         }
         
     }
-    async getWords(pageNo=1,wordPerPage=20,searchTerm=''){
+    async getWords(pageNo=1,wordPerPage=20,searchTerm='',view='full'){
         const queryParams = new URLSearchParams({
       page: pageNo,
       per_page: wordPerPage,
-      search: searchTerm
+      search: searchTerm,
+      view: view
     }).toString();
         try{
             console.log("Trying to get words")
@@ -132,6 +133,18 @@ class ApiService {
         }
     }
 
+    async getWord(wordId){
+        const response = await fetch(`${API_BASE_URL}/api/words/${wordId}`,{
+            method:'GET',
+            headers:this.getHeaders()
+        })
+        if(!response.ok){
+            const errorData = await response.json();
+            throw new Error(errorData.detail || 'Error fetching word');
+        }
+        return response.json()
+    }
+
     async addWord(word){
         try{
             const response = await fetch(`${API_BASE_URL}/api/words/`,{